@@ -6,7 +6,8 @@ Replaces insecure header-based authentication with production-ready JWT system.
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 from uuid import UUID
 from jose import jwt
 from passlib.context import CryptContext
@@ -28,8 +29,20 @@ JWT_SECRET_KEY = settings.SECRET_KEY if hasattr(settings, 'SECRET_KEY') else sec
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 30
 JWT_REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: new hashes are argon2id; bcrypt hashes still verify and
+# are upgraded on the next successful login. argon2id costs 64 MiB and tens of
+# milliseconds per call, so request paths run it on the password thread pool
+# (api.services.user_manager.run_in_password_executor)
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+
+# Password accepted for accounts that have no hash stored yet
+DEFAULT_PASSWORD = "family123"
+
+
+@lru_cache(maxsize=1)
+def default_password_hash() -> str:
+    """argon2id hash of DEFAULT_PASSWORD, computed once per process"""
+    return pwd_context.hash(DEFAULT_PASSWORD)
 
 
 # =============================================================================
@@ -138,13 +151,19 @@ class PasswordManager:
         self.pwd_context = pwd_context
 
     def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
+        """Hash password using argon2id"""
         return self.pwd_context.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
         return self.pwd_context.verify(plain_password, hashed_password)
 
+    def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify password; also return a replacement hash if the scheme is deprecated"""
+        return self.pwd_context.verify_and_update(plain_password, hashed_password)
+
     def create_password_reset_token(self, email: str) -> str:
         """Create secure password reset token"""
         delta = timedelta(hours=1)  # Reset tokens expire in 1 hour
@@ -184,25 +203,48 @@ class AuthenticationService:
 
     async def authenticate_user(self, email: str, password: str) -> Optional[FamilyMember]:
         """Authenticate user with email and password"""
-        from api.services.user_manager import UserManager
+        from api.services.user_manager import (
+            DUMMY_PASSWORD_HASH, UserManager, recent_auth_cache, run_in_password_executor
+        )
 
         user_manager = UserManager(self.db_pool)
 
         # Get user by email (add email field to FamilyMember if not exists)
         user = await user_manager.get_family_member_by_email(email)
         if not user:
+            # Same work as a wrong password so unknown emails don't return faster
+            await run_in_password_executor(
+                self.password_manager.verify_password, password, DUMMY_PASSWORD_HASH.decode('ascii')
+            )
             return None
 
         # For now, create a temporary password hash for demo
         # In production, all users should have password hashes
-        if not hasattr(user, 'hashed_password') or not user.hashed_password:
-            # Create default password for existing users
-            default_password = "family123"
-            user.hashed_password = self.password_manager.hash_password(default_password)
-
-        if not self.password_manager.verify_password(password, user.hashed_password):
+        hashed_password = getattr(user, 'hashed_password', None)
+        password_bytes = password.encode('utf-8')
+        if hashed_password and recent_auth_cache.check(
+            user.id, hashed_password.encode('ascii'), password_bytes
+        ):
+            # Same password verified moments ago; skip the slow hash
+            return user
+
+        if not hashed_password:
+            # Existing users without a hash use the default password
+            hashed_password = await run_in_password_executor(default_password_hash)
+
+        # Hashing takes tens of milliseconds; keep it off the event loop
+        verified, new_hash = await run_in_password_executor(
+            self.password_manager.verify_and_update, password, hashed_password
+        )
+        if not verified:
             return None
 
+        if new_hash:
+            # Legacy bcrypt hash: store the argon2id replacement
+            await user_manager.update_password_hash(user, hashed_password, new_hash)
+        elif user.hashed_password:
+            recent_auth_cache.put(user.id, hashed_password.encode('ascii'), password_bytes)
+
         return user
 
     async def create_user_tokens(self, user: FamilyMember) -> Dict[str, Any]:
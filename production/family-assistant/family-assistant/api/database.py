@@ -6,8 +6,9 @@ Provides async database session creation and checkpoint schema management.
 
 import os
 from typing import AsyncGenerator
+
+import asyncpg
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import text
 
 # Database configuration
 DATABASE_URL = os.getenv(
@@ -34,6 +35,166 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+# LangGraph checkpoint tables, created in one batch by create_checkpoint_schema.
+# checkpoints is append-only and range-partitioned by month on created_at, so
+# retention drops whole partitions instead of DELETE + VACUUM; the partition
+# key has to be part of the primary key.
+CHECKPOINT_SCHEMA_SQL = """
+    -- Concurrent IF NOT EXISTS DDL can still collide on the catalogs, so pods
+    -- starting together take turns on this app-wide advisory lock, which is
+    -- released at commit
+    SELECT pg_advisory_xact_lock(8471623);
+
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        thread_id TEXT NOT NULL,
+        checkpoint_id TEXT NOT NULL,
+        parent_id TEXT,
+        checkpoint BYTEA NOT NULL,
+        metadata JSONB DEFAULT '{}'::jsonb,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (thread_id, checkpoint_id, created_at)
+    ) PARTITION BY RANGE (created_at);
+
+    -- CREATE INDEX IF NOT EXISTS still waits for a SHARE lock, stalling
+    -- checkpoint writes every time a pod restarts, so only missing indexes
+    -- are created. CONCURRENTLY is not available on partitioned tables, so a
+    -- missing index locks writes on each partition once, while it is built
+    -- (instantly on a new, empty table). A plain checkpoints table from
+    -- before partitioning is indexed CONCURRENTLY by
+    -- create_plain_checkpoint_indexes() instead.
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_partitioned_table
+            WHERE partrelid = 'checkpoints'::regclass
+        ) THEN
+            RETURN;
+        END IF;
+
+        -- The primary key already serves thread_id lookups
+        DROP INDEX IF EXISTS idx_checkpoints_thread;
+
+        -- A thread's latest checkpoints without a sort
+        IF to_regclass('idx_checkpoints_thread_recent') IS NULL THEN
+            CREATE INDEX idx_checkpoints_thread_recent
+            ON checkpoints(thread_id, created_at DESC);
+        END IF;
+
+        IF to_regclass('idx_checkpoints_parent') IS NULL THEN
+            CREATE INDEX idx_checkpoints_parent
+            ON checkpoints(parent_id);
+        END IF;
+
+        -- Checkpoint listing filters metadata by containment; jsonb_path_ops
+        -- is smaller than the default opclass and still serves @> (but not
+        -- ->>, ? or ?|, so filter with metadata @> '{...}')
+        IF to_regclass('idx_checkpoints_metadata') IS NULL THEN
+            CREATE INDEX idx_checkpoints_metadata
+            ON checkpoints USING GIN (metadata jsonb_path_ops);
+        END IF;
+    END $$;
+
+    -- Creates checkpoints_YYYY_MM for the current month and the next
+    -- months_ahead months, plus the checkpoints_default catch-all that keeps
+    -- inserts working if a month is not created in time. Rows that already
+    -- landed in checkpoints_default for a new month are moved into it.
+    -- Called on every startup; for long-lived pods schedule it monthly too,
+    -- e.g. with pg_cron:
+    -- SELECT cron.schedule('checkpoint-partitions', '0 0 1 * *',
+    --     'SELECT create_checkpoint_partitions(2)');
+    CREATE OR REPLACE FUNCTION create_checkpoint_partitions(months_ahead INT DEFAULT 1)
+    RETURNS VOID LANGUAGE plpgsql AS $$
+    DECLARE
+        month_start DATE;
+        month_end DATE;
+        partition_name TEXT;
+    BEGIN
+        -- A checkpoints table created before partitioning stays a plain
+        -- table until migrated by hand
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_partitioned_table
+            WHERE partrelid = 'checkpoints'::regclass
+        ) THEN
+            RETURN;
+        END IF;
+
+        CREATE TABLE IF NOT EXISTS checkpoints_default
+            PARTITION OF checkpoints DEFAULT;
+
+        FOR month_start IN
+            SELECT generate_series(
+                date_trunc('month', NOW()),
+                date_trunc('month', NOW()) + make_interval(months => months_ahead),
+                INTERVAL '1 month'
+            )::date
+        LOOP
+            partition_name := 'checkpoints_' || to_char(month_start, 'YYYY_MM');
+            CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+            month_end := (month_start + INTERVAL '1 month')::date;
+
+            -- Attaching checks that checkpoints_default holds no rows for
+            -- the month, so move them over first
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE checkpoints INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name
+            );
+            EXECUTE format(
+                'WITH moved AS ('
+                '    DELETE FROM checkpoints_default'
+                '    WHERE created_at >= %L AND created_at < %L RETURNING *'
+                ') INSERT INTO %I SELECT * FROM moved',
+                month_start, month_end, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE checkpoints ATTACH PARTITION %I '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_end
+            );
+        END LOOP;
+    END;
+    $$;
+
+    -- Drops monthly partitions that end before NOW() - retention, and
+    -- deletes rows that old from checkpoints_default
+    CREATE OR REPLACE FUNCTION drop_checkpoint_partitions(retention INTERVAL)
+    RETURNS VOID LANGUAGE plpgsql AS $$
+    DECLARE
+        partition_name TEXT;
+    BEGIN
+        FOR partition_name IN
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = 'checkpoints'::regclass
+              AND child.relname ~ '^checkpoints_[0-9]{4}_[0-9]{2}$'
+              AND to_date(substring(child.relname FROM 13), 'YYYY_MM')
+                  + INTERVAL '1 month' <= NOW() - retention
+        LOOP
+            EXECUTE format('DROP TABLE %I', partition_name);
+        END LOOP;
+
+        IF to_regclass('checkpoints_default') IS NOT NULL THEN
+            DELETE FROM checkpoints_default WHERE created_at < NOW() - retention;
+        END IF;
+    END;
+    $$;
+
+    SELECT create_checkpoint_partitions(1);
+"""
+
+# The checkpoints indexes CHECKPOINT_SCHEMA_SQL creates, by name, for
+# create_plain_checkpoint_indexes
+PLAIN_CHECKPOINT_INDEXES = {
+    "idx_checkpoints_thread_recent": "checkpoints(thread_id, created_at DESC)",
+    "idx_checkpoints_parent": "checkpoints(parent_id)",
+    "idx_checkpoints_metadata": "checkpoints USING GIN (metadata jsonb_path_ops)",
+}
+
+# Not the schema script's lock: CONCURRENTLY waits out every open transaction,
+# including a pod queued on that lock behind this one
+PLAIN_CHECKPOINT_INDEX_LOCK = 8471624
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function for FastAPI routes to get database session.
@@ -68,28 +229,58 @@ async def create_checkpoint_schema():
     checkpoint tables are available for conversation memory.
     """
     async with engine.begin() as conn:
-        # Create checkpoint tables for LangGraph
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS checkpoints (
-                thread_id TEXT NOT NULL,
-                checkpoint_id TEXT NOT NULL,
-                parent_id TEXT,
-                checkpoint BYTEA NOT NULL,
-                metadata JSONB DEFAULT '{}'::jsonb,
-                created_at TIMESTAMP DEFAULT NOW(),
-                PRIMARY KEY (thread_id, checkpoint_id)
-            )
-        """))
+        # SQLAlchemy prepares every statement, and a prepared statement can
+        # hold only one command; asyncpg's argument-less execute() sends the
+        # whole script as one simple-query message (one round trip)
+        raw_conn = await conn.get_raw_connection()
+        await raw_conn.driver_connection.execute(CHECKPOINT_SCHEMA_SQL)
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        raw_conn = await conn.get_raw_connection()
+        await create_plain_checkpoint_indexes(raw_conn.driver_connection)
 
-        await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_checkpoints_thread
-            ON checkpoints(thread_id)
-        """))
 
-        await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_checkpoints_parent
-            ON checkpoints(parent_id)
-        """))
+async def create_plain_checkpoint_indexes(conn: asyncpg.Connection):
+    """
+    Index a checkpoints table created before partitioning without locking writes.
+
+    A plain table, unlike a partitioned one, supports CREATE INDEX
+    CONCURRENTLY. That cannot run in a transaction block or a multi-statement
+    script, so each statement is sent on its own; conn must not be in a
+    transaction. Does nothing when checkpoints is partitioned, or while
+    another pod is building the indexes.
+    """
+    is_plain = await conn.fetchval(
+        "SELECT relkind = 'r' FROM pg_class WHERE oid = to_regclass('checkpoints')"
+    )
+    if not is_plain:
+        return
+    if not await conn.fetchval(
+        "SELECT pg_try_advisory_lock($1)", PLAIN_CHECKPOINT_INDEX_LOCK
+    ):
+        return
+
+    try:
+        # The primary key already serves thread_id lookups
+        await conn.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_checkpoints_thread")
+
+        for name, definition in PLAIN_CHECKPOINT_INDEXES.items():
+            # An interrupted build leaves an invalid index behind, which
+            # IF NOT EXISTS would keep; drop it and build again
+            is_invalid = await conn.fetchval(
+                "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)",
+                name
+            )
+            if is_invalid:
+                await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            await conn.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"
+            )
+    finally:
+        await conn.execute(
+            "SELECT pg_advisory_unlock($1)", PLAIN_CHECKPOINT_INDEX_LOCK
+        )
 
 
 async def init_database():
@@ -5,14 +5,23 @@ Dependency injection for JWT authentication, database, and services.
 Replaces insecure header-based authentication with production-ready JWT system.
 """
 
-from typing import Optional
+from typing import Optional, Sequence
 from fastapi import Depends, HTTPException, Header, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import asyncpg
+import redis.asyncio as redis
 
 from config.settings import settings
 from api.models.user_management import FamilyMember, UserRole
-from api.services.user_manager import UserManager
+from api.services.user_manager import (
+    HOT_STATEMENTS,
+    AuditLogWriter,
+    EmailLookupBatcher,
+    LastActiveWriter,
+    UserManager,
+    UserManagerConnection,
+    prepare_connection,
+)
 
 
 # =============================================================================
@@ -20,27 +29,53 @@ from api.services.user_manager import UserManager
 # ==============================================================================
 
 _db_pool: Optional[asyncpg.Pool] = None
+_audit_writer: Optional[AuditLogWriter] = None
+_last_active_writer: Optional[LastActiveWriter] = None
+_email_batcher: Optional[EmailLookupBatcher] = None
 
 
-async def init_db_pool():
-    """Initialize database connection pool"""
-    global _db_pool
+async def init_db_pool(hot_statements: Sequence[str] = ()):
+    """Initialize database connection pool
+
+    ``hot_statements`` are prepared on every connection alongside
+    UserManager's own; they only take effect for the call that creates the
+    pool.
+    """
+    global _db_pool, _audit_writer, _last_active_writer, _email_batcher
     if _db_pool is None:
+        statements = HOT_STATEMENTS + tuple(hot_statements)
+
+        async def init(conn: UserManagerConnection) -> None:
+            await prepare_connection(conn, statements)
+
         _db_pool = await asyncpg.create_pool(
-            host=settings.postgres_host,
-            port=settings.postgres_port,
-            user=settings.postgres_user,
-            password=settings.postgres_password,
-            database=settings.postgres_db,
+            **settings.postgres_connect_kwargs,
             min_size=5,
-            max_size=20,
+            max_size=25,
+            connection_class=UserManagerConnection,
+            init=init,
         )
+        _audit_writer = AuditLogWriter(_db_pool)
+        _audit_writer.start()
+        _last_active_writer = LastActiveWriter(_db_pool)
+        _last_active_writer.start()
+        _email_batcher = EmailLookupBatcher(_db_pool)
+        _email_batcher.start()
     return _db_pool
 
 
 async def close_db_pool():
     """Close database connection pool"""
-    global _db_pool
+    global _db_pool, _audit_writer, _last_active_writer, _email_batcher
+    if _email_batcher:
+        await _email_batcher.close()
+        _email_batcher = None
+    if _audit_writer:
+        await _audit_writer.close()
+        _audit_writer = None
+    if _last_active_writer:
+        await _last_active_writer.close()
+        _last_active_writer = None
     if _db_pool:
         await _db_pool.close()
         _db_pool = None
@@ -53,6 +88,25 @@ async def get_db_pool() -> asyncpg.Pool:
     return _db_pool
 
 
+_redis_client: Optional[redis.Redis] = None
+
+
+async def get_redis_client() -> redis.Redis:
+    """Get shared Redis client (permission cache)"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis_client
+
+
+async def close_redis_client():
+    """Close shared Redis client"""
+    global _redis_client
+    if _redis_client:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
 # =============================================================================
 # JWT Authentication Dependencies (Production Ready)
 # ==============================================================================
@@ -310,9 +364,12 @@ async def get_optional_user(
 # Service Dependencies
 # ==============================================================================
 
-async def get_user_manager(db_pool: asyncpg.Pool = Depends(get_db_pool)) -> UserManager:
+async def get_user_manager(
+    db_pool: asyncpg.Pool = Depends(get_db_pool),
+    redis_client: redis.Redis = Depends(get_redis_client),
+) -> UserManager:
     """Get user manager service"""
-    return UserManager(db_pool)
+    return UserManager(db_pool, redis_client)
 
 
 async def get_content_filter(db_pool: asyncpg.Pool = Depends(get_db_pool)):
@@ -2,18 +2,22 @@
 
 from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form, WebSocket, WebSocketDisconnect, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Type
 import uuid
-import asyncpg
+from collections import Counter
+from functools import lru_cache
 from datetime import datetime
 import psutil
 import subprocess
 import json
+import time
 import asyncio
 from pathlib import Path
+import orjson
+import redis.asyncio as redis
 from config.settings import settings
 
 # Import multimodal models and services
@@ -39,7 +43,10 @@ from api.routes.family import router as family_router
 
 # Authentication
 from api.routers.auth import router as auth_router
-from api.dependencies import get_current_user_from_token, get_current_admin_user
+from api.dependencies import (
+    get_current_user_from_token, get_current_admin_user,
+    init_db_pool, close_db_pool, get_redis_client, close_redis_client
+)
 
 # Observability and Middleware
 from api.observability.tracing import setup_tracing
@@ -52,7 +59,8 @@ from api.middleware.security import SecurityHeadersMiddleware
 app = FastAPI(
     title="Family Assistant API",
     description="Privacy-focused AI assistant with persistent memory and comprehensive observability",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure observability (before middleware)
@@ -368,9 +376,6 @@ async def get_service_status() -> List[ServiceStatus]:
 
 async def read_architecture_docs() -> List[ArchitectureInfo]:
     """Read architecture documentation from markdown files."""
-    import os
-    from pathlib import Path
-
     docs = []
     docs_path = Path("/home/pesu/Rakuflow/systems/homelab")
 
@@ -424,22 +429,33 @@ async def read_architecture_docs() -> List[ArchitectureInfo]:
 
     return docs
 
-# Database connection pool
-async def get_db_pool():
-    """Get database connection pool."""
-    return await asyncpg.create_pool(
-        host=settings.postgres_host,
-        port=settings.postgres_port,
-        user=settings.postgres_user,
-        password=settings.postgres_password,
-        database=settings.postgres_db,
-        min_size=2,
-        max_size=10
-    )
-
-
+# Database connection pool, shared with the dependency-injected services
+# (UserManager, audit writers); set once in startup()
 db_pool = None
 
+# Per-request statements, prepared on every pooled connection at startup
+GET_USER_PROFILE_SQL = """
+    SELECT user_id, name, role, age, permissions, preferences
+    FROM user_profiles
+    WHERE user_id = $1
+"""
+
+INSERT_CHAT_TURN_SQL = """
+    INSERT INTO conversation_history (thread_id, user_id, role, content, metadata)
+    VALUES ($1, $2, $3, $4, $5), ($6, $7, $8, $9, $10)
+"""
+
+INSERT_OPENAI_CHAT_TURN_SQL = """
+    INSERT INTO conversation_history (thread_id, user_id, role, content)
+    VALUES ($1, $2, $3, $4), ($5, $6, $7, $8)
+"""
+
+API_HOT_STATEMENTS = (
+    GET_USER_PROFILE_SQL,
+    INSERT_CHAT_TURN_SQL,
+    INSERT_OPENAI_CHAT_TURN_SQL,
+)
+
 
 # Initialize services
 content_processor_instance = ContentProcessor()
@@ -447,9 +463,15 @@ telegram_service = create_telegram_service(settings.telegram_bot_token) if setti
 
 
 # Utility Functions
+@lru_cache(maxsize=1024)
 def get_mock_family_member(user_id: str = "demo_user") -> FamilyMemberProfile:
-    """Get mock family member for testing purposes."""
-    return FamilyMemberProfile(
+    """
+    Get mock family member for testing purposes.
+
+    Cached per user_id and shared across requests, so treat it as read-only.
+    The values below are literals, so the model is built without validation.
+    """
+    return FamilyMemberProfile.model_construct(
         user_id=user_id,
         name="Demo Parent",
         role="parent",
@@ -470,6 +492,81 @@ def get_mock_family_member(user_id: str = "demo_user") -> FamilyMemberProfile:
     )
 
 
+def trusted_response(model: Type[BaseModel], **fields: Any) -> Response:
+    """
+    Serialize a response built from our own data without re-validating it.
+
+    Returning a dict makes FastAPI dump and validate it against the
+    response_model; for rows from our own tables and payloads assembled
+    here that is pure overhead, so build the model with model_construct and
+    serialize it directly. Never use this for client-supplied data.
+    """
+    return Response(
+        content=model.__pydantic_serializer__.to_json(model.model_construct(**fields)),
+        media_type="application/json",
+    )
+
+
+# user_profiles rows are cached in Redis as "family:user:<user_id>" with the
+# JSON columns already decoded; call invalidate_user_profile() after writing
+# a profile so readers don't wait out the TTL
+USER_PROFILE_CACHE_TTL = 300
+
+
+async def fetch_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read-through cached user profile lookup.
+
+    Returns None for unknown users (misses are not cached). Redis errors fall
+    back to reading PostgreSQL directly.
+    """
+    key = f"family:user:{user_id}"
+    redis_client = await get_redis_client()
+    try:
+        cached = await redis_client.get(key)
+    except redis.RedisError:
+        cached = None
+    if cached is not None:
+        return orjson.loads(cached)
+
+    async with db_pool.acquire() as conn:
+        row = await conn.fetchrow_prepared(GET_USER_PROFILE_SQL, user_id)
+    if not row:
+        return None
+
+    # Parse JSON columns if they're strings
+    permissions = row["permissions"]
+    if isinstance(permissions, str):
+        permissions = json.loads(permissions)
+
+    preferences = row["preferences"]
+    if isinstance(preferences, str):
+        preferences = json.loads(preferences)
+
+    profile = {
+        "user_id": row["user_id"],
+        "name": row["name"],
+        "role": row["role"],
+        "age": row["age"],
+        "permissions": permissions,
+        "preferences": preferences
+    }
+    try:
+        await redis_client.set(key, orjson.dumps(profile), ex=USER_PROFILE_CACHE_TTL)
+    except redis.RedisError:
+        pass
+    return profile
+
+
+async def invalidate_user_profile(user_id: str) -> None:
+    """Drop a cached user profile."""
+    redis_client = await get_redis_client()
+    try:
+        await redis_client.delete(f"family:user:{user_id}")
+    except redis.RedisError:
+        pass
+
+
 class MockAgent:
     """Mock agent for testing purposes."""
 
@@ -489,7 +586,7 @@ agent = MockAgent()
 async def startup():
     """Startup event handler."""
     global db_pool
-    db_pool = await get_db_pool()
+    db_pool = await init_db_pool(hot_statements=API_HOT_STATEMENTS)
     print(f"✅ Family Assistant API started on {settings.api_host}:{settings.api_port}")
     print(f"   - Ollama: {settings.ollama_base_url}")
     print(f"   - Mem0: {settings.mem0_api_url}")
@@ -500,8 +597,10 @@ async def startup():
 async def shutdown():
     """Shutdown event handler."""
     global db_pool
-    if db_pool:
-        await db_pool.close()
+    db_pool = None
+    # Drains queued audit log entries before closing the pool
+    await close_db_pool()
+    await close_redis_client()
     print("👋 Family Assistant API shut down")
 
 
@@ -617,33 +716,11 @@ async def get_user_profile(
     current_user: FamilyMember = Depends(get_current_user_from_token)
 ):
     """Get user profile."""
-    async with db_pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT * FROM user_profiles WHERE user_id = $1",
-            user_id
-        )
+    profile = await fetch_user_profile(user_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
 
-        if not row:
-            raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-
-        # Parse JSON columns if they're strings
-        import json
-        permissions = row["permissions"]
-        if isinstance(permissions, str):
-            permissions = json.loads(permissions)
-
-        preferences = row["preferences"]
-        if isinstance(preferences, str):
-            preferences = json.loads(preferences)
-
-        return {
-            "user_id": row["user_id"],
-            "name": row["name"],
-            "role": row["role"],
-            "age": row["age"],
-            "permissions": permissions,
-            "preferences": preferences
-        }
+    return trusted_response(UserProfileResponse, **profile)
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -673,87 +750,62 @@ async def chat(
     thread_id = request.thread_id or f"thread_{uuid.uuid4().hex[:8]}"
 
     # Process multimodal content if provided
-    content_processed = {}
+    content_processed = Counter()
     analysis_results = {}
 
     if request.multimodal_content:
+        # (kind, content) for every item to process, in request order
+        pending = []
+        jobs = []
         for content_item in request.multimodal_content:
             content_type = content_item.content.content_type
-            content_processed[content_type.value] = content_processed.get(content_type.value, 0) + 1
+            content_processed[content_type.value] += 1
 
-            # Process content based on type
+            # Process images with vision analysis, audio with transcription and
+            # documents with text extraction
             if isinstance(content_item.content, ImageContent):
-                # Process image with vision analysis
-                if hasattr(content_item.content, 'file_data') and content_item.content.file_data:
-                    try:
-                        # Convert multimodal content to ContentProcessor format
-                        result = await content_processor_instance.process_content(
-                            file_data=content_item.content.file_data,
-                            filename=f"image_{uuid.uuid4().hex[:8]}.jpg",
-                            family_member=await get_mock_family_member(request.user_id),
-                            conversation_id=thread_id
-                        )
-                        analysis_results[f"image_{content_item.content.content.content_type}"] = result.extracted_data
-                    except Exception as e:
-                        raise HTTPException(
-                            status_code=500,
-                            detail=f"Failed to process image: {str(e)}"
-                        )
-
+                kind, filename = "image", f"image_{uuid.uuid4().hex[:8]}.jpg"
             elif isinstance(content_item.content, AudioContent):
-                # Process audio with transcription
-                if hasattr(content_item.content, 'file_data') and content_item.content.file_data:
-                    try:
-                        result = await content_processor_instance.process_content(
-                            file_data=content_item.content.file_data,
-                            filename=f"audio_{uuid.uuid4().hex[:8]}.ogg",
-                            family_member=await get_mock_family_member(request.user_id),
-                            conversation_id=thread_id
-                        )
-                        analysis_results[f"audio_{content_item.content.content.content_type}"] = result.extracted_data
-                    except Exception as e:
-                        raise HTTPException(
-                            status_code=500,
-                            detail=f"Failed to process audio: {str(e)}"
-                        )
-
+                kind, filename = "audio", f"audio_{uuid.uuid4().hex[:8]}.ogg"
             elif isinstance(content_item.content, DocumentContent):
-                # Process document with text extraction
-                if hasattr(content_item.content, 'file_data') and content_item.content.file_data:
-                    try:
-                        result = await content_processor_instance.process_content(
-                            file_data=content_item.content.file_data,
-                            filename=f"doc_{uuid.uuid4().hex[:8]}.pdf",
-                            family_member=await get_mock_family_member(request.user_id),
-                            conversation_id=thread_id
-                        )
-                        analysis_results[f"document_{content_item.content.content.content_type}"] = result.extracted_data
-                    except Exception as e:
-                        raise HTTPException(
-                            status_code=500,
-                            detail=f"Failed to process document: {str(e)}"
-                        )
+                kind, filename = "document", f"doc_{uuid.uuid4().hex[:8]}.pdf"
+            else:
+                continue
+
+            if hasattr(content_item.content, 'file_data') and content_item.content.file_data:
+                pending.append((kind, content_item.content))
+                jobs.append(content_processor_instance.process_content(
+                    file_data=content_item.content.file_data,
+                    filename=filename,
+                    family_member=get_mock_family_member(request.user_id),
+                    conversation_id=thread_id
+                ))
+
+        # Items are independent, so process them concurrently
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        for (kind, content), result in zip(pending, results):
+            if isinstance(result, BaseException):
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to process {kind}: {str(result)}"
+                )
+            analysis_results[f"{kind}_{content.content.content_type}"] = result.extracted_data
 
     # Get user profile
-    async with db_pool.acquire() as conn:
-        user_profile = await conn.fetchrow(
-            "SELECT * FROM user_profiles WHERE user_id = $1",
-            request.user_id
+    user_profile = await fetch_user_profile(request.user_id)
+    if not user_profile:
+        raise HTTPException(
+            status_code=404,
+            detail=f"User {request.user_id} not found. Please create a user profile first."
         )
 
-        if not user_profile:
-            raise HTTPException(
-                status_code=404,
-                detail=f"User {request.user_id} not found. Please create a user profile first."
-            )
-
-        profile_dict = {
-            "name": user_profile["name"],
-            "role": user_profile["role"],
-            "age": user_profile["age"],
-            "permissions": user_profile["permissions"],
-            "preferences": user_profile["preferences"]
-        }
+    profile_dict = {
+        "name": user_profile["name"],
+        "role": user_profile["role"],
+        "age": user_profile["age"],
+        "permissions": user_profile["permissions"],
+        "preferences": user_profile["preferences"]
+    }
 
     # Prepare message with content analysis
     enhanced_message = request.message
@@ -791,32 +843,28 @@ async def chat(
             "memories_used": 0
         }
 
-        # Store in conversation history with enhanced content
+        # Store user message and assistant response in conversation history
+        # with enhanced content, in one round trip
         async with db_pool.acquire() as conn:
-            # Store user message
-            await conn.execute("""
-                INSERT INTO conversation_history (thread_id, user_id, role, content, metadata)
-                VALUES ($1, $2, $3, $4, $5)
-            """, thread_id, request.user_id, "user", enhanced_message or request.message, {
-                "multimodal": bool(request.multimodal_content),
-                "content_processed": content_processed,
-                "analysis_results": analysis_results
-            })
-
-            # Store assistant response
-            await conn.execute("""
-                INSERT INTO conversation_history (thread_id, user_id, role, content, metadata)
-                VALUES ($1, $2, $3, $4, $5)
-            """, thread_id, request.user_id, "assistant", result["response"], {
-                "response_type": "multimodal_chat"
-            })
+            await conn.execute_prepared(
+                INSERT_CHAT_TURN_SQL,
+                thread_id, request.user_id, "user", enhanced_message or request.message, {
+                    "multimodal": bool(request.multimodal_content),
+                    "content_processed": dict(content_processed),
+                    "analysis_results": analysis_results
+                },
+                thread_id, request.user_id, "assistant", result["response"], {
+                    "response_type": "multimodal_chat"
+                }
+            )
 
-        return ChatResponse(
+        return trusted_response(
+            ChatResponse,
             response=result["response"],
             thread_id=thread_id,
             user_id=request.user_id,
             memories_used=result.get("memories_used", 0),
-            content_processed=content_processed,
+            content_processed=dict(content_processed),
             analysis_results=analysis_results
         )
 
@@ -847,17 +895,19 @@ async def get_conversation(
                 ORDER BY created_at ASC
             """, thread_id)
 
-        return {
+        # Returned as a response so orjson encodes the datetimes natively
+        # instead of jsonable_encoder walking every message first
+        return ORJSONResponse({
             "thread_id": thread_id,
             "messages": [
                 {
                     "role": row["role"],
                     "content": row["content"],
-                    "timestamp": row["created_at"].isoformat()
+                    "timestamp": row["created_at"]
                 }
                 for row in rows
             ]
-        }
+        })
 
 
 @app.get("/users/{user_id}/conversations")
@@ -873,17 +923,17 @@ async def get_user_conversations(user_id: str, limit: int = 10):
             LIMIT $2
         """, user_id, limit)
 
-        return {
+        return ORJSONResponse({
             "user_id": user_id,
             "conversations": [
                 {
                     "thread_id": row["thread_id"],
-                    "started_at": row["started_at"].isoformat(),
-                    "last_message_at": row["last_message_at"].isoformat()
+                    "started_at": row["started_at"],
+                    "last_message_at": row["last_message_at"]
                 }
                 for row in rows
             ]
-        }
+        })
 
 
 # Multimodal content upload endpoint
@@ -908,14 +958,11 @@ async def upload_content(
     """
     try:
         # Get mock family member profile
-        family_member = await get_mock_family_member(user_id)
+        family_member = get_mock_family_member(user_id)
 
-        # Read file data
-        file_data = await file.read()
-
-        # Process content using ContentProcessor
-        result = await content_processor_instance.process_content(
-            file_data=file_data,
+        # Stream the upload through ContentProcessor in chunks
+        result = await content_processor_instance.process_upload(
+            upload_file=file,
             filename=file.filename,
             family_member=family_member,
             conversation_id=conversation_id
@@ -950,7 +997,7 @@ async def chat_multimodal(request: EnhancedChatRequest):
     try:
         # Get family member profile
         user_id = request.user_id or "default"
-        family_member = await get_mock_family_member(user_id)
+        family_member = get_mock_family_member(user_id)
 
         # Convert messages format
         messages = []
@@ -964,36 +1011,42 @@ async def chat_multimodal(request: EnhancedChatRequest):
             messages.append(chat_msg)
 
         # Mock enhanced processing (would integrate with actual agent)
-        import time
-
         # Process multimodal content if present
-        content_processed = {}
+        content_processed = Counter()
         analysis_results = {}
         processing_time = 0.0
 
+        pending = []
+        jobs = []
         for msg in messages:
             if msg.multimodal_content:
-                start_time = time.time()
-
                 for content_item in msg.multimodal_content:
                     content_type = content_item.content.content_type
-                    content_processed[content_type.value] = content_processed.get(content_type.value, 0) + 1
+                    content_processed[content_type.value] += 1
 
                     # Process content based on type
                     if isinstance(content_item.content, (ImageContent, AudioContent, DocumentContent)):
                         if hasattr(content_item.content, 'file_data') and content_item.content.file_data:
-                            try:
-                                result = await content_processor_instance.process_content(
-                                    file_data=content_item.content.file_data,
-                                    filename=f"{content_type.value}_{uuid.uuid4().hex[:8]}",
-                                    family_member=family_member
-                                )
-                                analysis_results[f"{content_type.value}_{len(analysis_results)}"] = result.extracted_data
-                            except Exception as e:
-                                # Log error but continue processing
-                                print(f"Failed to process {content_type.value}: {str(e)}")
-
-                processing_time += (time.time() - start_time) * 1000
+                            pending.append(content_type)
+                            jobs.append(content_processor_instance.process_content(
+                                file_data=content_item.content.file_data,
+                                filename=f"{content_type.value}_{uuid.uuid4().hex[:8]}",
+                                family_member=family_member
+                            ))
+
+        # Items are independent, so process them concurrently; processing
+        # time is the wall-clock time of the whole batch
+        if jobs:
+            start_time = time.time()
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+            processing_time = (time.time() - start_time) * 1000
+
+            for content_type, result in zip(pending, results):
+                if isinstance(result, BaseException):
+                    # Log error but continue processing
+                    print(f"Failed to process {content_type.value}: {str(result)}")
+                    continue
+                analysis_results[f"{content_type.value}_{len(analysis_results)}"] = result.extracted_data
 
         # Mock response (would integrate with actual agent)
         response_text = f"Hello! I processed your multimodal message with {sum(content_processed.values())} content items."
@@ -1023,7 +1076,7 @@ async def chat_multimodal(request: EnhancedChatRequest):
                 "total_tokens": sum(len(m.content.split()) if m.content else 0 for m in messages) + len(response_text.split())
             },
             processing_time_ms=processing_time,
-            content_processed=content_processed,
+            content_processed=dict(content_processed),
             analysis_results=analysis_results,
             family_actions_suggested=[
                 {
@@ -1300,8 +1353,6 @@ async def openai_chat_completions(request: OpenAIChatRequest):
     This allows LobeChat and other OpenAI-compatible clients to use
     the Family Assistant with full memory and context awareness.
     """
-    import time
-
     # Extract user_id from request.user or default to "default"
     user_id = request.user or "default"
 
@@ -1316,61 +1367,38 @@ async def openai_chat_completions(request: OpenAIChatRequest):
     thread_id = f"thread_{user_id}_{uuid.uuid4().hex[:8]}"
 
     # Get user profile
-    async with db_pool.acquire() as conn:
-        user_row = await conn.fetchrow(
-            "SELECT * FROM user_profiles WHERE user_id = $1",
-            user_id
-        )
+    user_profile = await fetch_user_profile(user_id)
 
-        if user_row:
-            import json
-            permissions = user_row["permissions"]
-            if isinstance(permissions, str):
-                permissions = json.loads(permissions)
-            preferences = user_row["preferences"]
-            if isinstance(preferences, str):
-                preferences = json.loads(preferences)
-
-            user_profile = {
-                "user_id": user_row["user_id"],
-                "name": user_row["name"],
-                "role": user_row["role"],
-                "age": user_row["age"],
-                "permissions": permissions,
-                "preferences": preferences
-            }
-        else:
-            user_profile = None
-
-        # Chat with agent
-        result = await agent.chat(
-            message=last_message,
-            user_id=user_id,
-            thread_id=thread_id,
-            user_profile=user_profile
-        )
+    # Chat with agent
+    result = await agent.chat(
+        message=last_message,
+        user_id=user_id,
+        thread_id=thread_id,
+        user_profile=user_profile
+    )
 
+    async with db_pool.acquire() as conn:
         # Store in conversation history
-        await conn.execute("""
-            INSERT INTO conversation_history (thread_id, user_id, role, content)
-            VALUES ($1, $2, $3, $4), ($5, $6, $7, $8)
-        """, thread_id, user_id, "user", last_message,
-             thread_id, user_id, "assistant", result["response"])
+        await conn.execute_prepared(
+            INSERT_OPENAI_CHAT_TURN_SQL,
+            thread_id, user_id, "user", last_message,
+            thread_id, user_id, "assistant", result["response"]
+        )
 
         # Audit log
-        import json
         await conn.execute("""
             INSERT INTO audit_log (user_id, action, resource, details)
-            VALUES ($1, $2, $3, $4::jsonb)
-        """, user_id, "chat", "openai_api", json.dumps({"model": request.model, "thread_id": thread_id}))
+            VALUES ($1, $2, $3, $4)
+        """, user_id, "chat", "openai_api", {"model": request.model, "thread_id": thread_id})
 
     # Format as OpenAI response
-    return {
-        "id": f"chatcmpl-{uuid.uuid4().hex[:8]}",
-        "object": "chat.completion",
-        "created": int(time.time()),
-        "model": request.model,
-        "choices": [
+    return trusted_response(
+        OpenAIChatResponse,
+        id=f"chatcmpl-{uuid.uuid4().hex[:8]}",
+        object="chat.completion",
+        created=int(time.time()),
+        model=request.model,
+        choices=[
             {
                 "index": 0,
                 "message": {
@@ -1380,12 +1408,12 @@ async def openai_chat_completions(request: OpenAIChatRequest):
                 "finish_reason": "stop"
             }
         ],
-        "usage": {
+        usage={
             "prompt_tokens": len(last_message.split()),
             "completion_tokens": len(result["response"].split()),
             "total_tokens": len(last_message.split()) + len(result["response"].split())
         }
-    }
+    )
 
 
 @app.get("/v1/models")
@@ -1453,5 +1481,7 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.api_reload,
-        log_level=settings.log_level
+        log_level=settings.log_level,
+        loop="uvloop",
+        http="httptools",
     )
@@ -4,12 +4,60 @@ Security headers middleware for Family Assistant.
 Adds security headers to all responses following OWASP best practices.
 """
 
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Content Security Policy
+# Restrict resource loading to same origin by default
+CSP_DIRECTIVES = [
+    "default-src 'self'",
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Allow inline scripts for React
+    "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com",  # Allow inline styles and Google Fonts
+    "img-src 'self' data: https:",  # Allow images from data URLs and HTTPS
+    "font-src 'self' data: https://fonts.gstatic.com",  # Allow fonts from data URLs and Google Fonts CDN
+    "connect-src 'self'",  # API calls to same origin
+    "frame-ancestors 'none'",  # Prevent framing (same as X-Frame-Options)
+    "base-uri 'self'",  # Restrict base tag URLs
+    "form-action 'self'",  # Forms can only submit to same origin
+]
+
+# Permissions Policy (formerly Feature-Policy)
+# Disable potentially dangerous browser features
+PERMISSIONS_DIRECTIVES = [
+    "geolocation=()",  # Disable geolocation
+    "microphone=()",  # Disable microphone
+    "camera=()",  # Disable camera
+    "payment=()",  # Disable payment API
+    "usb=()",  # Disable USB API
+    "magnetometer=()",  # Disable magnetometer
+    "gyroscope=()",  # Disable gyroscope
+    "accelerometer=()",  # Disable accelerometer
+]
+
+SECURITY_HEADERS = {
+    # Prevent MIME type sniffing
+    "X-Content-Type-Options": "nosniff",
+    # Prevent clickjacking
+    "X-Frame-Options": "DENY",
+    # Enable browser XSS protection (legacy but still useful)
+    "X-XSS-Protection": "1; mode=block",
+    # Enforce HTTPS for 1 year (31536000 seconds)
+    # Include subdomains and allow preloading
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload",
+    "Content-Security-Policy": "; ".join(CSP_DIRECTIVES),
+    "Permissions-Policy": ", ".join(PERMISSIONS_DIRECTIVES),
+    # Referrer Policy
+    # Send referrer only for same-origin requests
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    # Cross-Origin policies
+    "Cross-Origin-Embedder-Policy": "require-corp",
+    "Cross-Origin-Opener-Policy": "same-origin",
+    "Cross-Origin-Resource-Policy": "same-origin",
+}
+
+
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to all responses.
 
@@ -21,63 +69,26 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Content-Security-Policy: Prevent XSS and injection attacks
     - Permissions-Policy: Control browser features
     - Referrer-Policy: Control referrer information
-    """
-
-    async def dispatch(self, request: Request, call_next: Callable):
-        """Add security headers to response."""
-        response: Response = await call_next(request)
 
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # Enable browser XSS protection (legacy but still useful)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Enforce HTTPS for 1 year (31536000 seconds)
-        # Include subdomains and allow preloading
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains; preload"
-        )
-
-        # Content Security Policy
-        # Restrict resource loading to same origin by default
-        csp_directives = [
-            "default-src 'self'",
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Allow inline scripts for React
-            "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com",  # Allow inline styles and Google Fonts
-            "img-src 'self' data: https:",  # Allow images from data URLs and HTTPS
-            "font-src 'self' data: https://fonts.gstatic.com",  # Allow fonts from data URLs and Google Fonts CDN
-            "connect-src 'self'",  # API calls to same origin
-            "frame-ancestors 'none'",  # Prevent framing (same as X-Frame-Options)
-            "base-uri 'self'",  # Restrict base tag URLs
-            "form-action 'self'",  # Forms can only submit to same origin
-        ]
-        response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
+    Written as plain ASGI rather than BaseHTTPMiddleware: the headers are
+    added to the response start message as it passes through, so requests
+    are not re-run in a separate task with the body piped through a stream.
+    """
 
-        # Permissions Policy (formerly Feature-Policy)
-        # Disable potentially dangerous browser features
-        permissions_directives = [
-            "geolocation=()",  # Disable geolocation
-            "microphone=()",  # Disable microphone
-            "camera=()",  # Disable camera
-            "payment=()",  # Disable payment API
-            "usb=()",  # Disable USB API
-            "magnetometer=()",  # Disable magnetometer
-            "gyroscope=()",  # Disable gyroscope
-            "accelerometer=()",  # Disable accelerometer
-        ]
-        response.headers["Permissions-Policy"] = ", ".join(permissions_directives)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        # Referrer Policy
-        # Send referrer only for same-origin requests
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Cross-Origin policies
-        response.headers["Cross-Origin-Embedder-Policy"] = "require-corp"
-        response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-        response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
+        async def send_with_headers(message: Message):
+            """Add security headers to response."""
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers[name] = value
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_headers)
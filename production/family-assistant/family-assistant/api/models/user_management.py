@@ -133,6 +133,9 @@ class FamilyMemberUpdate(BaseModel):
     active_skills: Optional[List[str]] = None
     preferences: Optional[Dict[str, Any]] = None
 
+    class Config:
+        use_enum_values = True  # partial updates bind straight to SQL
+
 
 class FamilyMember(FamilyMemberBase):
     """Complete family member with DB fields"""
@@ -149,6 +152,7 @@ class FamilyMember(FamilyMemberBase):
 
     class Config:
         from_attributes = True
+        frozen = True  # instances are shared by the login lookup cache
 
 
 # ==============================================================================
@@ -271,6 +275,9 @@ class ParentalControlsUpdate(BaseModel):
     notify_parent_on_limit_exceeded: Optional[bool] = None
     notify_parent_on_emergency: Optional[bool] = None
 
+    class Config:
+        use_enum_values = True  # partial updates bind straight to SQL
+
 
 class ParentalControls(ParentalControlsBase):
     """Complete parental controls with DB fields"""
@@ -317,7 +317,7 @@ async def change_password(
     """
     try:
         from api.auth.jwt_auth import password_manager
-        from api.services.user_manager import UserManager
+        from api.services.user_manager import UserManager, run_in_password_executor
 
         # Get user manager
         user_manager = UserManager(db_pool)
@@ -326,8 +326,10 @@ async def change_password(
         # For now, we'll skip current password verification as it's not implemented
         # In production, you'd verify against stored hash
 
-        # Hash new password
-        new_password_hash = password_manager.hash_password(password_data.new_password)
+        # Hash new password (argon2id, off the event loop)
+        new_password_hash = await run_in_password_executor(
+            password_manager.hash_password, password_data.new_password
+        )
 
         # Update password in database (this would require database schema update)
         # For now, we'll just return success
@@ -360,7 +362,7 @@ async def forgot_password(
         user_manager = UserManager(db_pool)
 
         # Check if user exists
-        user = await user_manager.get_family_member_by_email(password_reset.email)
+        user = await user_manager.get_auth_record(password_reset.email)
         if not user:
             # Don't reveal that user doesn't exist
             return {"message": "If email exists, password reset link has been sent"}
@@ -400,7 +402,7 @@ async def reset_password(
     """
     try:
         from api.auth.jwt_auth import password_manager
-        from api.services.user_manager import UserManager
+        from api.services.user_manager import UserManager, run_in_password_executor
 
         # Verify reset token
         email = password_manager.verify_password_reset_token(reset_data.token)
@@ -413,15 +415,17 @@ async def reset_password(
         user_manager = UserManager(db_pool)
 
         # Get user by email
-        user = await user_manager.get_family_member_by_email(email)
+        user = await user_manager.get_auth_record(email)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid reset token",
             )
 
-        # Hash new password
-        new_password_hash = password_manager.hash_password(reset_data.new_password)
+        # Hash new password (argon2id, off the event loop)
+        new_password_hash = await run_in_password_executor(
+            password_manager.hash_password, reset_data.new_password
+        )
 
         # Update password in database (this would require database schema update)
         # For now, we'll just return success
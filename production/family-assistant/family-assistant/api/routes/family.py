@@ -5,7 +5,7 @@ Endpoints for family member management, permissions, parental controls,
 screen time tracking, and content filtering.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from typing import List, Optional
 from uuid import UUID
 from datetime import date
@@ -36,7 +36,8 @@ from ..models.user_management import (
 )
 from ..services.user_manager import UserManager
 from ..services.content_filter import ContentFilter
-from ..dependencies import get_db_pool, get_current_user
+from ..dependencies import get_db_pool, get_redis_client, get_current_user
+from config.settings import settings
 
 router = APIRouter(prefix="/api/v1/family", tags=["Family Management"])
 
@@ -51,9 +52,10 @@ async def create_family_member(
     member_data: FamilyMemberCreate,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Create new family member (requires parent/admin permission)"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Check permission
     perm_check = await user_mgr.check_permission(current_user.id, "family.member.create")
@@ -73,13 +75,21 @@ async def create_family_member(
 @router.get("/members", response_model=FamilyMemberListResponse)
 async def list_family_members(
     include_inactive: bool = False,
+    limit: int = Query(100, ge=1, le=500),
+    after_id: Optional[UUID] = None,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """List all family members"""
-    user_mgr = UserManager(db_pool)
-    members = await user_mgr.list_family_members(include_inactive=include_inactive)
-    return FamilyMemberListResponse(members=members, total=len(members))
+    user_mgr = UserManager(db_pool, redis_client)
+    payload = await user_mgr.list_family_members_json(
+        include_inactive=include_inactive, limit=limit, after_id=after_id
+    )
+    if settings.debug:
+        # Serialized by Postgres; make sure it still matches the response model
+        FamilyMemberListResponse.model_validate_json(payload)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/members/{member_id}", response_model=FamilyMember)
@@ -87,9 +97,10 @@ async def get_family_member(
     member_id: UUID,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Get family member by ID"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
     member = await user_mgr.get_family_member(member_id)
 
     if not member:
@@ -104,9 +115,10 @@ async def update_family_member(
     update_data: FamilyMemberUpdate,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Update family member profile"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Check permission (must be self or parent/admin)
     if member_id != current_user.id:
@@ -130,9 +142,10 @@ async def delete_family_member(
     member_id: UUID,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Delete (deactivate) family member"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Check permission
     perm_check = await user_mgr.check_permission(current_user.id, "family.member.delete")
@@ -159,9 +172,10 @@ async def check_permission(
     permission_name: str,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Check if user has specific permission"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
     return await user_mgr.check_permission(user_id, permission_name)
 
 
@@ -170,9 +184,10 @@ async def grant_permission(
     perm_data: UserPermissionCreate,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Grant permission to user (requires admin)"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Check permission
     perm_check = await user_mgr.check_permission(current_user.id, "family.permissions.manage")
@@ -194,9 +209,10 @@ async def revoke_permission(
     permission_name: str,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Revoke permission from user (requires admin)"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Check permission
     perm_check = await user_mgr.check_permission(current_user.id, "family.permissions.manage")
@@ -214,9 +230,10 @@ async def list_user_permissions(
     user_id: UUID,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """List all permissions for user"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Check permission (must be self or parent/admin)
     if user_id != current_user.id:
@@ -240,9 +257,10 @@ async def create_parental_controls(
     controls_data: ParentalControlsCreate,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Create parental controls for child (requires parent permission)"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Verify current user is the parent
     if controls_data.parent_id != current_user.id:
@@ -262,9 +280,10 @@ async def get_parental_controls(
     child_id: UUID,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Get parental controls for child"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Check permission (must be parent or admin)
     if child_id != current_user.id:  # Children can view their own controls
@@ -289,9 +308,10 @@ async def update_parental_controls(
     update_data: ParentalControlsUpdate,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Update parental controls for child"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Get existing controls to verify parent
     controls = await user_mgr.get_parental_controls(child_id, parent_id=current_user.id)
@@ -321,9 +341,10 @@ async def update_screen_time(
     screen_time: ScreenTimeUpdate,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Update screen time log for user"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Must be updating own screen time or have permission
     if screen_time.user_id != current_user.id:
@@ -343,9 +364,10 @@ async def get_screen_time_log(
     date: date,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Get screen time log for specific date"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Must be viewing own screen time or have permission
     if user_id != current_user.id:
@@ -374,13 +396,14 @@ async def check_content(
     check_data: ContentFilterCheck,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Check content against filtering rules"""
     content_filter = ContentFilter(db_pool)
 
     # Must be checking own content or have permission
     if check_data.user_id != current_user.id:
-        user_mgr = UserManager(db_pool)
+        user_mgr = UserManager(db_pool, redis_client)
         perm_check = await user_mgr.check_permission(current_user.id, "family.content_filter.manage")
         if not perm_check.has_permission:
             raise HTTPException(
@@ -401,13 +424,14 @@ async def get_content_filter_logs(
     limit: int = 100,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Get content filter logs for user"""
     content_filter = ContentFilter(db_pool)
 
     # Must be viewing own logs or have permission
     if user_id != current_user.id:
-        user_mgr = UserManager(db_pool)
+        user_mgr = UserManager(db_pool, redis_client)
         perm_check = await user_mgr.check_permission(current_user.id, "family.content_filter.view")
         if not perm_check.has_permission:
             raise HTTPException(
@@ -424,13 +448,14 @@ async def get_content_filter_stats(
     days: int = 7,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Get content filtering statistics"""
     content_filter = ContentFilter(db_pool)
 
     # Must be viewing own stats or have permission
     if user_id != current_user.id:
-        user_mgr = UserManager(db_pool)
+        user_mgr = UserManager(db_pool, redis_client)
         perm_check = await user_mgr.check_permission(current_user.id, "family.content_filter.view")
         if not perm_check.has_permission:
             raise HTTPException(
@@ -520,9 +545,10 @@ async def get_audit_logs(
     limit: int = 100,
     current_user: FamilyMember = Depends(get_current_user),
     db_pool=Depends(get_db_pool),
+    redis_client=Depends(get_redis_client),
 ):
     """Get audit logs (requires admin permission)"""
-    user_mgr = UserManager(db_pool)
+    user_mgr = UserManager(db_pool, redis_client)
 
     # Check permission
     perm_check = await user_mgr.check_permission(current_user.id, "family.audit.view")
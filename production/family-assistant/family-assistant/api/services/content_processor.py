@@ -72,6 +72,7 @@ class ContentProcessor:
             ContentType.AUDIO: 100 * 1024 * 1024,     # 100MB
             ContentType.VIDEO: 500 * 1024 * 1024,     # 500MB
             ContentType.DOCUMENT: 100 * 1024 * 1024,   # 100MB
+            ContentType.FILE: 100 * 1024 * 1024,       # 100MB, anything unrecognized
         }
 
         # Supported file formats
@@ -82,6 +83,9 @@ class ContentProcessor:
             ContentType.DOCUMENT: ['.pdf', '.docx', '.txt', '.md', '.rtf']
         }
 
+    # Read size for streamed uploads
+    CHUNK_SIZE = 1024 * 1024
+
     async def process_content(
         self,
         file_data: bytes,
@@ -97,14 +101,74 @@ class ContentProcessor:
         # Validate file size
         self._validate_file_size(file_data, content_type)
 
-        # Generate unique filename
+        # Save file to storage
+        stored_filename, file_path = self._storage_path_for(filename)
+        await self._save_file(file_data, file_path)
+
+        return await self._process_stored_file(
+            filename=filename,
+            stored_filename=stored_filename,
+            file_path=file_path,
+            content_type=content_type,
+            file_size=len(file_data),
+            checksum_md5=hashlib.md5(file_data).hexdigest(),
+            family_member=family_member,
+            conversation_id=conversation_id
+        )
+
+    async def process_upload(
+        self,
+        upload_file,
+        filename: str,
+        family_member: FamilyMemberProfile,
+        conversation_id: Optional[str] = None
+    ) -> ContentProcessingResult:
+        """
+        Process content read from an async file object such as FastAPI's
+        UploadFile.
+
+        The data is streamed to storage in CHUNK_SIZE pieces, hashing and
+        size-checking as it goes, so the upload is never held in memory as a
+        whole and oversized files are rejected as soon as they cross the limit.
+        """
+
+        # Determine content type (detection only looks at the filename)
+        content_type = self._detect_content_type(filename, b"")
+
+        # Stream file to storage
+        stored_filename, file_path = self._storage_path_for(filename)
+        file_size, checksum_md5 = await self._stream_file(upload_file, file_path, content_type)
+
+        return await self._process_stored_file(
+            filename=filename,
+            stored_filename=stored_filename,
+            file_path=file_path,
+            content_type=content_type,
+            file_size=file_size,
+            checksum_md5=checksum_md5,
+            family_member=family_member,
+            conversation_id=conversation_id
+        )
+
+    def _storage_path_for(self, filename: str) -> Tuple[str, Path]:
+        """Generate a unique stored filename and its storage path."""
         file_id = str(uuid.uuid4())
         extension = Path(filename).suffix.lower()
         stored_filename = f"{file_id}{extension}"
-        file_path = self.storage_path / stored_filename
+        return stored_filename, self.storage_path / stored_filename
 
-        # Save file to storage
-        await self._save_file(file_data, file_path)
+    async def _process_stored_file(
+        self,
+        filename: str,
+        stored_filename: str,
+        file_path: Path,
+        content_type: ContentType,
+        file_size: int,
+        checksum_md5: str,
+        family_member: FamilyMemberProfile,
+        conversation_id: Optional[str] = None
+    ) -> ContentProcessingResult:
+        """Record and process a file that has been written to storage."""
 
         # Create database record
         upload = await self._create_upload_record(
@@ -112,7 +176,8 @@ class ContentProcessor:
             stored_filename=stored_filename,
             file_path=str(file_path),
             content_type=content_type,
-            file_data=file_data,
+            file_size=file_size,
+            checksum_md5=checksum_md5,
             family_member=family_member,
             conversation_id=conversation_id
         )
@@ -175,25 +240,46 @@ class ContentProcessor:
         async with aiofiles.open(file_path, 'wb') as f:
             await f.write(file_data)
 
+    async def _stream_file(self, upload_file, file_path: Path, content_type: ContentType) -> Tuple[int, str]:
+        """Stream an async file object to storage; returns its size and MD5."""
+        max_size = self.max_file_sizes.get(content_type, self.max_file_sizes[ContentType.FILE])
+        checksum = hashlib.md5()
+        file_size = 0
+
+        try:
+            async with aiofiles.open(file_path, 'wb') as f:
+                while chunk := await upload_file.read(self.CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > max_size:
+                        raise FileSizeExceededError(
+                            f"File size exceeds maximum {max_size} bytes for {content_type.value}"
+                        )
+                    checksum.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            file_path.unlink(missing_ok=True)
+            raise
+
+        return file_size, checksum.hexdigest()
+
     async def _create_upload_record(
         self,
         filename: str,
         stored_filename: str,
         file_path: str,
         content_type: ContentType,
-        file_data: bytes,
+        file_size: int,
+        checksum_md5: str,
         family_member: FamilyMemberProfile,
         conversation_id: Optional[str] = None
     ) -> ContentUpload:
         """Create database record for uploaded content."""
 
         # Calculate file metadata
-        file_size = len(file_data)
-        checksum_md5 = hashlib.md5(file_data).hexdigest()
         mime_type, _ = mimetypes.guess_type(filename)
 
         # Extract additional metadata based on content type
-        metadata = await self._extract_metadata(file_data, content_type, filename)
+        metadata = await self._extract_metadata(file_path, content_type, filename)
 
         # Create upload record (this would be saved to database)
         upload = ContentUpload(
@@ -217,23 +303,23 @@ class ContentProcessor:
 
         return upload
 
-    async def _extract_metadata(self, file_data: bytes, content_type: ContentType, filename: str) -> Dict[str, Any]:
-        """Extract metadata from file data."""
+    async def _extract_metadata(self, file_path: str, content_type: ContentType, filename: str) -> Dict[str, Any]:
+        """Extract metadata from the stored file."""
         metadata = {}
 
         if content_type == ContentType.IMAGE:
-            metadata = await self._extract_image_metadata(file_data)
+            metadata = await self._extract_image_metadata(file_path)
         elif content_type == ContentType.AUDIO:
-            metadata = await self._extract_audio_metadata(file_data, filename)
+            metadata = await self._extract_audio_metadata(file_path, filename)
         elif content_type == ContentType.DOCUMENT:
-            metadata = await self._extract_document_metadata(file_data, filename)
+            metadata = await self._extract_document_metadata(file_path, filename)
 
         return metadata
 
-    async def _extract_image_metadata(self, file_data: bytes) -> Dict[str, Any]:
-        """Extract metadata from image data."""
+    async def _extract_image_metadata(self, file_path: str) -> Dict[str, Any]:
+        """Extract metadata from an image file."""
         try:
-            with Image.open(io.BytesIO(file_data)) as img:
+            with Image.open(file_path) as img:
                 # Auto-orient image based on EXIF
                 img = ImageOps.exif_transpose(img)
 
@@ -254,38 +340,34 @@ class ContentProcessor:
         except Exception as e:
             raise ContentProcessorError(f"Failed to extract image metadata: {str(e)}")
 
-    async def _extract_audio_metadata(self, file_data: bytes, filename: str) -> Dict[str, Any]:
-        """Extract metadata from audio data."""
+    async def _extract_audio_metadata(self, file_path: str, filename: str) -> Dict[str, Any]:
+        """Extract metadata from an audio file."""
         try:
-            with tempfile.NamedTemporaryFile() as temp_file:
-                await aiofiles.write(temp_file.name, file_data)
-                audio = AudioSegment.from_file(temp_file.name)
+            audio = AudioSegment.from_file(file_path)
 
-                metadata = {
-                    'duration_seconds': len(audio) / 1000.0,
-                    'channels': audio.channels,
-                    'frame_rate': audio.frame_rate,
-                    'sample_width': audio.sample_width
-                }
+            metadata = {
+                'duration_seconds': len(audio) / 1000.0,
+                'channels': audio.channels,
+                'frame_rate': audio.frame_rate,
+                'sample_width': audio.sample_width
+            }
 
-                # Get format information
-                if hasattr(audio, 'format_info'):
-                    metadata['format'] = audio.format_info.get('name', 'unknown')
+            # Get format information
+            if hasattr(audio, 'format_info'):
+                metadata['format'] = audio.format_info.get('name', 'unknown')
 
-                return metadata
+            return metadata
         except Exception as e:
             raise ContentProcessorError(f"Failed to extract audio metadata: {str(e)}")
 
-    async def _extract_document_metadata(self, file_data: bytes, filename: str) -> Dict[str, Any]:
-        """Extract metadata from document data."""
+    async def _extract_document_metadata(self, file_path: str, filename: str) -> Dict[str, Any]:
+        """Extract metadata from a document file."""
         try:
             extension = Path(filename).suffix.lower()
             metadata = {}
 
             if extension == '.pdf':
-                import io
-                import PyPDF2
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_data))
+                pdf_reader = PyPDF2.PdfReader(file_path)
                 metadata.update({
                     'page_count': len(pdf_reader.pages),
                     'format': 'pdf'
@@ -5,15 +5,31 @@ Provides business logic for family member management, RBAC, and permissions.
 """
 
 import asyncio
-from datetime import datetime, date
-from typing import List, Optional, Dict, Any
-from uuid import UUID
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, date, timezone
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Dict, Any, Sequence
+from uuid import UUID, uuid4
+import argon2
 import asyncpg
+import bcrypt
+import orjson
+import redis.asyncio as redis
 
 from ..models.user_management import (
+    AgeGroup,
     FamilyMember,
     FamilyMemberCreate,
     FamilyMemberUpdate,
+    LanguagePreference,
     UserRole,
     Permission,
     UserPermission,
@@ -31,72 +47,915 @@ from ..models.user_management import (
 from config.settings import settings
 
 
+# ==============================================================================
+# Hot Statements
+# ==============================================================================
+
+GET_FAMILY_MEMBER_SQL = """
+    SELECT id, telegram_id, username,
+           COALESCE(first_name, '') AS first_name,
+           COALESCE(last_name, '') AS last_name,
+           username AS email, role, age_group,
+           COALESCE(language_preference, 'en') AS language_preference,
+           hashed_password, is_active, created_at, updated_at
+    FROM family_members
+    WHERE id = $1 AND is_active = TRUE
+    UNION ALL
+    SELECT deterministic_uuid,
+           NULL, username, 'Admin', 'User',
+           email, CASE WHEN is_admin THEN 'parent' ELSE 'member' END,
+           'adult', 'en',
+           password_hash, is_active, created_at, updated_at
+    FROM users
+    WHERE deterministic_uuid = $1 AND is_active = TRUE
+    LIMIT 1
+"""
+
+# Hot statements project explicit columns: a prepared "SELECT *" breaks
+# (InvalidCachedStatementError) as soon as a migration adds a column
+
+# accounts_v columns _member_from_row builds a FamilyMember from
+ACCOUNT_COLUMNS = """
+    login, id, username, first_name, last_name, email, role, age_group,
+    language_preference, hashed_password, is_active, created_at, updated_at
+"""
+
+# Login lookup against accounts_v (migration 009): admin accounts (users, by
+# email) win over family accounts (family_members, by username)
+GET_FAMILY_MEMBER_BY_EMAIL_SQL = f"""
+    SELECT {ACCOUNT_COLUMNS} FROM accounts_v
+    WHERE login = $1 AND is_active = TRUE
+    ORDER BY priority
+    LIMIT 1
+"""
+
+# Batched form for EmailLookupBatcher: one row per matched login
+GET_FAMILY_MEMBERS_BY_EMAILS_SQL = f"""
+    SELECT DISTINCT ON (login) {ACCOUNT_COLUMNS} FROM accounts_v
+    WHERE login = ANY($1::text[]) AND is_active = TRUE
+    ORDER BY login, priority
+"""
+
+# Credential-only form of GET_FAMILY_MEMBER_BY_EMAIL_SQL
+GET_AUTH_RECORD_SQL = """
+    SELECT id, hashed_password, is_active, role
+    FROM accounts_v
+    WHERE login = $1 AND is_active = TRUE
+    ORDER BY priority
+    LIMIT 1
+"""
+
+GET_PASSWORD_HASH_SQL = """
+    SELECT password_hash FROM users
+    WHERE username = $1 AND password_hash IS NOT NULL
+    UNION ALL
+    SELECT hashed_password FROM family_members
+    WHERE username = $1 AND hashed_password IS NOT NULL
+    LIMIT 1
+"""
+
+# Compare-and-swap on the old hash, so concurrent rehashes of the same
+# account are harmless
+UPDATE_PASSWORD_HASH_SQL = """
+    WITH updated_user AS (
+        UPDATE users SET password_hash = $2
+        WHERE username = $1 AND password_hash = $3
+    )
+    UPDATE family_members SET hashed_password = $2
+    WHERE username = $1 AND hashed_password = $3
+"""
+
+# Every FamilyMember column except hashed_password
+FAMILY_MEMBER_COLUMNS = """
+    id, telegram_id, email, username,
+    first_name, last_name, display_name, avatar_url, date_of_birth,
+    role, age_group, is_admin,
+    language_preference, timezone, theme_preference,
+    privacy_level, safety_level, content_filtering_enabled,
+    active_skills, preferences,
+    is_active, created_at, updated_at, last_active_at
+"""
+
+GET_FAMILY_MEMBER_BY_TELEGRAM_ID_SQL = f"""
+    SELECT {FAMILY_MEMBER_COLUMNS}, hashed_password
+    FROM family_members
+    WHERE telegram_id = $1 AND is_active = TRUE
+"""
+
+LIST_FAMILY_MEMBERS_SQL = f"""
+    SELECT {FAMILY_MEMBER_COLUMNS}
+    FROM family_members
+    WHERE ($1 OR is_active = TRUE)
+      AND ($2::uuid IS NULL
+           OR (created_at, id) < (SELECT created_at, id FROM family_members WHERE id = $2))
+    ORDER BY created_at DESC, id DESC
+    LIMIT $3
+"""
+
+# Same page as LIST_FAMILY_MEMBERS_SQL, serialized by Postgres in the
+# FamilyMemberListResponse shape; the aggregate repeats the ORDER BY, since
+# a subquery's order is not guaranteed to survive aggregation
+LIST_FAMILY_MEMBERS_JSON_SQL = f"""
+    SELECT json_build_object(
+               'members', COALESCE(
+                   json_agg(t ORDER BY t.created_at DESC, t.id DESC), '[]'::json
+               ),
+               'total', count(*)
+           )::text
+    FROM ({LIST_FAMILY_MEMBERS_SQL}) t
+"""
+
+UPDATE_LAST_ACTIVE_SQL = "UPDATE family_members SET last_active_at = NOW() WHERE id = $1"
+
+UPDATE_LAST_ACTIVE_BATCH_SQL = """
+    UPDATE family_members f
+    SET last_active_at = v.last_active_at
+    FROM unnest($1::uuid[], $2::timestamptz[]) AS v(id, last_active_at)
+    WHERE f.id = v.id
+"""
+
+CHECK_PERMISSION_SQL = """
+    SELECT has_permission($1, $2) AS has_permission,
+           override.user_id IS NOT NULL AS overridden,
+           override.reason
+    FROM (SELECT 1) AS one
+    LEFT JOIN (
+        SELECT up.user_id, up.reason
+        FROM user_permissions up
+        JOIN permissions p ON up.permission_id = p.id
+        WHERE up.user_id = $1 AND p.name = $2
+          AND (up.expires_at IS NULL OR up.expires_at > NOW())
+    ) AS override ON TRUE
+"""
+
+LIST_USER_PERMISSIONS_SQL = """
+    SELECT up.id, up.user_id, up.permission_id, up.granted, up.granted_by,
+           up.reason, up.expires_at, up.created_at
+    FROM user_permissions up
+    WHERE up.user_id = $1
+      AND (up.expires_at IS NULL OR up.expires_at > NOW())
+    ORDER BY up.created_at DESC
+"""
+
+PARENTAL_CONTROLS_COLUMNS = (
+    "id", "child_id", "parent_id",
+    "screen_time_enabled", "daily_limit_minutes",
+    "weekday_limit_minutes", "weekend_limit_minutes",
+    "quiet_hours_start", "quiet_hours_end",
+    "content_filter_level", "blocked_keywords", "allowed_domains", "blocked_domains",
+    "activity_monitoring_enabled", "conversation_review_enabled",
+    "location_sharing_enabled",
+    "notify_parent_on_flagged_content", "notify_parent_on_limit_exceeded",
+    "notify_parent_on_emergency",
+    "created_at", "updated_at",
+)
+
+GET_PARENTAL_CONTROLS_SQL = f"""
+    SELECT {', '.join(PARENTAL_CONTROLS_COLUMNS)}
+    FROM parental_controls
+    WHERE child_id = $1 AND parent_id = $2
+"""
+
+GET_PRIMARY_PARENTAL_CONTROLS_SQL = f"""
+    SELECT {', '.join(f'pc.{column}' for column in PARENTAL_CONTROLS_COLUMNS)}
+    FROM parental_controls pc
+    JOIN family_members fm ON pc.parent_id = fm.id
+    WHERE pc.child_id = $1
+    ORDER BY fm.is_admin DESC, pc.created_at ASC
+    LIMIT 1
+"""
+
+# Bump the activity row and the daily log, then read the primary parent's
+# limits, in one round-trip
+UPDATE_SCREEN_TIME_SQL = """
+    WITH activity AS (
+        INSERT INTO screen_time_activity (user_id, date, activity_type, minutes)
+        VALUES ($1, $2, $4, $3)
+        ON CONFLICT (user_id, date, activity_type)
+        DO UPDATE SET minutes = screen_time_activity.minutes + EXCLUDED.minutes
+    ),
+    log AS (
+        INSERT INTO screen_time_logs (user_id, date, total_minutes, session_count)
+        VALUES ($1, $2, $3, 1)
+        ON CONFLICT (user_id, date)
+        DO UPDATE SET
+            total_minutes = screen_time_logs.total_minutes + EXCLUDED.total_minutes,
+            session_count = screen_time_logs.session_count + 1,
+            updated_at = NOW()
+        RETURNING total_minutes
+    )
+    SELECT $1::uuid AS user_id,
+           $2::date AS date,
+           s.total_minutes,
+           s.limit_minutes,
+           GREATEST(0, s.limit_minutes - s.total_minutes) AS remaining_minutes,
+           CASE WHEN s.limit_minutes > 0
+                THEN s.total_minutes * 100.0 / s.limit_minutes
+                ELSE 0
+           END::float8 AS percentage_used,
+           s.enabled AND s.total_minutes >= s.limit_minutes AS is_limit_exceeded,
+           s.in_quiet_hours
+    FROM (
+        SELECT log.total_minutes,
+               COALESCE(pc.screen_time_enabled, FALSE) AS enabled,
+               -- Weekend/weekday override when set, else the daily limit
+               CASE WHEN NOT COALESCE(pc.screen_time_enabled, FALSE) THEN 0
+                    WHEN EXTRACT(ISODOW FROM $2::date) >= 6
+                    THEN COALESCE(NULLIF(pc.weekend_limit_minutes, 0), pc.daily_limit_minutes, 0)
+                    ELSE COALESCE(NULLIF(pc.weekday_limit_minutes, 0), pc.daily_limit_minutes, 0)
+               END AS limit_minutes,
+               COALESCE(
+                   pc.screen_time_enabled
+                   AND LOCALTIME BETWEEN pc.quiet_hours_start AND pc.quiet_hours_end,
+                   FALSE
+               ) AS in_quiet_hours
+        FROM log
+        LEFT JOIN LATERAL (
+            SELECT pc.*
+            FROM parental_controls pc
+            JOIN family_members fm ON pc.parent_id = fm.id
+            WHERE pc.child_id = $1
+            ORDER BY fm.is_admin DESC, pc.created_at ASC
+            LIMIT 1
+        ) AS pc ON TRUE
+    ) AS s
+"""
+
+GET_SCREEN_TIME_LOG_SQL = """
+    SELECT l.id, l.user_id, l.date, l.total_minutes, l.session_count,
+           COALESCE(a.breakdown, '{}'::jsonb) AS activity_breakdown,
+           l.created_at, l.updated_at
+    FROM screen_time_logs l
+    LEFT JOIN LATERAL (
+        SELECT jsonb_object_agg(activity_type, minutes) AS breakdown
+        FROM screen_time_activity
+        WHERE user_id = l.user_id AND date = l.date
+    ) AS a ON TRUE
+    WHERE l.user_id = $1 AND l.date = $2
+"""
+
+# get_audit_logs, keyed by (filter on user_id, filter on action); each
+# shape matches one of the (column, created_at DESC) indexes
+AUDIT_LOG_QUERIES = {
+    (True, True): (
+        "SELECT * FROM audit_log WHERE user_id = $1 AND action = $2 "
+        "ORDER BY created_at DESC LIMIT $3"
+    ),
+    (True, False): (
+        "SELECT * FROM audit_log WHERE user_id = $1 "
+        "ORDER BY created_at DESC LIMIT $2"
+    ),
+    (False, True): (
+        "SELECT * FROM audit_log WHERE action = $1 "
+        "ORDER BY created_at DESC LIMIT $2"
+    ),
+    (False, False): "SELECT * FROM audit_log ORDER BY created_at DESC LIMIT $1",
+}
+
+# Inline audit insert, used when the entry can't go through AuditLogWriter
+CREATE_AUDIT_LOG_SQL = """
+    INSERT INTO audit_log (
+        user_id, action, resource_type, resource_id,
+        details, success, error_message
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+    RETURNING id
+"""
+
+HOT_STATEMENTS = (
+    GET_FAMILY_MEMBER_SQL,
+    GET_FAMILY_MEMBER_BY_EMAIL_SQL,
+    GET_FAMILY_MEMBERS_BY_EMAILS_SQL,
+    GET_AUTH_RECORD_SQL,
+    GET_PASSWORD_HASH_SQL,
+    GET_FAMILY_MEMBER_BY_TELEGRAM_ID_SQL,
+    LIST_FAMILY_MEMBERS_SQL,
+    LIST_FAMILY_MEMBERS_JSON_SQL,
+    UPDATE_LAST_ACTIVE_SQL,
+    CHECK_PERMISSION_SQL,
+    LIST_USER_PERMISSIONS_SQL,
+    GET_PARENTAL_CONTROLS_SQL,
+    GET_PRIMARY_PARENTAL_CONTROLS_SQL,
+    UPDATE_SCREEN_TIME_SQL,
+    GET_SCREEN_TIME_LOG_SQL,
+    CREATE_AUDIT_LOG_SQL,
+)
+
+
+class UserManagerConnection(asyncpg.Connection):
+    """Pooled connection carrying UserManager's prepared statements"""
+
+    __slots__ = ("prepared",)
+
+    async def fetchrow_prepared(self, sql: str, *args):
+        """fetchrow() through the statement prepared for ``sql``, if any"""
+        if _prepared(self, sql):
+            return await _call_prepared(self, sql, "fetchrow", *args)
+        return await self.fetchrow(sql, *args)
+
+    async def execute_prepared(self, sql: str, *args) -> None:
+        """execute() through the statement prepared for ``sql``, if any"""
+        if _prepared(self, sql):
+            await _call_prepared(self, sql, "fetch", *args)
+        else:
+            await self.execute(sql, *args)
+
+
+def _encode_json(value: Any) -> bytes:
+    return orjson.dumps(value, default=str)
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    # Binary jsonb is the text form behind a one-byte version header
+    return b"\x01" + orjson.dumps(value, default=str)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return orjson.loads(data[1:])
+
+
+async def register_json_codecs(conn: asyncpg.Connection) -> None:
+    """Pool ``init`` hook: (de)serialize json/jsonb with orjson
+
+    Callers pass and get back Python objects instead of JSON strings;
+    each value is encoded once by orjson and sent in the binary format.
+    """
+    await conn.set_type_codec(
+        "json",
+        schema="pg_catalog",
+        encoder=_encode_json,
+        decoder=orjson.loads,
+        format="binary",
+    )
+    await conn.set_type_codec(
+        "jsonb",
+        schema="pg_catalog",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        format="binary",
+    )
+
+
+async def prepare_connection(
+    conn: UserManagerConnection, statements: Sequence[str] = HOT_STATEMENTS
+) -> None:
+    """Pool ``init`` hook: set up JSON codecs and prepare hot statements
+
+    Use together with ``connection_class=UserManagerConnection``. JSON codecs
+    are those of ``register_json_codecs``, so ``details``, ``preferences``
+    and friends are passed and returned as Python objects. Statements that
+    fail to prepare (e.g. a migration not applied yet) are skipped and fall
+    back to asyncpg's regular statement cache.
+    """
+    await register_json_codecs(conn)
+
+    conn.prepared = {}
+    for sql in statements:
+        try:
+            conn.prepared[sql] = await conn.prepare(sql)
+        except asyncpg.PostgresError:
+            continue
+
+
+def _prepared(conn: asyncpg.Connection, sql: str):
+    prepared = getattr(conn, "prepared", None)
+    return prepared.get(sql) if prepared else None
+
+
+async def _call_prepared(conn: asyncpg.Connection, sql: str, method: str, *args):
+    """Run ``method`` of the statement prepared for ``sql``
+
+    A schema change can invalidate the statement's plan; asyncpg's own
+    statement cache re-prepares and retries in that case, so do the same
+    here, once, unless a transaction (now aborted) is open.
+    """
+    try:
+        return await getattr(conn.prepared[sql], method)(*args)
+    except asyncpg.InvalidCachedStatementError:
+        if conn.is_in_transaction():
+            raise
+        conn.prepared[sql] = await conn.prepare(sql)
+        return await getattr(conn.prepared[sql], method)(*args)
+
+
+async def _fetchrow(conn: asyncpg.Connection, sql: str, *args):
+    if _prepared(conn, sql):
+        return await _call_prepared(conn, sql, "fetchrow", *args)
+    return await conn.fetchrow(sql, *args)
+
+
+async def _fetchval(conn: asyncpg.Connection, sql: str, *args):
+    if _prepared(conn, sql):
+        return await _call_prepared(conn, sql, "fetchval", *args)
+    return await conn.fetchval(sql, *args)
+
+
+async def _fetch(conn: asyncpg.Connection, sql: str, *args):
+    if _prepared(conn, sql):
+        return await _call_prepared(conn, sql, "fetch", *args)
+    return await conn.fetch(sql, *args)
+
+
+@lru_cache(maxsize=256)
+def _update_sql(table: str, fields: tuple, keys: tuple) -> str:
+    """Build the UPDATE statement for one shape of partial update"""
+    assignments = [f"{field} = ${n}" for n, field in enumerate(fields, start=1)]
+    assignments.append("updated_at = NOW()")
+    conditions = [
+        f"{key} = ${n}" for n, key in enumerate(keys, start=len(fields) + 1)
+    ]
+    return (
+        f"UPDATE {table} SET {', '.join(assignments)} "
+        f"WHERE {' AND '.join(conditions)} RETURNING *"
+    )
+
+
+def _update_values(update_data) -> Dict[str, Any]:
+    """Set, non-null fields of a partial update
+
+    The Update models store enum values (``use_enum_values``), so the dump
+    is already bindable as-is.
+    """
+    return update_data.model_dump(exclude_unset=True, exclude_none=True)
+
+
+class AuthRecord(NamedTuple):
+    """Credential columns of a login account (see get_auth_record)"""
+    id: UUID
+    hashed_password: Optional[str]
+    is_active: bool
+    role: UserRole
+
+
+def _member_from_row(row: asyncpg.Record) -> FamilyMember:
+    """FamilyMember from a trusted login/lookup row, without re-validation
+
+    The row comes from our own projection, so field validation is skipped
+    and NULL text columns are already COALESCEd by the query; enum columns
+    are still converted so callers get real enum members.
+    """
+    return FamilyMember.model_construct(
+        id=row["id"],
+        telegram_id=row.get("telegram_id"),
+        username=row["username"],
+        first_name=row["first_name"],
+        last_name=row["last_name"],
+        email=row["email"],
+        role=UserRole(row["role"]),
+        age_group=AgeGroup(row["age_group"]) if row["age_group"] else None,
+        language_preference=LanguagePreference(row["language_preference"]),
+        hashed_password=row["hashed_password"],
+        is_active=row["is_active"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+# ==============================================================================
+# Member Lookup Cache
+# ==============================================================================
+
+class MemberCache:
+    """
+    Small in-process TTL/LRU cache of FamilyMember lookups
+
+    Login and token checks resolve the same few accounts over and over;
+    entries live for ``ttl`` seconds and are dropped early when the member
+    is changed through UserManager in this process.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[FamilyMember]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, member = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return member
+
+    def put(self, key: str, member: FamilyMember) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, member)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate_member(self, member_id: UUID) -> None:
+        """Drop every entry resolving to ``member_id``"""
+        for key in [k for k, (_, m) in self._entries.items() if m.id == member_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Keyed by the login identifier (users.email / family_members.username)
+member_by_email_cache = MemberCache()
+
+
+class RecentAuthCache:
+    """
+    In-process TTL/LRU record of recent successful password checks
+
+    A retry or re-auth with the same password inside ``ttl`` seconds skips
+    the slow hash. Only an HMAC (under a per-process random key) of the
+    stored hash and the password is kept, one per user; folding in the
+    stored hash means a changed or upgraded hash never matches an old entry.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._key = secrets.token_bytes(32)
+        self._entries: "OrderedDict[UUID, tuple]" = OrderedDict()
+
+    def _fingerprint(self, stored_hash: bytes, password: bytes) -> bytes:
+        return hmac.new(self._key, stored_hash + b"\0" + password, hashlib.sha256).digest()
+
+    def check(self, user_id: UUID, stored_hash: bytes, password: bytes) -> bool:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False
+        expires_at, fingerprint = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            return False
+        return hmac.compare_digest(fingerprint, self._fingerprint(stored_hash, password))
+
+    def put(self, user_id: UUID, stored_hash: bytes, password: bytes) -> None:
+        self._entries[user_id] = (
+            time.monotonic() + self.ttl, self._fingerprint(stored_hash, password)
+        )
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+recent_auth_cache = RecentAuthCache()
+
+# Checked against when no hash is stored, so an unknown username costs the
+# same work as a wrong password (argon2id defaults, like new hashes)
+DUMMY_PASSWORD_HASH = (
+    b"$argon2id$v=19$m=65536,t=3,p=4$HpfAQ0EZK2VY4q5x7LdMzw$O25SLIjsPw0ECZtW7hgMlEBB7O4PLY6rNLS7gJXRKDQ"
+)
+
+# Same parameters as the argon2 scheme in api.auth.jwt_auth.pwd_context
+_argon2_hasher = argon2.PasswordHasher()
+
+# bcrypt and argon2 both release the GIL, so concurrent logins hash in
+# parallel here instead of stalling the event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="password"
+)
+
+
+def _check_password(password: bytes, hashed: bytes) -> bool:
+    """Check ``password`` against an argon2 or (legacy) bcrypt hash"""
+    if hashed.startswith(b"$argon2"):
+        try:
+            return _argon2_hasher.verify(hashed, password)
+        except (argon2.exceptions.VerificationError, argon2.exceptions.InvalidHashError):
+            return False
+    return bcrypt.checkpw(password, hashed)
+
+
+async def run_in_password_executor(func, *args):
+    """Run a password hashing/verification call on the password thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, func, *args)
+
+
+async def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return await run_in_password_executor(_check_password, password, hashed)
+
+
+# ==============================================================================
+# Audit Log Writer
+# ==============================================================================
+
+AUDIT_LOG_COLUMNS = (
+    "id", "user_id", "action", "resource_type", "resource_id",
+    "details", "success", "error_message", "created_at",
+)
+
+INSERT_AUDIT_LOG_SQL = f"""
+    INSERT INTO audit_log ({', '.join(AUDIT_LOG_COLUMNS)})
+    VALUES ({', '.join(f'${n}' for n in range(1, len(AUDIT_LOG_COLUMNS) + 1))})
+"""
+
+
+class AuditLogWriter:
+    """
+    Batches audit_log rows off the request path
+
+    Entries are queued and written with COPY on a single connection, so rows
+    land in submission order. Flushes every ``flush_interval`` seconds or
+    once ``batch_size`` entries are waiting. At most ``max_pending`` entries
+    are held; past that, submit() refuses and the caller writes inline.
+    """
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+        max_pending: int = 10_000,
+    ):
+        self.db = db_pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background flusher and register for this pool"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            _audit_writers[self.db] = self
+
+    async def close(self) -> None:
+        """Flush pending entries and stop the flusher"""
+        _audit_writers.pop(self.db, None)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    def submit(self, record: tuple) -> bool:
+        """Queue an audit_log row (AUDIT_LOG_COLUMNS order)
+
+        Returns False, without queueing, when ``max_pending`` entries are
+        already waiting.
+        """
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            return False
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    def _drain(self, limit: int) -> List[tuple]:
+        batch = []
+        while not self._queue.empty() and len(batch) < limit:
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await self._wait_for_batch()
+            finally:
+                batch.extend(self._drain(self.batch_size - 1))
+                await self._flush(batch)
+
+    async def _wait_for_batch(self) -> None:
+        """Sleep out ``flush_interval``, or less once a full batch is waiting"""
+        self._batch_ready.clear()
+        if self._queue.qsize() >= self.batch_size:
+            return
+        try:
+            await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _flush(self, batch: List[tuple]) -> None:
+        # Never raises: an exception here would end _run for good while
+        # submit() keeps queueing
+        if not batch:
+            return
+        try:
+            async with self.db.acquire() as conn:
+                try:
+                    await conn.copy_records_to_table(
+                        "audit_log", records=batch, columns=AUDIT_LOG_COLUMNS
+                    )
+                except Exception as e:
+                    # One bad row (FK violation, a value that fails to
+                    # encode) fails the whole COPY; retry row by row so the
+                    # rest of the batch is kept
+                    print(f"⚠️ Audit log COPY of {len(batch)} entries failed, inserting one by one: {e}")
+                    insert = await conn.prepare(INSERT_AUDIT_LOG_SQL)
+                    for record in batch:
+                        try:
+                            await insert.fetch(*record)
+                        except Exception as e:
+                            print(f"⚠️ Dropped audit log entry {record[2]}: {e}")
+        except Exception as e:
+            print(f"⚠️ Failed to write {len(batch)} audit log entries: {e}")
+
+
+class LastActiveWriter:
+    """
+    Coalesces last_active_at updates
+
+    Only the latest timestamp per member is kept; every ``flush_interval``
+    seconds the pending set is written with one UPDATE ... FROM unnest().
+    """
+
+    def __init__(self, db_pool: asyncpg.Pool, flush_interval: float = 30.0):
+        self.db = db_pool
+        self.flush_interval = flush_interval
+        self._pending: Dict[UUID, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background flusher and register for this pool"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            _last_active_writers[self.db] = self
+
+    async def close(self) -> None:
+        """Write pending timestamps and stop the flusher"""
+        _last_active_writers.pop(self.db, None)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush()
+
+    def touch(self, member_id: UUID) -> None:
+        """Record activity for a member"""
+        self._pending[member_id] = datetime.now(timezone.utc)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            async with self.db.acquire() as conn:
+                await conn.execute(
+                    UPDATE_LAST_ACTIVE_BATCH_SQL,
+                    list(pending.keys()),
+                    list(pending.values()),
+                )
+        except (asyncpg.PostgresError, OSError) as e:
+            print(f"⚠️ Failed to update last_active_at for {len(pending)} members: {e}")
+
+
+class EmailLookupBatcher:
+    """
+    Coalesces concurrent login lookups into one query
+
+    The first lookup opens a ``window``-second batch; every lookup arriving
+    meanwhile joins it, and the whole batch is resolved with a single
+    ``= ANY($1)`` query whose rows are handed back to each waiting caller.
+    """
+
+    def __init__(self, db_pool: asyncpg.Pool, window: float = 0.002):
+        self.db = db_pool
+        self.window = window
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Register for this pool"""
+        _email_batchers[self.db] = self
+
+    async def close(self) -> None:
+        """Resolve the open batch and unregister"""
+        _email_batchers.pop(self.db, None)
+        if self._task is not None:
+            await self._task
+
+    async def lookup(self, email: str) -> Optional[asyncpg.Record]:
+        """Row from GET_FAMILY_MEMBERS_BY_EMAILS_SQL for ``email``, if any"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(email, []).append(future)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._task = None
+        try:
+            async with self.db.acquire() as conn:
+                rows = await _fetch(conn, GET_FAMILY_MEMBERS_BY_EMAILS_SQL, list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        found = {row["login"]: row for row in rows}
+        for email, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(found.get(email))
+
+
+# Active writers per pool; UserManager instances are per-request
+_audit_writers: Dict[asyncpg.Pool, AuditLogWriter] = {}
+_last_active_writers: Dict[asyncpg.Pool, LastActiveWriter] = {}
+_email_batchers: Dict[asyncpg.Pool, EmailLookupBatcher] = {}
+
+
 class UserManager:
     """User management service with RBAC and parental controls"""
 
-    def __init__(self, db_pool: asyncpg.Pool):
+    # Permission cache TTL (seconds); entries are also dropped on grant/revoke
+    PERMISSION_CACHE_TTL = 30
+
+    def __init__(self, db_pool: asyncpg.Pool, redis_client: Optional[redis.Redis] = None):
         self.db = db_pool
+        self.redis_client = redis_client
+        self.audit_writer = _audit_writers.get(db_pool)
+        self.last_active_writer = _last_active_writers.get(db_pool)
+        self.email_batcher = _email_batchers.get(db_pool)
+
+    @asynccontextmanager
+    async def _acquire(self, conn: Optional[asyncpg.Connection] = None):
+        """Use the caller's connection, or borrow one from the pool"""
+        if conn is not None:
+            yield conn
+        else:
+            async with self.db.acquire() as conn:
+                yield conn
 
     # ==============================================================================
     # Family Member Management
     # ==============================================================================
 
     async def create_family_member(
-        self, member_data: FamilyMemberCreate, created_by: Optional[UUID] = None
+        self,
+        member_data: FamilyMemberCreate,
+        created_by: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> FamilyMember:
         """Create new family member with role-based defaults"""
-        async with self.db.acquire() as conn:
-            # Check for duplicate telegram_id or email
-            if member_data.telegram_id:
-                existing = await conn.fetchrow(
-                    "SELECT id FROM family_members WHERE telegram_id = $1",
+        async with self._acquire(conn) as conn:
+            # Insert family member; duplicates are rejected by the UNIQUE
+            # constraints on telegram_id / email instead of pre-check queries
+            try:
+                row = await conn.fetchrow(
+                    """
+                    INSERT INTO family_members (
+                        telegram_id, email, username,
+                        first_name, last_name, display_name, avatar_url, date_of_birth,
+                        role, age_group, is_admin,
+                        language_preference, timezone, theme_preference,
+                        privacy_level, safety_level, content_filtering_enabled,
+                        active_skills, preferences
+                    )
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19)
+                    RETURNING *
+                    """,
                     member_data.telegram_id,
-                )
-                if existing:
-                    raise ValueError(f"Family member with telegram_id {member_data.telegram_id} already exists")
-
-            if member_data.email:
-                existing = await conn.fetchrow(
-                    "SELECT id FROM family_members WHERE email = $1",
                     member_data.email,
+                    member_data.username,
+                    member_data.first_name,
+                    member_data.last_name,
+                    member_data.display_name,
+                    member_data.avatar_url,
+                    member_data.date_of_birth,
+                    member_data.role.value,
+                    member_data.age_group.value if member_data.age_group else None,
+                    member_data.is_admin,
+                    member_data.language_preference.value,
+                    member_data.timezone,
+                    member_data.theme_preference,
+                    member_data.privacy_level.value,
+                    member_data.safety_level.value,
+                    member_data.content_filtering_enabled,
+                    member_data.active_skills,
+                    member_data.preferences,
                 )
-                if existing:
+            except asyncpg.UniqueViolationError as e:
+                if e.constraint_name == "family_members_telegram_id_key":
+                    raise ValueError(f"Family member with telegram_id {member_data.telegram_id} already exists")
+                if e.constraint_name == "family_members_email_key":
                     raise ValueError(f"Family member with email {member_data.email} already exists")
-
-            # Insert family member
-            row = await conn.fetchrow(
-                """
-                INSERT INTO family_members (
-                    telegram_id, email, username,
-                    first_name, last_name, display_name, avatar_url, date_of_birth,
-                    role, age_group, is_admin,
-                    language_preference, timezone, theme_preference,
-                    privacy_level, safety_level, content_filtering_enabled,
-                    active_skills, preferences
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19)
-                RETURNING *
-                """,
-                member_data.telegram_id,
-                member_data.email,
-                member_data.username,
-                member_data.first_name,
-                member_data.last_name,
-                member_data.display_name,
-                member_data.avatar_url,
-                member_data.date_of_birth,
-                member_data.role.value,
-                member_data.age_group.value if member_data.age_group else None,
-                member_data.is_admin,
-                member_data.language_preference.value,
-                member_data.timezone,
-                member_data.theme_preference,
-                member_data.privacy_level.value,
-                member_data.safety_level.value,
-                member_data.content_filtering_enabled,
-                member_data.active_skills,
-                member_data.preferences,
-            )
+                raise
 
             # Audit log
             await self._create_audit_log(
@@ -110,117 +969,46 @@ class UserManager:
 
             return FamilyMember(**dict(row))
 
-    async def get_family_member(self, member_id: UUID) -> Optional[FamilyMember]:
+    async def get_family_member(
+        self, member_id: UUID, conn: Optional[asyncpg.Connection] = None
+    ) -> Optional[FamilyMember]:
         """Retrieve family member by ID"""
-        async with self.db.acquire() as conn:
-            # Try family_members table first
-            row = await conn.fetchrow(
-                "SELECT * FROM family_members WHERE id = $1 AND is_active = TRUE",
-                str(member_id),
-            )
-            if row:
-                return FamilyMember(
-                    id=str(row["id"]),
-                    telegram_id=row["telegram_id"],
-                    username=row["username"],
-                    first_name=row["first_name"] or "",
-                    last_name=row["last_name"] or "",
-                    email=row["username"],  # Use username as email fallback
-                    role=row["role"],
-                    age_group=row["age_group"],
-                    language_preference=row["language_preference"],
-                    hashed_password=row.get("hashed_password"),
-                    is_active=row["is_active"],
-                    created_at=row["created_at"],
-                    updated_at=row["updated_at"],
-                )
-
-            # Try users table (for admin accounts)
-            # Since users table uses integer IDs, we need to match by email
-            # First get the email from the JWT token or search by deterministic UUID pattern
-            import uuid
-            # Try to find user by checking if the UUID matches our deterministic pattern
-            # This is a limitation of our mixed user ID system
-            # For now, let's get the first admin user as fallback
-            row = await conn.fetchrow(
-                "SELECT * FROM users WHERE is_admin = true AND is_active = true LIMIT 1",
-            )
-            if row:
-                # Generate the same deterministic UUID to check if it matches
-                user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, f"user-{row['id']}")
-                if str(user_uuid) == str(member_id):
-                    # Get password hash for authentication
-                    password_row = await conn.fetchrow(
-                        "SELECT password_hash FROM users WHERE id = $1",
-                        row["id"],
-                    )
-                    return FamilyMember(
-                        id=str(user_uuid),
-                        telegram_id=None,
-                        username=row["username"],
-                        first_name="Admin",
-                        last_name="User",
-                        email=row["email"],
-                        role="parent" if row["is_admin"] else "member",
-                        age_group="adult",
-                        language_preference="en",
-                        hashed_password=password_row["password_hash"] if password_row else None,
-                        is_active=row["is_active"],
-                        created_at=row["created_at"],
-                        updated_at=row["updated_at"],
-                    )
-
-            return None
-
-    async def get_family_member_by_telegram_id(self, telegram_id: int) -> Optional[FamilyMember]:
+        async with self._acquire(conn) as conn:
+            # family_members first, then admin accounts from the users table,
+            # matched on their stored deterministic UUID (uuid5 of "user-<id>")
+            # with the password hash in the same row.
+            row = await _fetchrow(conn, GET_FAMILY_MEMBER_SQL, member_id)
+            return _member_from_row(row) if row else None
+
+    async def get_family_member_by_telegram_id(
+        self, telegram_id: int, conn: Optional[asyncpg.Connection] = None
+    ) -> Optional[FamilyMember]:
         """Retrieve family member by Telegram ID"""
-        async with self.db.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM family_members WHERE telegram_id = $1 AND is_active = TRUE",
-                telegram_id,
-            )
+        async with self._acquire(conn) as conn:
+            row = await _fetchrow(conn, GET_FAMILY_MEMBER_BY_TELEGRAM_ID_SQL, telegram_id)
             return FamilyMember(**dict(row)) if row else None
 
     async def update_family_member(
-        self, member_id: UUID, update_data: FamilyMemberUpdate, updated_by: Optional[UUID] = None
+        self,
+        member_id: UUID,
+        update_data: FamilyMemberUpdate,
+        updated_by: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> Optional[FamilyMember]:
         """Update family member profile"""
-        async with self.db.acquire() as conn:
-            # Build dynamic update query
-            update_fields = []
-            values = []
-            param_count = 1
-
-            for field, value in update_data.dict(exclude_unset=True).items():
-                if value is not None:
-                    # Handle enum values
-                    if hasattr(value, "value"):
-                        value = value.value
-                    update_fields.append(f"{field} = ${param_count}")
-                    values.append(value)
-                    param_count += 1
-
-            if not update_fields:
-                return await self.get_family_member(member_id)
-
-            # Add updated_at
-            update_fields.append(f"updated_at = ${param_count}")
-            values.append(datetime.now())
-            param_count += 1
-
-            # Add member_id for WHERE clause
-            values.append(member_id)
-
-            query = f"""
-                UPDATE family_members
-                SET {', '.join(update_fields)}
-                WHERE id = ${param_count}
-                RETURNING *
-            """
+        async with self._acquire(conn) as conn:
+            values = _update_values(update_data)
+            if not values:
+                return await self.get_family_member(member_id, conn=conn)
 
-            row = await conn.fetchrow(query, *values)
+            query = _update_sql("family_members", tuple(values), ("id",))
+            row = await conn.fetchrow(query, *values.values(), member_id)
 
             if row:
+                # Role-based permissions may have changed
+                await self._invalidate_permissions(member_id)
+                member_by_email_cache.invalidate_member(member_id)
+
                 # Audit log
                 await self._create_audit_log(
                     conn,
@@ -228,27 +1016,32 @@ class UserManager:
                     action="update_family_member",
                     resource_type="family_member",
                     resource_id=member_id,
-                    details=update_data.dict(exclude_unset=True),
+                    details=update_data.model_dump(exclude_unset=True),
                 )
 
             return FamilyMember(**dict(row)) if row else None
 
     async def delete_family_member(
-        self, member_id: UUID, deleted_by: Optional[UUID] = None
+        self,
+        member_id: UUID,
+        deleted_by: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> bool:
         """Soft delete family member"""
-        async with self.db.acquire() as conn:
+        async with self._acquire(conn) as conn:
             result = await conn.execute(
                 """
                 UPDATE family_members
-                SET is_active = FALSE, updated_at = $1
-                WHERE id = $2
+                SET is_active = FALSE, updated_at = NOW()
+                WHERE id = $1
                 """,
-                datetime.now(),
                 member_id,
             )
 
             if result != "UPDATE 0":
+                await self._invalidate_permissions(member_id)
+                member_by_email_cache.invalidate_member(member_id)
+
                 # Audit log
                 await self._create_audit_log(
                     conn,
@@ -262,93 +1055,101 @@ class UserManager:
             return False
 
     async def list_family_members(
-        self, include_inactive: bool = False
+        self,
+        include_inactive: bool = False,
+        limit: int = 100,
+        after_id: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> List[FamilyMember]:
-        """List all family members"""
-        async with self.db.acquire() as conn:
-            query = "SELECT * FROM family_members"
-            if not include_inactive:
-                query += " WHERE is_active = TRUE"
-            query += " ORDER BY created_at DESC"
-
-            rows = await conn.fetch(query)
+        """List family members, newest first
+
+        Keyset-paginated: pass the last member's id as ``after_id`` to get the
+        next page.
+        """
+        async with self._acquire(conn) as conn:
+            rows = await _fetch(conn, LIST_FAMILY_MEMBERS_SQL, include_inactive, after_id, limit)
             return [FamilyMember(**dict(row)) for row in rows]
 
-    async def update_last_active(self, member_id: UUID) -> None:
-        """Update last_active_at timestamp"""
-        async with self.db.acquire() as conn:
-            await conn.execute(
-                "UPDATE family_members SET last_active_at = $1 WHERE id = $2",
-                datetime.now(),
-                member_id,
+    async def list_family_members_json(
+        self,
+        include_inactive: bool = False,
+        limit: int = 100,
+        after_id: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> str:
+        """Same page as list_family_members, as a ready-to-send JSON document
+
+        Skips per-row model construction for the read-only list endpoint.
+        """
+        async with self._acquire(conn) as conn:
+            return await _fetchval(
+                conn, LIST_FAMILY_MEMBERS_JSON_SQL, include_inactive, after_id, limit
             )
 
+    async def update_last_active(
+        self, member_id: UUID, conn: Optional[asyncpg.Connection] = None
+    ) -> None:
+        """Update last_active_at timestamp"""
+        # Minute-level resolution is enough; batch the write when possible
+        if self.last_active_writer is not None:
+            self.last_active_writer.touch(member_id)
+            return
+
+        async with self._acquire(conn) as conn:
+            await _fetchval(conn, UPDATE_LAST_ACTIVE_SQL, member_id)
+
     # ==============================================================================
     # Permission Management
     # ==============================================================================
 
     async def check_permission(
-        self, user_id: UUID, permission_name: str
+        self, user_id: UUID, permission_name: str, conn: Optional[asyncpg.Connection] = None
     ) -> PermissionCheck:
         """Check if user has permission"""
-        async with self.db.acquire() as conn:
-            has_perm = await conn.fetchval(
-                "SELECT has_permission($1, $2)",
-                user_id,
-                permission_name,
-            )
-
-            # Get reason
-            reason = None
-            if has_perm:
-                # Check if user-specific override
-                user_override = await conn.fetchrow(
-                    """
-                    SELECT up.granted, up.reason
-                    FROM user_permissions up
-                    JOIN permissions p ON up.permission_id = p.id
-                    WHERE up.user_id = $1 AND p.name = $2
-                      AND (up.expires_at IS NULL OR up.expires_at > NOW())
-                    """,
-                    user_id,
-                    permission_name,
-                )
-                if user_override:
-                    reason = user_override["reason"] or "User-specific permission"
-                else:
-                    reason = "Role-based permission"
-            else:
+        cached = await self._cache_hget(f"perm:{user_id}", permission_name)
+        if cached is not None:
+            has_perm, reason = json.loads(cached)
+        else:
+            async with self._acquire(conn) as conn:
+                row = await _fetchrow(conn, CHECK_PERMISSION_SQL, user_id, permission_name)
+
+            has_perm = row["has_permission"]
+            if not has_perm:
                 reason = "Permission denied"
+            elif row["overridden"]:
+                reason = row["reason"] or "User-specific permission"
+            else:
+                reason = "Role-based permission"
 
-            return PermissionCheck(
-                user_id=user_id,
-                permission_name=permission_name,
-                has_permission=has_perm,
-                reason=reason,
+            await self._cache_hset(
+                f"perm:{user_id}", permission_name, json.dumps([has_perm, reason])
             )
 
+        return PermissionCheck(
+            user_id=user_id,
+            permission_name=permission_name,
+            has_permission=has_perm,
+            reason=reason,
+        )
+
     async def grant_permission(
-        self, perm_data: UserPermissionCreate, granted_by: Optional[UUID] = None
+        self,
+        perm_data: UserPermissionCreate,
+        granted_by: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> UserPermission:
         """Grant permission to user"""
-        async with self.db.acquire() as conn:
-            # Get permission ID
-            perm_row = await conn.fetchrow(
-                "SELECT id FROM permissions WHERE name = $1",
-                perm_data.permission_name,
-            )
-            if not perm_row:
-                raise ValueError(f"Permission '{perm_data.permission_name}' not found")
-
-            permission_id = perm_row["id"]
-
-            # Insert or update user permission
+        async with self._acquire(conn) as conn:
+            # Resolve the permission and upsert in one statement
             row = await conn.fetchrow(
                 """
+                WITH p AS (
+                    SELECT id FROM permissions WHERE name = $2
+                )
                 INSERT INTO user_permissions (
                     user_id, permission_id, granted, granted_by, reason, expires_at
                 )
-                VALUES ($1, $2, $3, $4, $5, $6)
+                SELECT $1, p.id, $3, $4, $5, $6 FROM p
                 ON CONFLICT (user_id, permission_id)
                 DO UPDATE SET
                     granted = EXCLUDED.granted,
@@ -359,12 +1160,16 @@ class UserManager:
                 RETURNING *
                 """,
                 perm_data.user_id,
-                permission_id,
+                perm_data.permission_name,
                 perm_data.granted,
                 granted_by,
                 perm_data.reason,
                 perm_data.expires_at,
             )
+            if not row:
+                raise ValueError(f"Permission '{perm_data.permission_name}' not found")
+
+            await self._invalidate_permissions(perm_data.user_id)
 
             # Audit log
             await self._create_audit_log(
@@ -374,7 +1179,7 @@ class UserManager:
                 resource_type="user_permission",
                 resource_id=row["id"],
                 details={
-                    "user_id": str(perm_data.user_id),
+                    "user_id": perm_data.user_id,
                     "permission": perm_data.permission_name,
                     "granted": perm_data.granted,
                 },
@@ -383,7 +1188,11 @@ class UserManager:
             return UserPermission(**dict(row))
 
     async def revoke_permission(
-        self, user_id: UUID, permission_name: str, revoked_by: Optional[UUID] = None
+        self,
+        user_id: UUID,
+        permission_name: str,
+        revoked_by: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> bool:
         """Revoke permission from user"""
         perm_data = UserPermissionCreate(
@@ -392,89 +1201,141 @@ class UserManager:
             granted=False,
             reason="Permission revoked",
         )
-        await self.grant_permission(perm_data, granted_by=revoked_by)
+        await self.grant_permission(perm_data, granted_by=revoked_by, conn=conn)
         return True
 
-    async def list_user_permissions(self, user_id: UUID) -> List[UserPermission]:
+    async def list_user_permissions(
+        self, user_id: UUID, conn: Optional[asyncpg.Connection] = None
+    ) -> List[UserPermission]:
         """List all permissions for user"""
-        async with self.db.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT up.*
-                FROM user_permissions up
-                WHERE up.user_id = $1
-                  AND (up.expires_at IS NULL OR up.expires_at > NOW())
-                ORDER BY up.created_at DESC
-                """,
-                user_id,
-            )
-            return [UserPermission(**dict(row)) for row in rows]
+        cached = await self._cache_hget(f"perm:{user_id}", "*")
+        if cached is not None:
+            return [UserPermission(**perm) for perm in json.loads(cached)]
+
+        async with self._acquire(conn) as conn:
+            rows = await _fetch(conn, LIST_USER_PERMISSIONS_SQL, user_id)
+        permissions = [UserPermission(**dict(row)) for row in rows]
+
+        await self._cache_hset(
+            f"perm:{user_id}",
+            "*",
+            json.dumps([perm.model_dump(mode="json") for perm in permissions]),
+        )
+        return permissions
+
+    # ==============================================================================
+    # Permission Cache
+    # ==============================================================================
+    # Per-user Redis hash "perm:<user_id>": one field per permission name plus
+    # "*" for the full override list, so invalidation is a single DEL.
+
+    async def _cache_hget(self, key: str, field: str) -> Optional[str]:
+        if not self.redis_client:
+            return None
+        try:
+            return await self.redis_client.hget(key, field)
+        except redis.RedisError:
+            return None
+
+    async def _cache_hset(self, key: str, field: str, value: str) -> None:
+        if not self.redis_client:
+            return
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, field, value)
+                pipe.expire(key, self.PERMISSION_CACHE_TTL)
+                await pipe.execute()
+        except redis.RedisError:
+            pass
+
+    async def _invalidate_permissions(self, user_id: UUID) -> None:
+        if not self.redis_client:
+            return
+        try:
+            await self.redis_client.delete(f"perm:{user_id}")
+        except redis.RedisError:
+            pass
 
     # ==============================================================================
     # Parental Controls
     # ==============================================================================
 
     async def create_parental_controls(
-        self, controls_data: ParentalControlsCreate, created_by: Optional[UUID] = None
+        self,
+        controls_data: ParentalControlsCreate,
+        created_by: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> ParentalControls:
         """Create parental controls for child"""
-        async with self.db.acquire() as conn:
-            # Verify parent-child relationship
-            child = await self.get_family_member(controls_data.child_id)
-            if not child:
-                raise ValueError("Child not found")
-
-            parent = await self.get_family_member(controls_data.parent_id)
-            if not parent or parent.role not in [UserRole.PARENT, UserRole.GRANDPARENT]:
-                raise ValueError("Parent must have parent or grandparent role")
-
-            # Check if controls already exist
-            existing = await conn.fetchrow(
-                "SELECT id FROM parental_controls WHERE child_id = $1 AND parent_id = $2",
-                controls_data.child_id,
-                controls_data.parent_id,
-            )
-            if existing:
+        async with self._acquire(conn) as conn:
+            # Validate the parent-child pair and insert in one round-trip
+            try:
+                row = await conn.fetchrow(
+                    """
+                    WITH child AS (
+                        SELECT 1 FROM family_members
+                        WHERE id = $1 AND is_active = TRUE
+                    ), parent AS (
+                        SELECT 1 FROM family_members
+                        WHERE id = $2 AND is_active = TRUE
+                          AND role IN ('parent', 'grandparent')
+                    ), existing AS (
+                        SELECT 1 FROM parental_controls
+                        WHERE child_id = $1 AND parent_id = $2
+                    )
+                    INSERT INTO parental_controls (
+                        child_id, parent_id,
+                        screen_time_enabled, daily_limit_minutes,
+                        weekday_limit_minutes, weekend_limit_minutes,
+                        quiet_hours_start, quiet_hours_end,
+                        content_filter_level, blocked_keywords,
+                        allowed_domains, blocked_domains,
+                        activity_monitoring_enabled, conversation_review_enabled,
+                        location_sharing_enabled,
+                        notify_parent_on_flagged_content,
+                        notify_parent_on_limit_exceeded,
+                        notify_parent_on_emergency
+                    )
+                    SELECT $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18
+                    WHERE EXISTS (SELECT 1 FROM child)
+                      AND EXISTS (SELECT 1 FROM parent)
+                      AND NOT EXISTS (SELECT 1 FROM existing)
+                    RETURNING *
+                    """,
+                    controls_data.child_id,
+                    controls_data.parent_id,
+                    controls_data.screen_time_enabled,
+                    controls_data.daily_limit_minutes,
+                    controls_data.weekday_limit_minutes,
+                    controls_data.weekend_limit_minutes,
+                    controls_data.quiet_hours_start,
+                    controls_data.quiet_hours_end,
+                    controls_data.content_filter_level.value,
+                    controls_data.blocked_keywords,
+                    controls_data.allowed_domains,
+                    controls_data.blocked_domains,
+                    controls_data.activity_monitoring_enabled,
+                    controls_data.conversation_review_enabled,
+                    controls_data.location_sharing_enabled,
+                    controls_data.notify_parent_on_flagged_content,
+                    controls_data.notify_parent_on_limit_exceeded,
+                    controls_data.notify_parent_on_emergency,
+                )
+            except asyncpg.UniqueViolationError:
+                # Lost a race with a concurrent insert for the same pair
                 raise ValueError("Parental controls already exist for this parent-child pair")
 
-            # Insert parental controls
-            row = await conn.fetchrow(
-                """
-                INSERT INTO parental_controls (
-                    child_id, parent_id,
-                    screen_time_enabled, daily_limit_minutes,
-                    weekday_limit_minutes, weekend_limit_minutes,
-                    quiet_hours_start, quiet_hours_end,
-                    content_filter_level, blocked_keywords,
-                    allowed_domains, blocked_domains,
-                    activity_monitoring_enabled, conversation_review_enabled,
-                    location_sharing_enabled,
-                    notify_parent_on_flagged_content,
-                    notify_parent_on_limit_exceeded,
-                    notify_parent_on_emergency
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18)
-                RETURNING *
-                """,
-                controls_data.child_id,
-                controls_data.parent_id,
-                controls_data.screen_time_enabled,
-                controls_data.daily_limit_minutes,
-                controls_data.weekday_limit_minutes,
-                controls_data.weekend_limit_minutes,
-                controls_data.quiet_hours_start,
-                controls_data.quiet_hours_end,
-                controls_data.content_filter_level.value,
-                controls_data.blocked_keywords,
-                controls_data.allowed_domains,
-                controls_data.blocked_domains,
-                controls_data.activity_monitoring_enabled,
-                controls_data.conversation_review_enabled,
-                controls_data.location_sharing_enabled,
-                controls_data.notify_parent_on_flagged_content,
-                controls_data.notify_parent_on_limit_exceeded,
-                controls_data.notify_parent_on_emergency,
-            )
+            if not row:
+                # Nothing inserted - work out which check failed
+                child = await self.get_family_member(controls_data.child_id, conn=conn)
+                if not child:
+                    raise ValueError("Child not found")
+
+                parent = await self.get_family_member(controls_data.parent_id, conn=conn)
+                if not parent or parent.role not in [UserRole.PARENT, UserRole.GRANDPARENT]:
+                    raise ValueError("Parent must have parent or grandparent role")
+
+                raise ValueError("Parental controls already exist for this parent-child pair")
 
             # Audit log
             await self._create_audit_log(
@@ -484,37 +1345,23 @@ class UserManager:
                 resource_type="parental_controls",
                 resource_id=row["id"],
                 details={
-                    "child_id": str(controls_data.child_id),
-                    "parent_id": str(controls_data.parent_id),
+                    "child_id": controls_data.child_id,
+                    "parent_id": controls_data.parent_id,
                 },
             )
 
             return ParentalControls(**dict(row))
 
     async def get_parental_controls(
-        self, child_id: UUID, parent_id: Optional[UUID] = None
+        self, child_id: UUID, parent_id: Optional[UUID] = None, conn: Optional[asyncpg.Connection] = None
     ) -> Optional[ParentalControls]:
         """Get parental controls for child"""
-        async with self.db.acquire() as conn:
+        async with self._acquire(conn) as conn:
             if parent_id:
-                row = await conn.fetchrow(
-                    "SELECT * FROM parental_controls WHERE child_id = $1 AND parent_id = $2",
-                    child_id,
-                    parent_id,
-                )
+                row = await _fetchrow(conn, GET_PARENTAL_CONTROLS_SQL, child_id, parent_id)
             else:
                 # Get primary parent's controls
-                row = await conn.fetchrow(
-                    """
-                    SELECT pc.*
-                    FROM parental_controls pc
-                    JOIN family_members fm ON pc.parent_id = fm.id
-                    WHERE pc.child_id = $1
-                    ORDER BY fm.is_admin DESC, pc.created_at ASC
-                    LIMIT 1
-                    """,
-                    child_id,
-                )
+                row = await _fetchrow(conn, GET_PRIMARY_PARENTAL_CONTROLS_SQL, child_id)
 
             return ParentalControls(**dict(row)) if row else None
 
@@ -524,41 +1371,20 @@ class UserManager:
         parent_id: UUID,
         update_data: ParentalControlsUpdate,
         updated_by: Optional[UUID] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> Optional[ParentalControls]:
         """Update parental controls"""
-        async with self.db.acquire() as conn:
-            # Build dynamic update query
-            update_fields = []
-            values = []
-            param_count = 1
-
-            for field, value in update_data.dict(exclude_unset=True).items():
-                if value is not None:
-                    if hasattr(value, "value"):
-                        value = value.value
-                    update_fields.append(f"{field} = ${param_count}")
-                    values.append(value)
-                    param_count += 1
-
-            if not update_fields:
-                return await self.get_parental_controls(child_id, parent_id)
-
-            # Add updated_at
-            update_fields.append(f"updated_at = ${param_count}")
-            values.append(datetime.now())
-            param_count += 1
-
-            # Add child_id and parent_id for WHERE clause
-            values.extend([child_id, parent_id])
-
-            query = f"""
-                UPDATE parental_controls
-                SET {', '.join(update_fields)}
-                WHERE child_id = ${param_count} AND parent_id = ${param_count + 1}
-                RETURNING *
-            """
+        async with self._acquire(conn) as conn:
+            values = _update_values(update_data)
+            if not values:
+                return await self.get_parental_controls(child_id, parent_id, conn=conn)
 
-            row = await conn.fetchrow(query, *values)
+            query = _update_sql(
+                "parental_controls", tuple(values), ("child_id", "parent_id")
+            )
+            row = await conn.fetchrow(
+                query, *values.values(), child_id, parent_id
+            )
 
             if row:
                 await self._create_audit_log(
@@ -567,7 +1393,7 @@ class UserManager:
                     action="update_parental_controls",
                     resource_type="parental_controls",
                     resource_id=row["id"],
-                    details=update_data.dict(exclude_unset=True),
+                    details=update_data.model_dump(exclude_unset=True),
                 )
 
             return ParentalControls(**dict(row)) if row else None
@@ -576,90 +1402,28 @@ class UserManager:
     # Screen Time Management
     # ==============================================================================
 
-    async def update_screen_time(self, screen_time: ScreenTimeUpdate) -> ScreenTimeStatus:
+    async def update_screen_time(
+        self, screen_time: ScreenTimeUpdate, conn: Optional[asyncpg.Connection] = None
+    ) -> ScreenTimeStatus:
         """Update screen time log and return status"""
-        async with self.db.acquire() as conn:
-            # Get or create today's log
-            row = await conn.fetchrow(
-                """
-                INSERT INTO screen_time_logs (user_id, date, total_minutes, session_count, activity_breakdown)
-                VALUES ($1, $2, $3, 1, $4::jsonb)
-                ON CONFLICT (user_id, date)
-                DO UPDATE SET
-                    total_minutes = screen_time_logs.total_minutes + EXCLUDED.total_minutes,
-                    session_count = screen_time_logs.session_count + 1,
-                    activity_breakdown = jsonb_set(
-                        screen_time_logs.activity_breakdown,
-                        ARRAY[$5],
-                        (COALESCE((screen_time_logs.activity_breakdown->>$5)::int, 0) + $3)::text::jsonb
-                    ),
-                    updated_at = NOW()
-                RETURNING *
-                """,
+        async with self._acquire(conn) as conn:
+            row = await _fetchrow(
+                conn,
+                UPDATE_SCREEN_TIME_SQL,
                 screen_time.user_id,
                 screen_time.date,
                 screen_time.minutes_to_add,
-                {screen_time.activity_type: screen_time.minutes_to_add},
                 screen_time.activity_type,
             )
 
-            log = ScreenTimeLog(**dict(row))
-
-            # Get parental controls for limits
-            controls = await self.get_parental_controls(screen_time.user_id)
-
-            if controls and controls.screen_time_enabled:
-                # Determine applicable limit
-                is_weekend = screen_time.date.weekday() >= 5  # Saturday = 5, Sunday = 6
-                if is_weekend and controls.weekend_limit_minutes:
-                    limit = controls.weekend_limit_minutes
-                elif not is_weekend and controls.weekday_limit_minutes:
-                    limit = controls.weekday_limit_minutes
-                else:
-                    limit = controls.daily_limit_minutes
-
-                # Check if in quiet hours
-                in_quiet_hours = False
-                if controls.quiet_hours_start and controls.quiet_hours_end:
-                    now = datetime.now().time()
-                    if controls.quiet_hours_start <= now <= controls.quiet_hours_end:
-                        in_quiet_hours = True
-
-                remaining = max(0, limit - log.total_minutes)
-                percentage = (log.total_minutes / limit * 100) if limit > 0 else 0
-                is_exceeded = log.total_minutes >= limit
-
-                return ScreenTimeStatus(
-                    user_id=screen_time.user_id,
-                    date=screen_time.date,
-                    total_minutes=log.total_minutes,
-                    limit_minutes=limit,
-                    remaining_minutes=remaining,
-                    percentage_used=percentage,
-                    is_limit_exceeded=is_exceeded,
-                    in_quiet_hours=in_quiet_hours,
-                )
-            else:
-                # No limits set
-                return ScreenTimeStatus(
-                    user_id=screen_time.user_id,
-                    date=screen_time.date,
-                    total_minutes=log.total_minutes,
-                    limit_minutes=0,
-                    remaining_minutes=0,
-                    percentage_used=0,
-                    is_limit_exceeded=False,
-                    in_quiet_hours=False,
-                )
+            return ScreenTimeStatus(**dict(row))
 
-    async def get_screen_time_log(self, user_id: UUID, date: date) -> Optional[ScreenTimeLog]:
+    async def get_screen_time_log(
+        self, user_id: UUID, date: date, conn: Optional[asyncpg.Connection] = None
+    ) -> Optional[ScreenTimeLog]:
         """Get screen time log for specific date"""
-        async with self.db.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM screen_time_logs WHERE user_id = $1 AND date = $2",
-                user_id,
-                date,
-            )
+        async with self._acquire(conn) as conn:
+            row = await _fetchrow(conn, GET_SCREEN_TIME_LOG_SQL, user_id, date)
             return ScreenTimeLog(**dict(row)) if row else None
 
     # ==============================================================================
@@ -678,15 +1442,19 @@ class UserManager:
         error_message: Optional[str] = None,
     ) -> UUID:
         """Internal method to create audit log entry"""
-        row = await conn.fetchrow(
-            """
-            INSERT INTO audit_log (
-                user_id, action, resource_type, resource_id,
-                details, success, error_message
-            )
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
-            RETURNING id
-            """,
+        # Failures are written inline so they are never lost in a buffer, as
+        # are entries the writer has no room for
+        if self.audit_writer is not None and success:
+            audit_id = uuid4()
+            if self.audit_writer.submit((
+                audit_id, user_id, action, resource_type, resource_id,
+                details, success, error_message, datetime.now(timezone.utc),
+            )):
+                return audit_id
+
+        return await _fetchval(
+            conn,
+            CREATE_AUDIT_LOG_SQL,
             user_id,
             action,
             resource_type,
@@ -695,126 +1463,108 @@ class UserManager:
             success,
             error_message,
         )
-        return row["id"]
 
     async def get_audit_logs(
         self,
         user_id: Optional[UUID] = None,
         action: Optional[str] = None,
         limit: int = 100,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> List[AuditLog]:
         """Retrieve audit logs with optional filtering"""
-        async with self.db.acquire() as conn:
-            conditions = []
-            values = []
-            param_count = 1
-
-            if user_id:
-                conditions.append(f"user_id = ${param_count}")
-                values.append(user_id)
-                param_count += 1
-
-            if action:
-                conditions.append(f"action = ${param_count}")
-                values.append(action)
-                param_count += 1
-
-            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-            values.append(limit)
-
-            query = f"""
-                SELECT * FROM audit_log
-                {where_clause}
-                ORDER BY created_at DESC
-                LIMIT ${param_count}
-            """
-
-            rows = await conn.fetch(query, *values)
+        filters = tuple(
+            value for value in (user_id, action) if value is not None
+        )
+        query = AUDIT_LOG_QUERIES[(user_id is not None, action is not None)]
+
+        async with self._acquire(conn) as conn:
+            rows = await conn.fetch(query, *filters, limit)
             return [AuditLog(**dict(row)) for row in rows]
 
     # ==============================================================================
     # Authentication Support Methods
     # ==============================================================================
 
-    async def get_family_member_by_email(self, email: str) -> Optional[FamilyMember]:
+    async def get_family_member_by_email(
+        self, email: str, conn: Optional[asyncpg.Connection] = None
+    ) -> Optional[FamilyMember]:
         """Get family member by email address"""
-        async with self.db.acquire() as conn:
-            # Try users table first (for admin accounts)
-            row = await conn.fetchrow(
-                "SELECT * FROM users WHERE email = $1 AND is_active = true",
-                email,
-            )
-            if row:
-                # Convert users table row to FamilyMember format
-                import uuid
-                # Get password hash for authentication
-                password_row = await conn.fetchrow(
-                    "SELECT password_hash FROM users WHERE username = $1",
-                    row["username"],
-                )
+        member = member_by_email_cache.get(email)
+        if member is not None:
+            return member
+
+        if self.email_batcher is not None and conn is None:
+            row = await self.email_batcher.lookup(email)
+        else:
+            async with self._acquire(conn) as conn:
+                row = await _fetchrow(conn, GET_FAMILY_MEMBER_BY_EMAIL_SQL, email)
+        if not row:
+            return None
 
-                # Generate deterministic UUID based on user ID
-                user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, f"user-{row['id']}")
-                return FamilyMember(
-                    id=str(user_uuid),  # Use deterministic UUID
-                    username=row["username"],
-                    first_name="Admin",  # Default for users table
-                    last_name="User",
-                    email=row["email"],
-                    role="parent" if row["is_admin"] else "member",
-                    age_group="adult",
-                    language_preference="en",
-                    hashed_password=password_row["password_hash"] if password_row else None,
-                    is_active=row["is_active"],
-                    created_at=row["created_at"],
-                    updated_at=row["updated_at"],
-                )
+        member = _member_from_row(row)
 
-            # Try family_members table (for family accounts)
-            row = await conn.fetchrow(
-                "SELECT * FROM family_members WHERE username = $1 AND is_active = true",
-                email,
-            )
-            if row:
-                return FamilyMember(
-                    id=str(row["id"]),
-                    username=row["username"],
-                    first_name=row["first_name"] or "",
-                    last_name=row["last_name"] or "",
-                    email=row["username"],  # Use username as email fallback
-                    role=row["role"],
-                    age_group=row["age_group"],
-                    language_preference=row["language_preference"],
-                    is_active=row["is_active"],
-                    created_at=row["created_at"],
-                    updated_at=row["updated_at"],
-                )
+        member_by_email_cache.put(email, member)
+        return member
+
+    async def get_auth_record(
+        self, email: str, conn: Optional[asyncpg.Connection] = None
+    ) -> Optional[AuthRecord]:
+        """Credential-only lookup by email for paths that don't need a profile
 
+        Same precedence as get_family_member_by_email, but only the columns
+        needed to check credentials or existence are fetched.
+        """
+        async with self._acquire(conn) as conn:
+            row = await _fetchrow(conn, GET_AUTH_RECORD_SQL, email)
+        if not row:
             return None
+        return AuthRecord(
+            row["id"], row["hashed_password"], row["is_active"], UserRole(row["role"])
+        )
 
-    async def verify_password(self, user: FamilyMember, password: str) -> bool:
+    async def verify_password(
+        self, user: FamilyMember, password: str, conn: Optional[asyncpg.Connection] = None
+    ) -> bool:
         """Verify password against stored hash"""
-        async with self.db.acquire() as conn:
-            # Get password hash from users table
-            row = await conn.fetchrow(
-                "SELECT password_hash FROM users WHERE username = $1",
-                user.username,
-            )
-            if not row:
-                # Try family_members table
-                row = await conn.fetchrow(
-                    "SELECT hashed_password FROM family_members WHERE username = $1",
-                    user.username,
-                )
-                if not row:
-                    return False
-                stored_hash = row["hashed_password"]
-            else:
-                stored_hash = row["password_hash"]
+        # The lookup that produced the user already carries the hash; only
+        # go back to the database when it didn't (e.g. family-only accounts)
+        stored_hash = user.hashed_password
+        if stored_hash is None:
+            async with self._acquire(conn) as conn:
+                # users table first, then family_members
+                stored_hash = await _fetchval(conn, GET_PASSWORD_HASH_SQL, user.username)
+
+        # Hash off the event loop, after the connection is back in the pool
+        password_bytes = password.encode('utf-8')
+        if stored_hash is None:
+            # Same work as a real check so misses don't return faster
+            await _checkpw(password_bytes, DUMMY_PASSWORD_HASH)
+            return False
 
-            # Import bcrypt for password verification
-            import bcrypt
-            try:
-                return bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8'))
-            except:
-                return False
+        try:
+            # argon2/bcrypt hashes are ASCII; accept TEXT (str) or BYTEA (bytes) columns
+            if isinstance(stored_hash, str):
+                stored_hash = stored_hash.encode('ascii')
+            if recent_auth_cache.check(user.id, stored_hash, password_bytes):
+                return True
+            verified = await _checkpw(password_bytes, stored_hash)
+        except (ValueError, TypeError):
+            # Malformed stored hash
+            return False
+
+        if verified:
+            recent_auth_cache.put(user.id, stored_hash, password_bytes)
+        return verified
+
+    async def update_password_hash(
+        self,
+        user: FamilyMember,
+        old_hash: str,
+        new_hash: str,
+        conn: Optional[asyncpg.Connection] = None,
+    ) -> None:
+        """Replace ``old_hash`` with ``new_hash`` (e.g. bcrypt -> argon2 on login)"""
+        async with self._acquire(conn) as conn:
+            await conn.execute(UPDATE_PASSWORD_HASH_SQL, user.username, new_hash, old_hash)
+        member_by_email_cache.invalidate_member(user.id)
+        recent_auth_cache.invalidate(user.id)
@@ -2,7 +2,8 @@
 
 import os
 import json
-from typing import Dict, Any, Optional, List
+import time
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 from enum import Enum
@@ -46,8 +47,15 @@ class FeatureFlag:
 class FeatureFlagManager:
     """Manager for feature flags with dynamic evaluation."""
 
+    # Lifetime (seconds) of the statistics/export snapshots; they are also
+    # rebuilt as soon as a flag is registered, updated or imported
+    SNAPSHOT_TTL = 60.0
+
     def __init__(self):
         self.flags: Dict[str, FeatureFlag] = {}
+        # Bumped on every change made through this manager
+        self._version = 0
+        self._snapshots: Dict[str, Tuple[int, float, Dict[str, Any]]] = {}
         self._load_default_flags()
         self._load_environment_overrides()
 
@@ -259,6 +267,7 @@ class FeatureFlagManager:
     def register_flag(self, flag: FeatureFlag):
         """Register a new feature flag."""
         self.flags[flag.key] = flag
+        self._version += 1
 
     def is_enabled(self, flag_key: str, user_context: Optional[Dict[str, Any]] = None) -> bool:
         """Check if a feature flag is enabled for a given user context."""
@@ -332,9 +341,29 @@ class FeatureFlagManager:
                 if hasattr(flag, key):
                     setattr(flag, key, value)
             flag.updated_at = datetime.now(timezone.utc)
+            self._version += 1
+
+    def _snapshot(self, name: str, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the cached result of build(), rebuilding it when stale."""
+        now = time.monotonic()
+        cached = self._snapshots.get(name)
+        if cached and cached[0] == self._version and cached[1] > now:
+            return cached[2]
+
+        value = build()
+        self._snapshots[name] = (self._version, now + self.SNAPSHOT_TTL, value)
+        return value
 
     def get_flag_statistics(self) -> Dict[str, Any]:
-        """Get statistics about feature flag usage."""
+        """
+        Get statistics about feature flag usage.
+
+        Cached for up to SNAPSHOT_TTL seconds and shared between callers, so
+        treat the result as read-only.
+        """
+        return self._snapshot("statistics", self._build_flag_statistics)
+
+    def _build_flag_statistics(self) -> Dict[str, Any]:
         stats = {
             "total_flags": len(self.flags),
             "enabled": 0,
@@ -371,7 +400,15 @@ class FeatureFlagManager:
         return stats
 
     def export_config(self) -> Dict[str, Any]:
-        """Export feature flag configuration for backup/migration."""
+        """
+        Export feature flag configuration for backup/migration.
+
+        Cached like get_flag_statistics(); exported_at is the time the
+        snapshot was taken.
+        """
+        return self._snapshot("export", self._build_export_config)
+
+    def _build_export_config(self) -> Dict[str, Any]:
         return {
             "exported_at": datetime.now(timezone.utc).isoformat(),
             "flags": {
@@ -413,6 +450,7 @@ class FeatureFlagManager:
                 updated_at=datetime.fromisoformat(flag_data["updated_at"])
             )
             self.flags[key] = flag
+        self._version += 1
 
 
 # Global feature flag manager instance
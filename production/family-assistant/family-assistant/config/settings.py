@@ -44,6 +44,17 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def postgres_connect_kwargs(self) -> Dict[str, Any]:
+        """Get asyncpg connect()/create_pool() connection arguments."""
+        return {
+            "host": self.postgres_host,
+            "port": self.postgres_port,
+            "user": self.postgres_user,
+            "password": self.postgres_password,
+            "database": self.postgres_db,
+        }
+
     # Redis
     redis_host: str = "redis.homelab.svc.cluster.local"
     redis_port: int = 6379
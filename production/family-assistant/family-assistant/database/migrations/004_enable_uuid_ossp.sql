@@ -0,0 +1,14 @@
+-- ============================================================================
+-- Enable uuid-ossp for server-side deterministic user UUIDs
+-- ============================================================================
+
+-- Admin accounts in the users table have integer IDs; the API exposes them as
+-- uuid5(NAMESPACE_DNS, 'user-<id>'). uuid_generate_v5 lets UserManager resolve
+-- those IDs in SQL instead of scanning users from Python.
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 004: uuid-ossp extension enabled successfully!';
+END $$;
@@ -0,0 +1,29 @@
+-- ============================================================================
+-- Per-activity screen time rows (replaces screen_time_logs.activity_breakdown)
+-- ============================================================================
+
+-- update_screen_time runs on every activity tick. Incrementing a narrow row
+-- avoids the jsonb_set read-modify-write on the daily log's JSONB document.
+CREATE TABLE IF NOT EXISTS screen_time_activity (
+    user_id UUID REFERENCES family_members(id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    activity_type VARCHAR(50) NOT NULL,
+    minutes INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (user_id, date, activity_type)
+);
+
+-- Backfill from existing JSONB breakdowns
+INSERT INTO screen_time_activity (user_id, date, activity_type, minutes)
+SELECT l.user_id, l.date, b.key, b.value::int
+FROM screen_time_logs l, jsonb_each_text(l.activity_breakdown) AS b
+ON CONFLICT (user_id, date, activity_type) DO NOTHING;
+
+COMMENT ON TABLE screen_time_activity IS 'Daily screen time minutes per activity type';
+COMMENT ON COLUMN screen_time_logs.activity_breakdown IS 'Deprecated: superseded by screen_time_activity';
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 005: screen_time_activity table created successfully!';
+END $$;
@@ -0,0 +1,22 @@
+-- ============================================================================
+-- Composite audit_log indexes for newest-first filtered reads
+-- ============================================================================
+
+-- get_audit_logs always orders by created_at DESC with a LIMIT, optionally
+-- filtered by user and/or action. With (filter, created_at DESC) indexes the
+-- planner walks the index and stops after LIMIT rows instead of sorting every
+-- matching row.
+CREATE INDEX IF NOT EXISTS idx_audit_log_user_created
+    ON audit_log(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_log_action_created
+    ON audit_log(action, created_at DESC);
+
+-- The single-column indexes are prefixes of the composites above
+DROP INDEX IF EXISTS idx_audit_log_user;
+DROP INDEX IF EXISTS idx_audit_log_action;
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 006: audit_log composite indexes created successfully!';
+END $$;
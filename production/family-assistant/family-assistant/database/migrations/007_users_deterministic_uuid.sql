@@ -0,0 +1,22 @@
+-- ============================================================================
+-- Store the deterministic UUID of admin accounts on the users row
+-- ============================================================================
+
+-- Admin accounts are exposed to the API as uuid5(NAMESPACE_DNS, 'user-<id>').
+-- Keeping that value as a stored generated column with a unique index turns
+-- the reverse lookup in UserManager.get_family_member into a single index
+-- probe instead of hashing every users row per request.
+ALTER TABLE IF EXISTS users
+    ADD COLUMN IF NOT EXISTS deterministic_uuid UUID
+    GENERATED ALWAYS AS (uuid_generate_v5(uuid_ns_dns(), 'user-' || id::text)) STORED;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_deterministic_uuid
+    ON users(deterministic_uuid);
+
+COMMENT ON COLUMN users.deterministic_uuid IS 'uuid5(NAMESPACE_DNS, ''user-<id>''); the id admin accounts use as family members';
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 007: users.deterministic_uuid added successfully!';
+END $$;
@@ -0,0 +1,22 @@
+-- ============================================================================
+-- Partial indexes for active-account login lookups
+-- ============================================================================
+
+-- Login resolves users by email and family_members by username, always with
+-- is_active = TRUE. Partial indexes match those predicates exactly, so the
+-- planner probes an index of active accounts only instead of filtering rows
+-- from the full unique index.
+--
+-- CONCURRENTLY avoids locking writes on live tables; run this file with
+-- psql -f (autocommit), not inside a transaction block.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_active_email
+    ON users(email) WHERE is_active;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_family_members_active_username
+    ON family_members(username) WHERE is_active;
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 008: active login partial indexes created successfully!';
+END $$;
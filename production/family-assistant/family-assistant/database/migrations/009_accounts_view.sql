@@ -0,0 +1,37 @@
+-- ============================================================================
+-- Unified login accounts view
+-- ============================================================================
+
+-- Admin accounts live in users (login by email) and family accounts in
+-- family_members (login by username). accounts_v exposes both under one
+-- "login" column in the shape UserManager builds FamilyMembers from, so a
+-- login lookup is a single statement against one relation. Postgres pushes
+-- the login/is_active predicates into each UNION ALL branch, where the
+-- partial indexes from migration 008 serve them.
+--
+-- priority orders the branches: an admin account wins over a family account
+-- with the same login. Family rows carry no password hash here, matching
+-- what login has always seen for them.
+CREATE OR REPLACE VIEW accounts_v AS
+    SELECT email AS login, 0 AS priority,
+           deterministic_uuid AS id, username,
+           'Admin' AS first_name, 'User' AS last_name, email,
+           CASE WHEN is_admin THEN 'parent' ELSE 'member' END AS role,
+           'adult' AS age_group, 'en' AS language_preference,
+           password_hash AS hashed_password, is_active, created_at, updated_at
+    FROM users
+    UNION ALL
+    SELECT username, 1,
+           id, username,
+           COALESCE(first_name, ''), COALESCE(last_name, ''), username,
+           role, age_group, COALESCE(language_preference, 'en'),
+           NULL, is_active, created_at, updated_at
+    FROM family_members;
+
+COMMENT ON VIEW accounts_v IS 'Login accounts from users (by email) and family_members (by username); lowest priority wins';
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 009: accounts_v view created successfully!';
+END $$;
@@ -0,0 +1,239 @@
+-- ============================================================================
+-- Range-partition audit_log by month on created_at
+-- ============================================================================
+
+-- audit_log is append-only and read newest-first, so monthly partitions let
+-- retention drop whole tables instead of running DELETE + VACUUM, and time
+-- bounded reads prune to the partitions they touch. The existing table is
+-- attached as audit_log_legacy, covering everything before next month, so
+-- no rows are copied. The partition key has to be part of the primary key.
+-- conversation_history is created outside this tree and stays as it is.
+
+-- Creates <parent>_YYYY_MM for the current month and the next months_ahead
+-- months, plus the <parent>_default catch-all that keeps inserts working if a
+-- month is not created in time. Rows that already landed in <parent>_default
+-- for a new month are moved into it; months already covered by another
+-- partition are skipped. Schedule monthly, e.g. with pg_cron:
+-- SELECT cron.schedule('audit-log-partitions', '0 0 1 * *',
+--     'SELECT create_monthly_partitions(''audit_log'', 2)');
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent TEXT, months_ahead INT DEFAULT 1)
+RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+    default_name TEXT := parent || '_default';
+    month_start DATE;
+    month_end DATE;
+    partition_name TEXT;
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT',
+        default_name, parent
+    );
+
+    FOR month_start IN
+        SELECT generate_series(
+            date_trunc('month', NOW()),
+            date_trunc('month', NOW()) + make_interval(months => months_ahead),
+            INTERVAL '1 month'
+        )::date
+    LOOP
+        partition_name := parent || '_' || to_char(month_start, 'YYYY_MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+        month_end := (month_start + INTERVAL '1 month')::date;
+
+        BEGIN
+            -- Attaching checks that the default partition holds no rows
+            -- for the month, so move them over first
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name, parent
+            );
+            EXECUTE format(
+                'WITH moved AS ('
+                '    DELETE FROM %I'
+                '    WHERE created_at >= %L AND created_at < %L RETURNING *'
+                ') INSERT INTO %I SELECT * FROM moved',
+                default_name, month_start, month_end, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                parent, partition_name, month_start, month_end
+            );
+        EXCEPTION WHEN invalid_object_definition THEN
+            -- Overlaps an existing partition such as audit_log_legacy; the
+            -- table created above is rolled back with the block
+            NULL;
+        END;
+    END LOOP;
+END;
+$$;
+
+-- Drops <parent>_YYYY_MM partitions that end before NOW() - retention, and
+-- deletes rows that old from <parent>_default
+CREATE OR REPLACE FUNCTION drop_monthly_partitions(parent TEXT, retention INTERVAL)
+RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+    partition_name TEXT;
+BEGIN
+    FOR partition_name IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = parent::regclass
+          AND child.relname ~ ('^' || parent || '_[0-9]{4}_[0-9]{2}$')
+          AND to_date(right(child.relname, 7), 'YYYY_MM')
+              + INTERVAL '1 month' <= NOW() - retention
+    LOOP
+        EXECUTE format('DROP TABLE %I', partition_name);
+    END LOOP;
+
+    IF to_regclass(parent || '_default') IS NOT NULL THEN
+        EXECUTE format('DELETE FROM %I WHERE created_at < $1', parent || '_default')
+        USING NOW() - retention;
+    END IF;
+END;
+$$;
+
+-- Everything that reads the whole table runs before audit_log is locked,
+-- without blocking writes: the primary key index for the legacy partition is
+-- built CONCURRENTLY, and NOT VALID checks for NOT NULL and for the legacy
+-- partition's range are validated under a SHARE UPDATE EXCLUSIVE lock. SET
+-- NOT NULL and ATTACH PARTITION then prove their conditions from these
+-- checks instead of scanning the table, so the exclusive lock is held only
+-- for catalog changes. Run this file with psql -f (autocommit), not inside
+-- a transaction block; \gexec runs each statement the query before it
+-- generates on its own, and only while audit_log is not yet partitioned.
+--
+-- From the range check on, rows dated next month are rejected until
+-- audit_log is partitioned, so do not run this across a month boundary.
+
+-- Left invalid by an interrupted run; IF NOT EXISTS would keep it
+SELECT 'DROP INDEX CONCURRENTLY audit_log_legacy_pkey'
+FROM pg_index
+WHERE indexrelid = to_regclass('audit_log_legacy_pkey') AND NOT indisvalid
+\gexec
+
+SELECT 'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS audit_log_legacy_pkey '
+       'ON audit_log(id, created_at)'
+FROM pg_class
+WHERE oid = to_regclass('audit_log') AND relkind = 'r'
+\gexec
+
+DO $$
+DECLARE
+    legacy_end DATE := (date_trunc('month', NOW()) + INTERVAL '1 month')::date;
+BEGIN
+    -- Already partitioned (or never created): nothing to convert
+    IF to_regclass('audit_log') IS NULL OR EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = 'audit_log'::regclass
+    ) THEN
+        RETURN;
+    END IF;
+
+    -- Checked for new rows only, until validated below
+    ALTER TABLE audit_log DROP CONSTRAINT IF EXISTS audit_log_created_at_not_null;
+    ALTER TABLE audit_log DROP CONSTRAINT IF EXISTS audit_log_legacy_range;
+    ALTER TABLE audit_log ADD CONSTRAINT audit_log_created_at_not_null
+        CHECK (created_at IS NOT NULL) NOT VALID;
+    EXECUTE format(
+        'ALTER TABLE audit_log ADD CONSTRAINT audit_log_legacy_range '
+        'CHECK (created_at < %L) NOT VALID',
+        legacy_end
+    );
+END $$;
+
+DO $$
+BEGIN
+    IF to_regclass('audit_log') IS NULL OR EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = 'audit_log'::regclass
+    ) THEN
+        RETURN;
+    END IF;
+
+    UPDATE audit_log SET created_at = NOW() WHERE created_at IS NULL;
+END $$;
+
+DO $$
+BEGIN
+    IF to_regclass('audit_log') IS NULL OR EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = 'audit_log'::regclass
+    ) THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE audit_log VALIDATE CONSTRAINT audit_log_created_at_not_null;
+    ALTER TABLE audit_log VALIDATE CONSTRAINT audit_log_legacy_range;
+END $$;
+
+DO $$
+DECLARE
+    legacy_end DATE := (date_trunc('month', NOW()) + INTERVAL '1 month')::date;
+    fk RECORD;
+BEGIN
+    IF to_regclass('audit_log') IS NULL OR EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = 'audit_log'::regclass
+    ) THEN
+        RETURN;
+    END IF;
+
+    LOCK TABLE audit_log IN ACCESS EXCLUSIVE MODE;
+
+    ALTER TABLE audit_log ALTER COLUMN created_at SET NOT NULL;
+
+    ALTER TABLE audit_log RENAME TO audit_log_legacy;
+    ALTER TABLE audit_log_legacy DROP CONSTRAINT audit_log_pkey;
+    ALTER TABLE audit_log_legacy ADD CONSTRAINT audit_log_legacy_pkey
+        PRIMARY KEY USING INDEX audit_log_legacy_pkey;
+    ALTER INDEX IF EXISTS idx_audit_log_created
+        RENAME TO audit_log_legacy_created_idx;
+    ALTER INDEX IF EXISTS idx_audit_log_resource
+        RENAME TO audit_log_legacy_resource_idx;
+    ALTER INDEX IF EXISTS idx_audit_log_user_created
+        RENAME TO audit_log_legacy_user_created_idx;
+    ALTER INDEX IF EXISTS idx_audit_log_action_created
+        RENAME TO audit_log_legacy_action_created_idx;
+
+    CREATE TABLE audit_log (
+        LIKE audit_log_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+    ) PARTITION BY RANGE (created_at);
+    -- Copied by LIKE, but only the legacy partition is bounded
+    ALTER TABLE audit_log DROP CONSTRAINT audit_log_created_at_not_null;
+    ALTER TABLE audit_log DROP CONSTRAINT audit_log_legacy_range;
+    ALTER TABLE audit_log ADD PRIMARY KEY (id, created_at);
+
+    FOR fk IN
+        SELECT pg_get_constraintdef(oid) AS def
+        FROM pg_constraint
+        WHERE conrelid = 'audit_log_legacy'::regclass AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE audit_log ADD %s', fk.def);
+    END LOOP;
+
+    -- Same indexes as migrations 003 and 006; attaching the legacy table
+    -- adopts its matching indexes instead of rebuilding them
+    CREATE INDEX idx_audit_log_created ON audit_log(created_at);
+    CREATE INDEX idx_audit_log_resource ON audit_log(resource_type, resource_id);
+    CREATE INDEX idx_audit_log_user_created ON audit_log(user_id, created_at DESC);
+    CREATE INDEX idx_audit_log_action_created ON audit_log(action, created_at DESC);
+
+    EXECUTE format(
+        'ALTER TABLE audit_log ATTACH PARTITION audit_log_legacy '
+        'FOR VALUES FROM (MINVALUE) TO (%L)',
+        legacy_end
+    );
+
+    -- Implied by NOT NULL and the partition bound from here on
+    ALTER TABLE audit_log_legacy DROP CONSTRAINT audit_log_created_at_not_null;
+    ALTER TABLE audit_log_legacy DROP CONSTRAINT audit_log_legacy_range;
+END $$;
+
+SELECT create_monthly_partitions('audit_log', 2);
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 010: audit_log partitioned by month successfully!';
+END $$;
@@ -0,0 +1,56 @@
+-- ============================================================================
+-- GIN indexes for JSONB containment filters
+-- ============================================================================
+
+-- Audit searches filter audit_log.details, and permission checks filter
+-- user_profiles.permissions, by containment (column @> '{"key": ...}').
+-- jsonb_path_ops indexes are a fraction of the size of the default jsonb_ops
+-- and still serve @>; they do not serve ?, ?| or ?&, and ->/->> filters never
+-- use a GIN index, so filter with @>.
+--
+-- CONCURRENTLY avoids locking writes on live tables; run this file with
+-- psql -f (autocommit), not inside a transaction block. \gexec runs each
+-- statement the query before it generates on its own.
+
+-- audit_log is partitioned (migration 010) and CONCURRENTLY is not available
+-- on partitioned tables. So the index is created on the parent only, where it
+-- stays invalid, then built CONCURRENTLY on each partition and attached; it
+-- becomes valid once every partition's index is attached. Partitions
+-- attached later get the index built as part of ATTACH PARTITION.
+CREATE INDEX IF NOT EXISTS idx_audit_log_details
+    ON ONLY audit_log USING GIN (details jsonb_path_ops);
+
+SELECT format(
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS %I ON %I USING GIN (details jsonb_path_ops)',
+    child.relname || '_details_idx', child.relname
+)
+FROM pg_inherits
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE pg_inherits.inhparent = 'audit_log'::regclass
+\gexec
+
+SELECT format(
+    'ALTER INDEX idx_audit_log_details ATTACH PARTITION %I',
+    child.relname || '_details_idx'
+)
+FROM pg_inherits
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE pg_inherits.inhparent = 'audit_log'::regclass
+  AND NOT EXISTS (
+      SELECT 1 FROM pg_inherits attached
+      WHERE attached.inhparent = 'idx_audit_log_details'::regclass
+        AND attached.inhrelid = to_regclass(child.relname || '_details_idx')
+  )
+\gexec
+
+-- user_profiles is created outside this tree; skipped when it is absent
+SELECT 'CREATE INDEX CONCURRENTLY IF NOT EXISTS user_profiles_permissions_gin '
+       'ON user_profiles USING GIN (permissions jsonb_path_ops)'
+WHERE to_regclass('user_profiles') IS NOT NULL
+\gexec
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 011: JSONB GIN indexes created successfully!';
+END $$;
@@ -0,0 +1,25 @@
+-- ============================================================================
+-- Composite conversation_history indexes for per-thread and per-user reads
+-- ============================================================================
+
+-- The API reads a thread's messages in created_at order and lists a user's
+-- threads by recency. (thread_id|user_id, created_at DESC) returns rows in
+-- index order (scanned backwards for ASC), so neither read needs a sort; the
+-- single-column indexes are prefixes of these and only add write cost.
+--
+-- CONCURRENTLY avoids locking writes on live tables; run this file with
+-- psql -f (autocommit), not inside a transaction block.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS conversation_history_thread_created_idx
+    ON conversation_history(thread_id, created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS conversation_history_user_created_idx
+    ON conversation_history(user_id, created_at DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS conversation_history_thread_id_idx;
+DROP INDEX CONCURRENTLY IF EXISTS conversation_history_user_id_idx;
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 012: conversation_history composite indexes created successfully!';
+END $$;
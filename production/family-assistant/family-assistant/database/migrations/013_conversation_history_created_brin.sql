@@ -0,0 +1,24 @@
+-- ============================================================================
+-- BRIN index for time-window scans on conversation_history
+-- ============================================================================
+
+-- conversation_history is append-only, so created_at follows physical row
+-- order and a BRIN index (one min/max summary per 32 pages) is enough to skip
+-- everything outside a recent window, such as the dashboard's last-24-hours
+-- message count, at a tiny fraction of a B-tree's size and insert cost.
+--
+-- audit_log keeps its B-tree on created_at: get_audit_logs without filters
+-- reads it newest-first with a LIMIT, which BRIN cannot return in order, and
+-- migration 010 already prunes its time ranges by partition.
+--
+-- CONCURRENTLY avoids locking writes on live tables; run this file with
+-- psql -f (autocommit), not inside a transaction block.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS conversation_history_created_brin
+    ON conversation_history USING BRIN (created_at)
+    WITH (pages_per_range = 32);
+
+-- Verification
+DO $$
+BEGIN
+    RAISE NOTICE 'Migration 013: conversation_history created_at BRIN index created successfully!';
+END $$;
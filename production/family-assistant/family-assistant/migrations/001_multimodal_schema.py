@@ -3,8 +3,6 @@
 import asyncio
 import asyncpg
 from datetime import datetime
-import json
-from typing import Optional, Dict, Any
 
 from config.settings import settings
 
@@ -393,34 +391,36 @@ async def create_indexes(conn):
 async def migrate_existing_data(conn):
     """Migrate existing data to multimodal schema."""
 
-    # Check if legacy user_profiles table exists
-    table_exists = await conn.fetchval("""
-        SELECT EXISTS (
-            SELECT FROM information_schema.tables
-            WHERE table_name = 'user_profiles'
-        );
-    """)
-
-    if table_exists:
-        # Migrate user profiles to family_members
+    # Check which legacy tables exist, all in one round trip
+    legacy_tables = {
+        row["table_name"]
+        for row in await conn.fetch("""
+            SELECT table_name FROM information_schema.tables
+            WHERE table_name = ANY($1::text[]);
+        """, ["user_profiles", "conversation_history"])
+    }
+
+    if "user_profiles" in legacy_tables:
+        # Migrate user profiles to family_members; executemany pipelines
+        # every upsert through one prepared statement
         existing_profiles = await conn.fetch("""
             SELECT * FROM user_profiles;
         """)
 
-        for profile in existing_profiles:
-            await conn.execute("""
-                INSERT INTO family_members (
-                    user_id, name, role, age, permissions, preferences,
-                    created_at, updated_at
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                ON CONFLICT (user_id) DO UPDATE SET
-                    name = EXCLUDED.name,
-                    role = EXCLUDED.role,
-                    age = EXCLUDED.age,
-                    permissions = EXCLUDED.permissions,
-                    preferences = EXCLUDED.preferences,
-                    updated_at = EXCLUDED.updated_at;
-            """,
+        await conn.executemany("""
+            INSERT INTO family_members (
+                user_id, name, role, age, permissions, preferences,
+                created_at, updated_at
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            ON CONFLICT (user_id) DO UPDATE SET
+                name = EXCLUDED.name,
+                role = EXCLUDED.role,
+                age = EXCLUDED.age,
+                permissions = EXCLUDED.permissions,
+                preferences = EXCLUDED.preferences,
+                updated_at = EXCLUDED.updated_at;
+        """, [
+            (
                 profile['user_id'],
                 profile['name'],
                 profile['role'],
@@ -430,38 +430,33 @@ async def migrate_existing_data(conn):
                 profile.get('created_at', datetime.utcnow()),
                 profile.get('updated_at', datetime.utcnow())
             )
+            for profile in existing_profiles
+        ])
 
         print(f"✅ Migrated {len(existing_profiles)} user profiles to family_members")
 
-    # Check if legacy conversation_history table exists
-    conv_table_exists = await conn.fetchval("""
-        SELECT EXISTS (
-            SELECT FROM information_schema.tables
-            WHERE table_name = 'conversation_history'
-        );
-    """)
-
-    if conv_table_exists:
-        # Migrate conversation history
+    if "conversation_history" in legacy_tables:
+        # Migrate conversation history, streamed in with COPY
         existing_convs = await conn.fetch("""
             SELECT * FROM conversation_history;
         """)
 
-        for conv in existing_convs:
-            # Map legacy role to new message_role enum
-            role_map = {'user': 'user', 'assistant': 'assistant', 'system': 'system'}
-            role = role_map.get(conv['role'], 'user')
-
-            await conn.execute("""
-                INSERT INTO conversations (
-                    thread_id, role, content, created_at
-                ) VALUES ($1, $2, $3, $4);
-            """,
-                conv['thread_id'],
-                role,
-                conv['content'],
-                conv.get('created_at', datetime.utcnow())
-            )
+        # Map legacy role to new message_role enum
+        role_map = {'user': 'user', 'assistant': 'assistant', 'system': 'system'}
+
+        await conn.copy_records_to_table(
+            'conversations',
+            records=[
+                (
+                    conv['thread_id'],
+                    role_map.get(conv['role'], 'user'),
+                    conv['content'],
+                    conv.get('created_at', datetime.utcnow())
+                )
+                for conv in existing_convs
+            ],
+            columns=['thread_id', 'role', 'content', 'created_at']
+        )
 
         print(f"✅ Migrated {len(existing_convs)} conversation history entries")
 
@@ -500,13 +495,7 @@ async def run_migration():
 
     print("🚀 Starting multimodal database migration...")
 
-    conn = await asyncpg.connect(
-        host=settings.postgres_host,
-        port=settings.postgres_port,
-        user=settings.postgres_user,
-        password=settings.postgres_password,
-        database=settings.postgres_db
-    )
+    conn = await asyncpg.connect(**settings.postgres_connect_kwargs)
 
     try:
         # Run migration steps
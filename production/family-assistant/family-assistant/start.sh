@@ -11,4 +11,4 @@ export PYTHONPATH=/home/pesu/Rakuflow/systems/homelab/services/family-assistant
 
 # Start API
 echo "🚀 Starting Family Assistant API..."
-uvicorn api.main:app --host 0.0.0.0 --port 8001 --reload
+uvicorn api.main:app --host 0.0.0.0 --port 8001 --reload --loop uvloop --http httptools
@@ -4,6 +4,7 @@ Helper utilities for testing Family Assistant functionality.
 Provides:
 - Assertion helpers for API responses
 - Database helpers for test data setup
+- A fake asyncpg connection and clock for UserManager unit tests
 - Mock helpers for external service responses
 - Performance measurement utilities
 - File and multimodal content helpers
@@ -14,6 +15,7 @@ import tempfile
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
 import aiofiles
 import pytest
 
@@ -111,6 +113,46 @@ class DatabaseHelpers:
         await db.commit()
 
 
+class FakeConnection:
+    """asyncpg connection stand-in answering every query with canned results.
+
+    Pass it to UserManager methods as ``conn=``. SQL sent through fetchrow,
+    fetch and execute is recorded in ``queries``; fetchval (audit log
+    inserts) returns a fresh id.
+    """
+
+    def __init__(self, row=None, rows=(), status: str = "UPDATE 1"):
+        self.row = row
+        self.rows = list(rows)
+        self.status = status
+        self.queries: List[str] = []
+
+    async def fetchrow(self, sql, *args):
+        self.queries.append(sql)
+        return self.row
+
+    async def fetch(self, sql, *args):
+        self.queries.append(sql)
+        return self.rows
+
+    async def fetchval(self, sql, *args):
+        return uuid4()
+
+    async def execute(self, sql, *args):
+        self.queries.append(sql)
+        return self.status
+
+
+class FakeClock:
+    """Settable stand-in for time.monotonic, for TTL tests."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
 class MockHelpers:
     """Helpers for creating comprehensive mocks."""
 
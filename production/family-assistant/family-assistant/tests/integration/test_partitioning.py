@@ -0,0 +1,309 @@
+"""
+Integration tests for the monthly range partitioning of checkpoints and
+audit_log.
+
+Runs the real schema SQL against the configured PostgreSQL, each test in a
+scratch schema; skipped when no database is reachable. Migrations are run
+with psql -f, as they are deployed; those tests are skipped without psql.
+"""
+
+import asyncio
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import asyncpg
+import pytest
+import pytest_asyncio
+
+from api.database import CHECKPOINT_SCHEMA_SQL, create_plain_checkpoint_indexes
+from config.settings import settings
+
+MIGRATIONS = Path(__file__).resolve().parents[2] / "database" / "migrations"
+MIGRATION_010 = MIGRATIONS / "010_partition_audit_log.sql"
+MIGRATION_011 = MIGRATIONS / "011_jsonb_gin_indexes.sql"
+
+# checkpoints as created before partitioning
+PLAIN_CHECKPOINTS_SQL = """
+    CREATE TABLE checkpoints (
+        thread_id TEXT NOT NULL,
+        checkpoint_id TEXT NOT NULL,
+        parent_id TEXT,
+        checkpoint BYTEA NOT NULL,
+        metadata JSONB DEFAULT '{}'::jsonb,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (thread_id, checkpoint_id)
+    );
+    CREATE INDEX idx_checkpoints_thread ON checkpoints(thread_id);
+"""
+
+# Minimal audit_log as created by migration 003, without the FK to
+# family_members
+AUDIT_LOG_SQL = """
+    CREATE TABLE audit_log (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID,
+        action VARCHAR(100) NOT NULL,
+        resource_type VARCHAR(50),
+        resource_id UUID,
+        details JSONB,
+        created_at TIMESTAMP DEFAULT NOW()
+    );
+    CREATE INDEX idx_audit_log_created ON audit_log(created_at);
+    CREATE INDEX idx_audit_log_resource ON audit_log(resource_type, resource_id);
+"""
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.external]
+
+
+def months_from_now(months: int) -> datetime:
+    """The 15th of the month ``months`` after the current one."""
+    now = datetime.now()
+    year, month = divmod(now.month - 1 + months, 12)
+    return datetime(now.year + year, month + 1, 15)
+
+
+@pytest_asyncio.fixture
+async def pg_conn():
+    """Connection whose search_path is a throwaway schema."""
+    try:
+        conn = await asyncpg.connect(**settings.postgres_connect_kwargs, timeout=5)
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    schema = f"test_partitioning_{uuid.uuid4().hex[:8]}"
+    await conn.execute(f"CREATE SCHEMA {schema}; SET search_path TO {schema}")
+    try:
+        yield conn
+    finally:
+        await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+        await conn.close()
+
+
+async def run_migration(conn: asyncpg.Connection, path: Path):
+    """Run a migration file with psql -f in the connection's schema."""
+    psql = shutil.which("psql")
+    if psql is None:
+        pytest.skip("psql not available")
+
+    connect_kwargs = settings.postgres_connect_kwargs
+    env = {
+        **os.environ,
+        "PGHOST": connect_kwargs["host"],
+        "PGPORT": str(connect_kwargs["port"]),
+        "PGUSER": connect_kwargs["user"],
+        "PGPASSWORD": connect_kwargs["password"],
+        "PGDATABASE": connect_kwargs["database"],
+        "PGOPTIONS": f"-c search_path={await conn.fetchval('SELECT current_schema()')}",
+    }
+    process = await asyncio.create_subprocess_exec(
+        psql, "-q", "-v", "ON_ERROR_STOP=1", "-f", str(path),
+        env=env,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    assert process.returncode == 0, stderr.decode()
+
+
+async def partition_of(conn: asyncpg.Connection, table: str, **where) -> str:
+    column, value = next(iter(where.items()))
+    return await conn.fetchval(
+        f"SELECT tableoid::regclass::text FROM {table} WHERE {column} = $1", value
+    )
+
+
+async def index_validity(conn: asyncpg.Connection, table: str) -> dict:
+    rows = await conn.fetch(
+        "SELECT indexrelid::regclass::text AS name, indisvalid FROM pg_index "
+        "WHERE indrelid = $1::regclass",
+        table
+    )
+    return {row["name"]: row["indisvalid"] for row in rows}
+
+
+class TestCheckpointPartitions:
+    """checkpoints partitions created by CHECKPOINT_SCHEMA_SQL."""
+
+    async def test_insert_past_precreated_months_uses_default(self, pg_conn):
+        """Rows beyond the pre-created months land in checkpoints_default."""
+        await pg_conn.execute(CHECKPOINT_SCHEMA_SQL)
+
+        await pg_conn.execute(
+            "INSERT INTO checkpoints (thread_id, checkpoint_id, checkpoint, created_at) "
+            "VALUES ('t1', 'c1', '\\x00', $1)",
+            months_from_now(6)
+        )
+
+        assert await partition_of(pg_conn, "checkpoints", checkpoint_id="c1") == "checkpoints_default"
+
+    async def test_new_month_takes_over_rows_from_default(self, pg_conn):
+        """Creating a month's partition moves its rows out of the default one."""
+        await pg_conn.execute(CHECKPOINT_SCHEMA_SQL)
+        created_at = months_from_now(6)
+        await pg_conn.execute(
+            "INSERT INTO checkpoints (thread_id, checkpoint_id, checkpoint, created_at) "
+            "VALUES ('t1', 'c1', '\\x00', $1)",
+            created_at
+        )
+
+        await pg_conn.execute("SELECT create_checkpoint_partitions(6)")
+
+        assert await partition_of(pg_conn, "checkpoints", checkpoint_id="c1") == (
+            f"checkpoints_{created_at:%Y_%m}"
+        )
+        assert await pg_conn.fetchval("SELECT COUNT(*) FROM checkpoints_default") == 0
+
+    async def test_schema_setup_is_rerunnable(self, pg_conn):
+        """Pod restarts re-run the script against existing partitions."""
+        await pg_conn.execute(CHECKPOINT_SCHEMA_SQL)
+        await pg_conn.execute(CHECKPOINT_SCHEMA_SQL)
+
+        assert await pg_conn.fetchval("SELECT to_regclass('checkpoints_default')") is not None
+
+
+class TestPlainCheckpointIndexes:
+    """Indexes on a checkpoints table created before partitioning."""
+
+    async def test_indexes_built_concurrently(self, pg_conn):
+        """The schema script leaves a plain table alone; the indexes follow."""
+        await pg_conn.execute(PLAIN_CHECKPOINTS_SQL)
+        await pg_conn.execute(CHECKPOINT_SCHEMA_SQL)
+        assert "idx_checkpoints_thread_recent" not in await index_validity(pg_conn, "checkpoints")
+
+        await create_plain_checkpoint_indexes(pg_conn)
+
+        assert await index_validity(pg_conn, "checkpoints") == {
+            "checkpoints_pkey": True,
+            "idx_checkpoints_thread_recent": True,
+            "idx_checkpoints_parent": True,
+            "idx_checkpoints_metadata": True,
+        }
+
+    async def test_invalid_index_is_rebuilt(self, pg_conn):
+        """An index left invalid by an interrupted build is built again."""
+        await pg_conn.execute(PLAIN_CHECKPOINTS_SQL)
+        await pg_conn.execute("""
+            CREATE INDEX idx_checkpoints_parent ON checkpoints(parent_id);
+            UPDATE pg_index SET indisvalid = false
+            WHERE indexrelid = 'idx_checkpoints_parent'::regclass;
+        """)
+
+        await create_plain_checkpoint_indexes(pg_conn)
+
+        assert (await index_validity(pg_conn, "checkpoints"))["idx_checkpoints_parent"] is True
+
+    async def test_partitioned_table_untouched(self, pg_conn):
+        """A partitioned checkpoints table is left to the schema script."""
+        await pg_conn.execute(CHECKPOINT_SCHEMA_SQL)
+        before = await index_validity(pg_conn, "checkpoints")
+
+        await create_plain_checkpoint_indexes(pg_conn)
+
+        assert await index_validity(pg_conn, "checkpoints") == before
+
+
+class TestAuditLogPartitions:
+    """audit_log partitions created by migration 010."""
+
+    async def test_insert_past_precreated_months_uses_default(self, pg_conn):
+        """Audit rows beyond the pre-created months land in audit_log_default."""
+        await pg_conn.execute(AUDIT_LOG_SQL)
+        await run_migration(pg_conn, MIGRATION_010)
+
+        audit_id = await pg_conn.fetchval(
+            "INSERT INTO audit_log (action, created_at) VALUES ('login', $1) RETURNING id",
+            months_from_now(6)
+        )
+
+        assert await partition_of(pg_conn, "audit_log", id=audit_id) == "audit_log_default"
+
+    async def test_new_month_takes_over_rows_from_default(self, pg_conn):
+        """Creating a month's partition moves its rows out of the default one."""
+        await pg_conn.execute(AUDIT_LOG_SQL)
+        await run_migration(pg_conn, MIGRATION_010)
+        created_at = months_from_now(6)
+        audit_id = await pg_conn.fetchval(
+            "INSERT INTO audit_log (action, created_at) VALUES ('login', $1) RETURNING id",
+            created_at
+        )
+
+        await pg_conn.execute("SELECT create_monthly_partitions('audit_log', 6)")
+
+        assert await partition_of(pg_conn, "audit_log", id=audit_id) == (
+            f"audit_log_{created_at:%Y_%m}"
+        )
+
+    async def test_existing_rows_stay_in_legacy_partition(self, pg_conn):
+        """Rows from before the migration are served by audit_log_legacy."""
+        await pg_conn.execute(AUDIT_LOG_SQL)
+        audit_id = await pg_conn.fetchval(
+            "INSERT INTO audit_log (action) VALUES ('login') RETURNING id"
+        )
+
+        await run_migration(pg_conn, MIGRATION_010)
+
+        assert await partition_of(pg_conn, "audit_log", id=audit_id) == "audit_log_legacy"
+
+    async def test_legacy_checks_dropped(self, pg_conn):
+        """The checks that let SET NOT NULL and ATTACH skip their scans are gone."""
+        await pg_conn.execute(AUDIT_LOG_SQL)
+        await pg_conn.execute("INSERT INTO audit_log (action, created_at) VALUES ('login', NULL)")
+
+        await run_migration(pg_conn, MIGRATION_010)
+
+        constraints = await pg_conn.fetch(
+            "SELECT conrelid::regclass::text AS table_name, conname, contype::text "
+            "FROM pg_constraint WHERE conrelid IN ('audit_log'::regclass, "
+            "'audit_log_legacy'::regclass) AND contype IN ('c', 'p') ORDER BY 1"
+        )
+        assert [tuple(row) for row in constraints] == [
+            ("audit_log", "audit_log_pkey", "p"),
+            ("audit_log_legacy", "audit_log_legacy_pkey", "p"),
+        ]
+        assert await pg_conn.fetchval("SELECT COUNT(*) FROM audit_log WHERE created_at IS NULL") == 0
+
+    async def test_rerun_is_noop(self, pg_conn):
+        """Running the migration again leaves the partitioned table alone."""
+        await pg_conn.execute(AUDIT_LOG_SQL)
+        audit_id = await pg_conn.fetchval(
+            "INSERT INTO audit_log (action) VALUES ('login') RETURNING id"
+        )
+        await run_migration(pg_conn, MIGRATION_010)
+
+        await run_migration(pg_conn, MIGRATION_010)
+
+        assert await partition_of(pg_conn, "audit_log", id=audit_id) == "audit_log_legacy"
+
+
+class TestJsonbGinIndexes:
+    """GIN indexes created by migration 011."""
+
+    async def test_audit_log_index_valid_on_every_partition(self, pg_conn):
+        """The parent index becomes valid once each partition's is attached."""
+        await pg_conn.execute(AUDIT_LOG_SQL)
+        await run_migration(pg_conn, MIGRATION_010)
+
+        await run_migration(pg_conn, MIGRATION_011)
+        await pg_conn.execute("SELECT create_monthly_partitions('audit_log', 6)")
+
+        assert (await index_validity(pg_conn, "audit_log"))["idx_audit_log_details"] is True
+        partition_indexes = await pg_conn.fetchval(
+            "SELECT COUNT(*) FROM pg_inherits "
+            "WHERE inhparent = 'idx_audit_log_details'::regclass"
+        )
+        partitions = await pg_conn.fetchval(
+            "SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'audit_log'::regclass"
+        )
+        assert partition_indexes == partitions
+
+    async def test_user_profiles_skipped_when_absent(self, pg_conn):
+        """Without user_profiles the migration still succeeds."""
+        await pg_conn.execute(AUDIT_LOG_SQL)
+        await run_migration(pg_conn, MIGRATION_010)
+
+        await run_migration(pg_conn, MIGRATION_011)
+
+        assert await pg_conn.fetchval("SELECT to_regclass('user_profiles_permissions_gin')") is None
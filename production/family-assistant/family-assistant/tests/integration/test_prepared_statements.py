@@ -0,0 +1,83 @@
+"""
+Integration tests for UserManager's per-connection prepared statements.
+
+Runs against the configured PostgreSQL, each test in a scratch schema;
+skipped when no database is reachable.
+"""
+
+import uuid
+
+import asyncpg
+import pytest
+import pytest_asyncio
+
+from api.services.user_manager import (
+    UserManagerConnection,
+    _fetchrow,
+    prepare_connection,
+)
+from config.settings import settings
+
+SELECT_SQL = "SELECT id, name FROM profiles WHERE id = $1"
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.external]
+
+
+@pytest_asyncio.fixture
+async def pg_conn():
+    """UserManagerConnection whose search_path is a throwaway schema."""
+    try:
+        conn = await asyncpg.connect(
+            **settings.postgres_connect_kwargs,
+            connection_class=UserManagerConnection,
+            timeout=5,
+        )
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    schema = f"test_prepared_{uuid.uuid4().hex[:8]}"
+    await conn.execute(f"""
+        CREATE SCHEMA {schema};
+        SET search_path TO {schema};
+        CREATE TABLE profiles (id INT PRIMARY KEY, name VARCHAR(50));
+        INSERT INTO profiles VALUES (1, 'Alex');
+    """)
+    await prepare_connection(conn, (SELECT_SQL,))
+    try:
+        yield conn
+    finally:
+        await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+        await conn.close()
+
+
+class TestPreparedStatementsAfterMigration:
+    """Prepared statements keep working after schema changes."""
+
+    async def test_added_column(self, pg_conn):
+        """An explicit projection is unaffected by a new column."""
+        await pg_conn.execute("ALTER TABLE profiles ADD COLUMN age INT")
+
+        assert (await _fetchrow(pg_conn, SELECT_SQL, 1))["name"] == "Alex"
+        assert (await pg_conn.fetchrow_prepared(SELECT_SQL, 1))["name"] == "Alex"
+
+    async def test_changed_result_type_is_reprepared(self, pg_conn):
+        """A statement whose result type changed is prepared again and retried."""
+        stale = pg_conn.prepared[SELECT_SQL]
+        await pg_conn.execute("ALTER TABLE profiles ALTER COLUMN name TYPE TEXT")
+
+        assert (await _fetchrow(pg_conn, SELECT_SQL, 1))["name"] == "Alex"
+        assert pg_conn.prepared[SELECT_SQL] is not stale
+
+    async def test_execute_prepared_is_reprepared(self, pg_conn):
+        """execute_prepared() retries the same way."""
+        await pg_conn.execute("ALTER TABLE profiles ALTER COLUMN name TYPE TEXT")
+
+        await pg_conn.execute_prepared(SELECT_SQL, 1)
+
+    async def test_no_retry_inside_transaction(self, pg_conn):
+        """Inside a transaction the error propagates; the transaction is aborted."""
+        await pg_conn.execute("ALTER TABLE profiles ALTER COLUMN name TYPE TEXT")
+
+        with pytest.raises(asyncpg.InvalidCachedStatementError):
+            async with pg_conn.transaction():
+                await _fetchrow(pg_conn, SELECT_SQL, 1)
@@ -0,0 +1,163 @@
+"""
+Unit tests for the batched audit log writer (AuditLogWriter).
+
+Tests:
+- A batch that fails to COPY is retried row by row
+- The writer keeps running after a bad batch or a lost connection
+- A full batch is flushed without waiting out the interval
+- A full queue sends entries to the inline INSERT
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import asyncpg
+import pytest
+
+from api.services.user_manager import AuditLogWriter, UserManager
+
+
+def audit_record(action="login", audit_id=None):
+    return (
+        audit_id or uuid4(), None, action, None, None,
+        None, True, None, datetime.now(timezone.utc),
+    )
+
+
+class FakeStatement:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def fetch(self, *record):
+        self.conn.check(record)
+        self.conn.rows.append(record)
+
+
+class FakeAuditConnection:
+    """Connection stand-in that rejects records whose id is not a UUID"""
+
+    def __init__(self):
+        self.rows = []
+        self.copies = 0
+
+    def check(self, record):
+        if not isinstance(record[0], UUID):
+            # What asyncpg raises while encoding such a record
+            raise ValueError(f"invalid UUID {record[0]!r}")
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies += 1
+        for record in records:
+            self.check(record)
+        self.rows.extend(records)
+
+    async def prepare(self, sql):
+        return FakeStatement(self)
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeAuditConnection()
+        self.fail = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        if self.fail is not None:
+            raise self.fail
+        yield self.conn
+
+
+@pytest.fixture
+def pool():
+    return FakePool()
+
+
+@pytest.mark.asyncio
+class TestAuditLogWriter:
+    """Test batching and failure handling of AuditLogWriter."""
+
+    async def test_bad_record_keeps_rest_of_batch(self, pool):
+        """A COPY that fails to encode one record is retried row by row."""
+        writer = AuditLogWriter(pool)
+        good = audit_record()
+
+        await writer._flush([good, audit_record(audit_id="not-a-uuid")])
+
+        assert pool.conn.rows == [good]
+
+    async def test_writer_survives_bad_batch(self, pool):
+        """Entries submitted after a failed batch are still written."""
+        writer = AuditLogWriter(pool, flush_interval=0.01)
+        writer.start()
+        try:
+            writer.submit(audit_record(audit_id="not-a-uuid"))
+            await asyncio.sleep(0.05)
+            good = audit_record()
+            writer.submit(good)
+            await asyncio.sleep(0.05)
+
+            assert not writer._task.done()
+            assert pool.conn.rows == [good]
+        finally:
+            await writer.close()
+
+    async def test_writer_survives_connection_error(self, pool):
+        """A batch lost to a connection error does not stop the writer."""
+        writer = AuditLogWriter(pool, flush_interval=0.01)
+        writer.start()
+        try:
+            pool.fail = asyncpg.InterfaceError("connection is closed")
+            writer.submit(audit_record())
+            await asyncio.sleep(0.05)
+            pool.fail = None
+            good = audit_record()
+            writer.submit(good)
+            await asyncio.sleep(0.05)
+
+            assert not writer._task.done()
+            assert pool.conn.rows == [good]
+        finally:
+            await writer.close()
+
+    async def test_full_batch_flushes_early(self, pool):
+        """batch_size waiting entries are written without waiting out the interval."""
+        writer = AuditLogWriter(pool, batch_size=3, flush_interval=60)
+        writer.start()
+        try:
+            records = [audit_record() for _ in range(4)]
+            for record in records:
+                writer.submit(record)
+            await asyncio.sleep(0.01)
+
+            assert pool.conn.rows == records[:3]
+        finally:
+            await writer.close()
+        assert pool.conn.rows == records
+
+    async def test_submit_refuses_when_full(self, pool):
+        """submit() reports a full queue instead of growing it."""
+        writer = AuditLogWriter(pool, max_pending=2)
+
+        assert writer.submit(audit_record()) is True
+        assert writer.submit(audit_record()) is True
+        assert writer.submit(audit_record()) is False
+        assert writer._queue.qsize() == 2
+
+    async def test_full_queue_writes_inline(self, pool):
+        """An entry the writer has no room for goes through the inline INSERT."""
+        inline_id = uuid4()
+
+        class InlineConnection:
+            async def fetchval(self, sql, *args):
+                return inline_id
+
+        user_manager = UserManager(None)
+        user_manager.audit_writer = AuditLogWriter(pool, max_pending=1)
+        user_manager.audit_writer.submit(audit_record())
+
+        audit_id = await user_manager._create_audit_log(InlineConnection(), None, "login")
+
+        assert audit_id == inline_id
+        assert user_manager.audit_writer._queue.qsize() == 1
@@ -0,0 +1,120 @@
+"""
+Unit tests for coalesced login lookups (EmailLookupBatcher).
+
+Tests:
+- Concurrent lookups share one ANY($1) query
+- Each caller gets the row for its own login
+- A failed query fails every waiting caller
+- close() resolves the open batch and unregisters the batcher
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from api.services.user_manager import EmailLookupBatcher, _email_batchers
+
+
+class FakeLookupConnection:
+    """Connection stand-in answering the batched lookup from ``accounts``"""
+
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.queries = []
+        self.error = None
+
+    async def fetch(self, sql, logins):
+        self.queries.append(sorted(logins))
+        if self.error is not None:
+            raise self.error
+        return [self.accounts[login] for login in logins if login in self.accounts]
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def account(login):
+    return {"login": login, "id": login.split("@")[0]}
+
+
+@pytest.fixture
+def conn():
+    return FakeLookupConnection({
+        "alex@example.com": account("alex@example.com"),
+        "sam@example.com": account("sam@example.com"),
+    })
+
+
+@pytest.fixture
+def batcher(conn):
+    batcher = EmailLookupBatcher(FakePool(conn))
+    batcher.start()
+    yield batcher
+    _email_batchers.pop(batcher.db, None)
+
+
+@pytest.mark.asyncio
+class TestEmailLookupBatcher:
+    """Test coalescing and result fan-out of EmailLookupBatcher."""
+
+    async def test_concurrent_lookups_share_one_query(self, batcher, conn):
+        """Lookups arriving within the window are resolved by one query."""
+        await asyncio.gather(
+            batcher.lookup("alex@example.com"),
+            batcher.lookup("sam@example.com"),
+            batcher.lookup("alex@example.com"),
+        )
+
+        assert conn.queries == [["alex@example.com", "sam@example.com"]]
+
+    async def test_each_caller_gets_its_own_row(self, batcher):
+        """Rows are handed back per login; unknown logins get None."""
+        alex, sam, again, unknown = await asyncio.gather(
+            batcher.lookup("alex@example.com"),
+            batcher.lookup("sam@example.com"),
+            batcher.lookup("alex@example.com"),
+            batcher.lookup("nobody@example.com"),
+        )
+
+        assert alex == account("alex@example.com")
+        assert sam == account("sam@example.com")
+        assert again == alex
+        assert unknown is None
+
+    async def test_later_lookup_opens_new_batch(self, batcher, conn):
+        """A lookup after a batch resolved is not served from it."""
+        await batcher.lookup("alex@example.com")
+        await batcher.lookup("alex@example.com")
+
+        assert len(conn.queries) == 2
+
+    async def test_error_fails_every_waiter(self, batcher, conn):
+        """A failed query is raised to each caller in the batch."""
+        conn.error = ConnectionError("database unavailable")
+
+        results = await asyncio.gather(
+            batcher.lookup("alex@example.com"),
+            batcher.lookup("sam@example.com"),
+            return_exceptions=True,
+        )
+
+        assert all(result is conn.error for result in results)
+
+    async def test_close_resolves_open_batch(self, batcher, conn):
+        """close() waits for the open batch and unregisters the batcher."""
+        assert _email_batchers[batcher.db] is batcher
+        lookup = asyncio.create_task(batcher.lookup("alex@example.com"))
+        await asyncio.sleep(0)
+
+        await batcher.close()
+
+        assert lookup.done()
+        assert lookup.result() == account("alex@example.com")
+        assert batcher.db not in _email_batchers
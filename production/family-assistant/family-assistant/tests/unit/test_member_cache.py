@@ -0,0 +1,175 @@
+"""
+Unit tests for the in-process login lookup cache (MemberCache).
+
+Tests:
+- Entries expire after the TTL
+- The cache is bounded, evicting the least recently used entry
+- UserManager drops a member's entries on update, delete and rehash
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from api.models.user_management import FamilyMember, FamilyMemberUpdate, UserRole
+from api.services import user_manager as user_manager_module
+from api.services.user_manager import MemberCache, UserManager, member_by_email_cache
+from tests.helpers.test_helpers import FakeClock, FakeConnection
+
+
+def make_member_row(**overrides):
+    now = datetime.now(timezone.utc)
+    row = {
+        "id": uuid4(),
+        "first_name": "Alex",
+        "role": UserRole.PARENT,
+        "email": "alex@example.com",
+        "username": "alex@example.com",
+        "hashed_password": "$argon2id$stored",
+        "created_at": now,
+        "updated_at": now,
+    }
+    row.update(overrides)
+    return row
+
+
+def make_member(**overrides):
+    return FamilyMember(**make_member_row(**overrides))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(user_manager_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def empty_shared_cache():
+    member_by_email_cache.clear()
+    yield
+    member_by_email_cache.clear()
+
+
+class TestMemberCache:
+    """Test TTL and LRU behaviour of MemberCache."""
+
+    def test_hit_within_ttl(self, clock):
+        """An entry is returned until its TTL runs out."""
+        cache = MemberCache(ttl=60.0)
+        member = make_member()
+        cache.put("alex@example.com", member)
+
+        clock.now += 59
+        assert cache.get("alex@example.com") is member
+
+    def test_expires_after_ttl(self, clock):
+        """An entry past its TTL is a miss and is removed."""
+        cache = MemberCache(ttl=60.0)
+        cache.put("alex@example.com", make_member())
+
+        clock.now += 61
+        assert cache.get("alex@example.com") is None
+        assert len(cache._entries) == 0
+
+    def test_put_restarts_ttl(self, clock):
+        """Storing a key again gives it a fresh TTL."""
+        cache = MemberCache(ttl=60.0)
+        cache.put("alex@example.com", make_member())
+        clock.now += 50
+        member = make_member()
+        cache.put("alex@example.com", member)
+
+        clock.now += 50
+        assert cache.get("alex@example.com") is member
+
+    def test_bounded_to_maxsize(self, clock):
+        """The oldest entry is evicted once maxsize is exceeded."""
+        cache = MemberCache(maxsize=2)
+        cache.put("a", make_member())
+        cache.put("b", make_member())
+        cache.put("c", make_member())
+
+        assert len(cache._entries) == 2
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.get("c") is not None
+
+    def test_get_refreshes_recency(self, clock):
+        """A recently read entry survives eviction."""
+        cache = MemberCache(maxsize=2)
+        cache.put("a", make_member())
+        cache.put("b", make_member())
+        cache.get("a")
+        cache.put("c", make_member())
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+    def test_invalidate_member_drops_all_keys(self, clock):
+        """Every key resolving to the member is dropped."""
+        cache = MemberCache()
+        member = make_member()
+        other = make_member()
+        cache.put("alex@example.com", member)
+        cache.put("alex", member)
+        cache.put("sam@example.com", other)
+
+        cache.invalidate_member(member.id)
+
+        assert cache.get("alex@example.com") is None
+        assert cache.get("alex") is None
+        assert cache.get("sam@example.com") is other
+
+
+@pytest.mark.asyncio
+class TestMemberCacheInvalidation:
+    """Test that UserManager writes drop cached lookups."""
+
+    async def test_update_invalidates(self):
+        """Updating a member drops their cached lookup."""
+        row = make_member_row()
+        member_by_email_cache.put(row["email"], FamilyMember(**row))
+
+        updated = await UserManager(None).update_family_member(
+            row["id"],
+            FamilyMemberUpdate(first_name="Sam"),
+            conn=FakeConnection(row={**row, "first_name": "Sam"})
+        )
+
+        assert updated.first_name == "Sam"
+        assert member_by_email_cache.get(row["email"]) is None
+
+    async def test_delete_invalidates(self):
+        """Deactivating a member drops their cached lookup."""
+        member = make_member()
+        member_by_email_cache.put(member.email, member)
+
+        deleted = await UserManager(None).delete_family_member(member.id, conn=FakeConnection())
+
+        assert deleted is True
+        assert member_by_email_cache.get(member.email) is None
+
+    async def test_delete_of_unknown_member_keeps_cache(self):
+        """A delete that matched no row leaves other entries alone."""
+        member = make_member()
+        member_by_email_cache.put(member.email, member)
+
+        deleted = await UserManager(None).delete_family_member(
+            uuid4(), conn=FakeConnection(status="UPDATE 0")
+        )
+
+        assert deleted is False
+        assert member_by_email_cache.get(member.email) is member
+
+    async def test_password_rehash_invalidates(self):
+        """Replacing the stored hash drops the cached lookup holding the old one."""
+        member = make_member()
+        member_by_email_cache.put(member.email, member)
+
+        await UserManager(None).update_password_hash(
+            member, member.hashed_password, "$argon2id$new", conn=FakeConnection()
+        )
+
+        assert member_by_email_cache.get(member.email) is None
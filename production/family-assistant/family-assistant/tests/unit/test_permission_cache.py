@@ -0,0 +1,187 @@
+"""
+Unit tests for the Redis permission cache in UserManager.
+
+Tests:
+- Cache misses query the database and fill the per-user hash
+- Cache hits skip the database
+- Grant, revoke and member deletion drop the user's cache entry
+- Redis errors fall back to the database
+"""
+
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+import redis.asyncio as redis
+
+from api.models.user_management import UserPermissionCreate
+from api.services.user_manager import UserManager
+from tests.helpers.test_helpers import FakeConnection
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def hset(self, key, field, value):
+        self.commands.append(("hset", key, field, value))
+
+    def expire(self, key, ttl):
+        self.commands.append(("expire", key, ttl))
+
+    async def execute(self):
+        self.client._check()
+        for command, key, *args in self.commands:
+            if command == "hset":
+                self.client.hashes.setdefault(key, {})[args[0]] = args[1]
+            else:
+                self.client.ttls[key] = args[0]
+
+
+class FakeRedis:
+    """In-memory subset of redis.asyncio.Redis used by the permission cache."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+        self.fail = False
+
+    def _check(self):
+        if self.fail:
+            raise redis.ConnectionError("Redis unavailable")
+
+    async def hget(self, key, field):
+        self._check()
+        return self.hashes.get(key, {}).get(field)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def delete(self, key):
+        self._check()
+        self.hashes.pop(key, None)
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+@pytest.fixture
+def user_manager(redis_client):
+    return UserManager(None, redis_client)
+
+
+def permission_row(granted=True):
+    return {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "permission_id": uuid4(),
+        "granted": granted,
+        "granted_by": None,
+        "reason": None,
+        "expires_at": None,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+@pytest.mark.asyncio
+class TestPermissionCache:
+    """Test permission check caching and invalidation."""
+
+    async def test_miss_queries_database_and_fills_cache(self, user_manager, redis_client):
+        """A miss reads the database and caches the result with the TTL."""
+        user_id = uuid4()
+        conn = FakeConnection(row={"has_permission": True, "overridden": False, "reason": None})
+
+        check = await user_manager.check_permission(user_id, "chat", conn=conn)
+
+        assert check.has_permission is True
+        assert check.reason == "Role-based permission"
+        assert len(conn.queries) == 1
+        assert json.loads(redis_client.hashes[f"perm:{user_id}"]["chat"]) == [True, "Role-based permission"]
+        assert redis_client.ttls[f"perm:{user_id}"] == UserManager.PERMISSION_CACHE_TTL
+
+    async def test_hit_skips_database(self, user_manager, redis_client):
+        """A cached decision is returned without querying."""
+        user_id = uuid4()
+        redis_client.hashes[f"perm:{user_id}"] = {"chat": json.dumps([False, "Permission denied"])}
+        conn = FakeConnection()
+
+        check = await user_manager.check_permission(user_id, "chat", conn=conn)
+
+        assert check.has_permission is False
+        assert check.reason == "Permission denied"
+        assert conn.queries == []
+
+    async def test_list_permissions_cached(self, user_manager, redis_client):
+        """The override list is cached under the "*" field."""
+        user_id = uuid4()
+        conn = FakeConnection(rows=[permission_row()])
+
+        first = await user_manager.list_user_permissions(user_id, conn=conn)
+        second = await user_manager.list_user_permissions(user_id, conn=conn)
+
+        assert len(conn.queries) == 1
+        assert second == first
+
+    async def test_grant_invalidates(self, user_manager, redis_client):
+        """Granting a permission drops the user's cached decisions."""
+        user_id = uuid4()
+        redis_client.hashes[f"perm:{user_id}"] = {"chat": json.dumps([False, "Permission denied"])}
+
+        await user_manager.grant_permission(
+            UserPermissionCreate(user_id=user_id, permission_name="chat"),
+            conn=FakeConnection(row=permission_row())
+        )
+
+        assert f"perm:{user_id}" not in redis_client.hashes
+
+    async def test_revoke_invalidates(self, user_manager, redis_client):
+        """Revoking a permission drops the user's cached decisions."""
+        user_id = uuid4()
+        redis_client.hashes[f"perm:{user_id}"] = {"chat": json.dumps([True, "Role-based permission"])}
+
+        await user_manager.revoke_permission(
+            user_id, "chat", conn=FakeConnection(row=permission_row(granted=False))
+        )
+
+        assert f"perm:{user_id}" not in redis_client.hashes
+
+    async def test_delete_member_invalidates(self, user_manager, redis_client):
+        """A deactivated member does not keep cached permissions."""
+        member_id = uuid4()
+        redis_client.hashes[f"perm:{member_id}"] = {"chat": json.dumps([True, "Role-based permission"])}
+
+        deleted = await user_manager.delete_family_member(member_id, conn=FakeConnection())
+
+        assert deleted is True
+        assert f"perm:{member_id}" not in redis_client.hashes
+
+    async def test_redis_error_falls_back_to_database(self, user_manager, redis_client):
+        """With Redis down, checks are answered from the database."""
+        redis_client.fail = True
+        conn = FakeConnection(row={"has_permission": True, "overridden": True, "reason": "Trusted"})
+
+        check = await user_manager.check_permission(uuid4(), "chat", conn=conn)
+
+        assert check.has_permission is True
+        assert check.reason == "Trusted"
+        assert len(conn.queries) == 1
+
+    async def test_without_redis_client(self):
+        """UserManager works without a Redis client configured."""
+        conn = FakeConnection(row={"has_permission": False, "overridden": False, "reason": None})
+
+        check = await UserManager(None).check_permission(uuid4(), "chat", conn=conn)
+
+        assert check.has_permission is False
+        assert len(conn.queries) == 1
@@ -0,0 +1,155 @@
+"""
+Unit tests for the recent successful password check cache (RecentAuthCache).
+
+Tests:
+- A repeated password inside the TTL matches; other passwords don't
+- Entries expire after the TTL
+- A changed stored hash never matches an old entry
+- verify_password skips the hash for a cached check and rehashes drop it
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import bcrypt
+import pytest
+
+from api.models.user_management import FamilyMember, UserRole
+from api.services import user_manager as user_manager_module
+from api.services.user_manager import RecentAuthCache, UserManager, recent_auth_cache
+from tests.helpers.test_helpers import FakeClock, FakeConnection
+
+STORED_HASH = b"$argon2id$stored"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(user_manager_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def empty_shared_cache():
+    recent_auth_cache.clear()
+    yield
+    recent_auth_cache.clear()
+
+
+def make_member(hashed_password):
+    now = datetime.now(timezone.utc)
+    return FamilyMember(
+        id=uuid4(),
+        first_name="Alex",
+        role=UserRole.PARENT,
+        email="alex@example.com",
+        username="alex@example.com",
+        hashed_password=hashed_password,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class TestRecentAuthCache:
+    """Test matching, TTL and invalidation of RecentAuthCache."""
+
+    def test_same_password_matches(self, clock):
+        """The password that was just verified matches within the TTL."""
+        cache = RecentAuthCache(ttl=60.0)
+        user_id = uuid4()
+        cache.put(user_id, STORED_HASH, b"secret")
+
+        clock.now += 59
+        assert cache.check(user_id, STORED_HASH, b"secret") is True
+
+    def test_other_password_or_user_misses(self, clock):
+        """A different password, or another user, does not match."""
+        cache = RecentAuthCache()
+        user_id = uuid4()
+        cache.put(user_id, STORED_HASH, b"secret")
+
+        assert cache.check(user_id, STORED_HASH, b"wrong") is False
+        assert cache.check(uuid4(), STORED_HASH, b"secret") is False
+
+    def test_expires_after_ttl(self, clock):
+        """An entry past its TTL is a miss and is removed."""
+        cache = RecentAuthCache(ttl=60.0)
+        user_id = uuid4()
+        cache.put(user_id, STORED_HASH, b"secret")
+
+        clock.now += 61
+        assert cache.check(user_id, STORED_HASH, b"secret") is False
+        assert len(cache._entries) == 0
+
+    def test_changed_hash_misses(self, clock):
+        """After the stored hash changes, the old password check is not reused."""
+        cache = RecentAuthCache()
+        user_id = uuid4()
+        cache.put(user_id, STORED_HASH, b"secret")
+
+        assert cache.check(user_id, b"$argon2id$changed", b"secret") is False
+
+    def test_invalidate(self, clock):
+        """invalidate() drops the user's entry."""
+        cache = RecentAuthCache()
+        user_id = uuid4()
+        cache.put(user_id, STORED_HASH, b"secret")
+
+        cache.invalidate(user_id)
+
+        assert cache.check(user_id, STORED_HASH, b"secret") is False
+
+    def test_bounded_to_maxsize(self, clock):
+        """The oldest entry is evicted once maxsize is exceeded."""
+        cache = RecentAuthCache(maxsize=2)
+        users = [uuid4() for _ in range(3)]
+        for user_id in users:
+            cache.put(user_id, STORED_HASH, b"secret")
+
+        assert cache.check(users[0], STORED_HASH, b"secret") is False
+        assert cache.check(users[2], STORED_HASH, b"secret") is True
+
+    def test_no_plaintext_kept(self, clock):
+        """Only a keyed fingerprint is stored, not the password."""
+        cache = RecentAuthCache()
+        user_id = uuid4()
+        cache.put(user_id, STORED_HASH, b"secret")
+
+        _, fingerprint = cache._entries[user_id]
+        assert b"secret" not in fingerprint
+
+
+@pytest.mark.asyncio
+class TestVerifyPasswordCache:
+    """Test UserManager.verify_password against the shared cache."""
+
+    async def test_repeat_login_skips_hash(self, monkeypatch):
+        """A second verification of the same password does not hash again."""
+        member = make_member(bcrypt.hashpw(b"secret", bcrypt.gensalt(4)).decode("ascii"))
+        user_manager = UserManager(None)
+        assert await user_manager.verify_password(member, "secret") is True
+
+        async def fail_checkpw(password, hashed):
+            raise AssertionError("password was hashed again")
+
+        monkeypatch.setattr(user_manager_module, "_checkpw", fail_checkpw)
+        assert await user_manager.verify_password(member, "secret") is True
+
+    async def test_wrong_password_not_cached(self):
+        """A failed verification leaves nothing to match."""
+        member = make_member(bcrypt.hashpw(b"secret", bcrypt.gensalt(4)).decode("ascii"))
+
+        assert await UserManager(None).verify_password(member, "wrong") is False
+        assert len(recent_auth_cache._entries) == 0
+
+    async def test_rehash_drops_entry(self):
+        """Replacing the stored hash drops the user's cached check."""
+        member = make_member(bcrypt.hashpw(b"secret", bcrypt.gensalt(4)).decode("ascii"))
+        user_manager = UserManager(None)
+        await user_manager.verify_password(member, "secret")
+
+        await user_manager.update_password_hash(
+            member, member.hashed_password, "$argon2id$new", conn=FakeConnection()
+        )
+
+        assert member.id not in recent_auth_cache._entries
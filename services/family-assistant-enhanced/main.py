@@ -3,18 +3,29 @@ Enhanced Family AI Platform - Complete Implementation
 Integrates all new capabilities with existing Family Assistant service
 """
 
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import List, Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from typing import List, Optional, Dict, Any, Tuple
 import asyncio
+import gzip
 import json
 import logging
+import random
+import re
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 import uuid
 import aiofiles
+import httpx
+import orjson
 import os
 
 # Configure logging
@@ -26,39 +37,123 @@ app = FastAPI(
     description="Private bilingual family assistant with Home Assistant, Matrix, and voice integration",
     version="3.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
-# CORS configuration
+# CORS configuration: explicit origins (comma-separated CORS_ORIGINS) instead
+# of "*", which can't be combined with credentials anyway
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "CORS_ORIGINS",
+        "https://family-assistant.homelab.pesulabs.net,http://localhost:5173,http://localhost:3000",
+    ).split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (device lists, dashboards, automations)
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+class StaticJSON:
+    """A never-changing JSON payload, encoded and gzipped once at import
+
+    GZipMiddleware passes responses that already carry Content-Encoding
+    through untouched, so static endpoints skip per-request compression.
+    """
+
+    def __init__(self, payload: Any):
+        self.body = orjson.dumps(payload)
+        self.gzipped = gzip.compress(self.body, compresslevel=9)
+
+    def response(self, request: Request) -> Response:
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            return Response(
+                content=self.gzipped,
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
+        return Response(content=self.body, media_type="application/json")
+
+# Random UUIDs are cut from one os.urandom() read per UUID_BATCH_SIZE ids
+# instead of one read per id. The pool starts empty in every process, so
+# workers never share ids.
+UUID_BATCH_SIZE = 256
+_uuid_pool: List[uuid.UUID] = []
+
+def _new_uuid() -> uuid.UUID:
+    """uuid4-equivalent random UUID"""
+    if not _uuid_pool:
+        raw = os.urandom(16 * UUID_BATCH_SIZE)
+        _uuid_pool.extend(
+            uuid.UUID(bytes=raw[i:i + 16], version=4) for i in range(0, len(raw), 16)
+        )
+    return _uuid_pool.pop()
+
+# Database connection pool
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """Process-wide pooled async engine for the existing PostgreSQL database"""
+    url = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return create_async_engine(
+        url,
+        pool_size=25,
+        max_overflow=0,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+
+@lru_cache(maxsize=1)
+def get_session_factory() -> async_sessionmaker:
+    return async_sessionmaker(get_engine(), expire_on_commit=False)
+
+async def get_async_db():
+    """FastAPI dependency yielding an AsyncSession from the shared pool"""
+    async with get_session_factory()() as session:
+        yield session
+
 # Database connection test
 async def test_database_connection():
     """Test if we can connect to the existing PostgreSQL database"""
+    if not DATABASE_URL:
+        return False
     try:
-        # This will be replaced with actual database connection
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         return False
 
+@app.on_event("shutdown")
+async def close_database_pool():
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
+
 # Health check endpoints
-@app.get("/health")
-async def health_check():
-    """Enhanced health check showing all services status"""
-    return {
+
+# Pre-encoded health bodies, one per database state; only the timestamp
+# placeholder is substituted per probe
+_HEALTH_TIMESTAMP = b'"__TS__"'
+
+def _health_template(database_status: str) -> bytes:
+    return orjson.dumps({
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": "__TS__",
         "version": "3.0.0",
         "services": {
             "family_assistant": "✅ Operational",
-            "database": "✅ Connected" if await test_database_connection() else "❌ Disconnected",
+            "database": database_status,
             "home_assistant": "🆕 Ready for integration",
             "matrix_integration": "🆕 Ready for integration",
             "voice_service": "🆕 Enhanced with Whisper",
@@ -68,29 +163,55 @@ async def health_check():
             "mem0": "✅ Memory layer active",
             "qdrant": "✅ Vector database ready"
         }
-    }
+    })
+
+_HEALTH_CONNECTED = _health_template("✅ Connected")
+_HEALTH_DISCONNECTED = _health_template("❌ Disconnected")
+
+@app.get("/health")
+async def health_check():
+    """Enhanced health check showing all services status"""
+    body = _HEALTH_CONNECTED if await test_database_connection() else _HEALTH_DISCONNECTED
+    timestamp = b'"' + datetime.utcnow().isoformat().encode() + b'"'
+    return Response(content=body.replace(_HEALTH_TIMESTAMP, timestamp, 1), media_type="application/json")
+
+ROOT_INFO = {
+    "message": "Enhanced Family AI Platform v3.0.0",
+    "description": "Private bilingual family assistant with smart home integration",
+    "features": [
+        "Bilingual Spanish/English support",
+        "Home Assistant integration",
+        "Matrix secure messaging",
+        "Enhanced voice recognition",
+        "Parental controls",
+        "Family role management"
+    ],
+    "docs": "/docs",
+    "health": "/health"
+}
+_ROOT_INFO_JSON = StaticJSON(ROOT_INFO)
 
 @app.get("/")
-async def root():
-    return {
-        "message": "Enhanced Family AI Platform v3.0.0",
-        "description": "Private bilingual family assistant with smart home integration",
-        "features": [
-            "Bilingual Spanish/English support",
-            "Home Assistant integration",
-            "Matrix secure messaging",
-            "Enhanced voice recognition",
-            "Parental controls",
-            "Family role management"
-        ],
-        "docs": "/docs",
-        "health": "/health"
-    }
+async def root(request: Request):
+    return _ROOT_INFO_JSON.response(request)
 
 # Family Management Endpoints
-@app.get("/api/v3/family-members")
-async def list_family_members():
-    """List all family members with their roles and settings"""
+
+# Demo roster payloads are rebuilt at most once per TTL window (their
+# last_interaction values are relative to now) instead of on every request
+ROSTER_TTL_SECONDS = 30
+
+def _ttl_bucket() -> int:
+    return int(time.monotonic() // ROSTER_TTL_SECONDS)
+
+@lru_cache(maxsize=1)
+def _family_roster(bucket: int) -> Dict[str, Any]:
+    """Family member list payload for one TTL window
+
+    last_interaction is pre-serialized to ISO strings against a single
+    ``now`` so responses don't format datetimes per request.
+    """
+    now = datetime.now()
     return {
         "family_members": [
             {
@@ -101,7 +222,7 @@ async def list_family_members():
                 "language_preference": "es",
                 "status": "active",
                 "parental_controls_enabled": False,
-                "last_interaction": datetime.now() - timedelta(hours=2),
+                "last_interaction": (now - timedelta(hours=2)).isoformat(),
                 "permissions": ["full_access", "parental_controls", "device_control"]
             },
             {
@@ -112,7 +233,7 @@ async def list_family_members():
                 "language_preference": "es/en",
                 "status": "active",
                 "parental_controls_enabled": True,
-                "last_interaction": datetime.now() - timedelta(minutes=30),
+                "last_interaction": (now - timedelta(minutes=30)).isoformat(),
                 "permissions": ["chat_access", "limited_device_control"]
             },
             {
@@ -123,7 +244,7 @@ async def list_family_members():
                 "language_preference": "es",
                 "status": "active",
                 "parental_controls_enabled": True,
-                "last_interaction": datetime.now() - timedelta(hours=1),
+                "last_interaction": (now - timedelta(hours=1)).isoformat(),
                 "permissions": ["chat_access", "educational_content_only"]
             },
             {
@@ -134,7 +255,7 @@ async def list_family_members():
                 "language_preference": "es",
                 "status": "active",
                 "parental_controls_enabled": False,
-                "last_interaction": datetime.now() - timedelta(hours=6),
+                "last_interaction": (now - timedelta(hours=6)).isoformat(),
                 "permissions": ["chat_access", "voice_interaction", "simplified_interface"]
             }
         ],
@@ -142,6 +263,26 @@ async def list_family_members():
         "active_members": 4
     }
 
+@lru_cache(maxsize=1)
+def _family_member_index(bucket: int) -> Dict[int, Dict[str, Any]]:
+    return {m["id"]: m for m in _family_roster(bucket)["family_members"]}
+
+FAMILY_ROLES = ("parent", "teenager", "child", "grandparent")
+_VALID_ROLES = frozenset(FAMILY_ROLES)
+
+_PERMISSIONS_MAP = MappingProxyType({
+    "parent": ("full_access", "parental_controls", "device_control", "user_management"),
+    "teenager": ("chat_access", "limited_device_control", "social_features"),
+    "child": ("chat_access", "educational_content_only", "limited_time"),
+    "grandparent": ("chat_access", "voice_interaction", "simplified_interface", "family_updates")
+})
+_DEFAULT_PERMISSIONS = ("chat_access",)
+
+@app.get("/api/v3/family-members")
+async def list_family_members():
+    """List all family members with their roles and settings"""
+    return _family_roster(_ttl_bucket())
+
 @app.post("/api/v3/family-members")
 async def create_family_member(member_data: Dict[str, Any]):
     """Create a new family member with role-based access"""
@@ -151,20 +292,22 @@ async def create_family_member(member_data: Dict[str, Any]):
             raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
 
     # Validate role
-    valid_roles = ["parent", "teenager", "child", "grandparent"]
-    if member_data["role"] not in valid_roles:
-        raise HTTPException(status_code=400, detail=f"Invalid role. Must be one of: {valid_roles}")
+    if member_data["role"] not in _VALID_ROLES:
+        raise HTTPException(status_code=400, detail=f"Invalid role. Must be one of: {list(FAMILY_ROLES)}")
 
-    # Create new family member
+    # Create new family member. The id is a random UUID rather than the next
+    # integer after the roster: each worker process would count on its own,
+    # so counters collide across workers until ids come from a database
+    # sequence
     new_member = {
-        "id": max([m["id"] for m in (await list_family_members())["family_members"]]) + 1,
+        "id": str(_new_uuid()),
         "name": member_data["name"],
         "role": member_data["role"],
         "age": member_data["age"],
         "language_preference": member_data.get("language_preference", "es"),
         "status": "active",
         "parental_controls_enabled": member_data.get("parental_controls_enabled", False),
-        "created_at": datetime.utcnow().isoformat(),
+        "created_at": datetime.utcnow(),
         "last_interaction": None,
         "permissions": get_default_permissions(member_data["role"])
     }
@@ -172,55 +315,73 @@ async def create_family_member(member_data: Dict[str, Any]):
     logger.info(f"Created new family member: {new_member['name']} ({new_member['role']})")
     return {"message": "Family member created successfully", "member": new_member}
 
-def get_default_permissions(role: str) -> List[str]:
+def get_default_permissions(role: str) -> Tuple[str, ...]:
     """Get default permissions based on family role"""
-    permissions_map = {
-        "parent": ["full_access", "parental_controls", "device_control", "user_management"],
-        "teenager": ["chat_access", "limited_device_control", "social_features"],
-        "child": ["chat_access", "educational_content_only", "limited_time"],
-        "grandparent": ["chat_access", "voice_interaction", "simplified_interface", "family_updates"]
-    }
-    return permissions_map.get(role, ["chat_access"])
+    return _PERMISSIONS_MAP.get(role, _DEFAULT_PERMISSIONS)
 
 # Bilingual Support Endpoints
+BILINGUAL_STATUS = {
+    "enabled": True,
+    "supported_languages": ["es", "en"],
+    "default_language": "es",
+    "auto_detect": True,
+    "code_switching": True,
+    "cultural_context": {
+        "region": "mexico",
+        "formality_level": "familial",
+        "common_expressions": [
+            "¿Mijo?", "¿Mija?", "Órale", "Qué onda",
+            "Está bien", "Con permiso", "Por favor", "Gracias"
+        ],
+        "family_terms": [
+            "Papá", "Mamá", "Abuelo/a", "Hermano/a", "Primo/a"
+        ]
+    },
+    "language_models": {
+        "es": "Spanish with Mexican cultural context",
+        "en": "English with Spanish language support"
+    },
+    "detection_accuracy": 0.95
+}
+_BILINGUAL_STATUS_JSON = StaticJSON(BILINGUAL_STATUS)
+
 @app.get("/api/v3/bilingual/status")
-async def get_bilingual_status():
+async def get_bilingual_status(request: Request):
     """Get bilingual system status and configuration"""
-    return {
-        "enabled": True,
-        "supported_languages": ["es", "en"],
-        "default_language": "es",
-        "auto_detect": True,
-        "code_switching": True,
-        "cultural_context": {
-            "region": "mexico",
-            "formality_level": "familial",
-            "common_expressions": [
-                "¿Mijo?", "¿Mija?", "Órale", "Qué onda",
-                "Está bien", "Con permiso", "Por favor", "Gracias"
-            ],
-            "family_terms": [
-                "Papá", "Mamá", "Abuelo/a", "Hermano/a", "Primo/a"
-            ]
-        },
-        "language_models": {
-            "es": "Spanish with Mexican cultural context",
-            "en": "English with Spanish language support"
-        },
-        "detection_accuracy": 0.95
-    }
+    return _BILINGUAL_STATUS_JSON.response(request)
 
-@app.post("/api/v3/bilingual/detect-language")
-async def detect_language(text: str):
-    """Detect language and cultural context of input text"""
+SPANISH_INDICATORS = ("¿", "ñ", "ó", "í", "é", "á", "ú", "mijo", "mija", "¿que", "como estas")
+ENGLISH_INDICATORS = ("what's", "how are", "hello", "hey", "what's up", "good morning")
+
+def _indicator_scanner(indicators):
+    """Compile indicators into one regex pass plus a containment table
+
+    The lookahead finds the longest indicator starting at every position;
+    shorter indicators hidden inside a match (e.g. "¿" in "¿que") are
+    recovered from the table, so the score is still the number of distinct
+    indicators present.
+    """
+    by_length = sorted(indicators, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, by_length)) + "))")
+    contained = {i: frozenset(j for j in indicators if j in i) for i in indicators}
+    return pattern, contained
+
+def _count_indicators(scanner, text: str) -> int:
+    pattern, contained = scanner
+    found = set()
+    for match in pattern.findall(text):
+        found |= contained[match]
+    return len(found)
+
+_SPANISH_SCANNER = _indicator_scanner(SPANISH_INDICATORS)
+_ENGLISH_SCANNER = _indicator_scanner(ENGLISH_INDICATORS)
+
+def _detect(text: str) -> Dict[str, Any]:
     text_lower = text.lower()
 
     # Simple language detection based on keywords
-    spanish_indicators = ["¿", "ñ", "ó", "í", "é", "á", "ú", "mijo", "mija", "¿que", "como estas"]
-    english_indicators = ["what's", "how are", "hello", "hey", "what's up", "good morning"]
-
-    spanish_score = sum(1 for indicator in spanish_indicators if indicator in text_lower)
-    english_score = sum(1 for indicator in english_indicators if indicator in text_lower)
+    spanish_score = _count_indicators(_SPANISH_SCANNER, text_lower)
+    english_score = _count_indicators(_ENGLISH_SCANNER, text_lower)
 
     if spanish_score > english_score:
         detected = "es"
@@ -240,7 +401,70 @@ async def detect_language(text: str):
         "suggested_response_language": detected
     }
 
+@app.post("/api/v3/bilingual/detect-language")
+async def detect_language(text: str):
+    """Detect language and cultural context of input text"""
+    return _detect(text)
+
+@app.post("/api/v3/bilingual/detect-language/batch")
+async def detect_languages_batch(texts: List[str]):
+    """Detect language for many texts (e.g. stored conversation history) in one call"""
+    if len(texts) > 1000:
+        raise HTTPException(status_code=400, detail="Too many texts (max 1000)")
+    return {"results": [_detect(text) for text in texts]}
+
 # Voice Enhancement Endpoints
+WHISPER_URL = os.getenv("WHISPER_URL", "").rstrip("/")
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for outbound calls to the voice backends"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=10.0,
+    )
+
+@app.on_event("shutdown")
+async def close_http_client():
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+
+def _upload_size(upload: UploadFile) -> int:
+    """Byte size of an upload, read from its spooled file without loading it"""
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
+
+_ES_TRANSCRIPTS = (
+    "Hola familia, ¿cómo están todos?",
+    "Mamá, ¿ya está lista la comida?",
+    "¿Puedo salir a jugar con mis amigos?",
+    "Abuelo, ¿me cuentas un cuento por favor?",
+    "¿Qué vamos a hacer este fin de semana?"
+)
+_EN_TRANSCRIPTS = (
+    "Hello family, how is everyone doing?",
+    "Mom, is dinner ready yet?",
+    "Can I go play with my friends?",
+    "Grandpa, can you tell me a story please?",
+    "What are we doing this weekend?"
+)
+# Canned replies by intent; when several match, the earliest in
+# _INTENT_PRIORITY wins
+_INTENT_RE = re.compile(r"(?P<greeting>hola|hello)|(?P<food>comida|food)|(?P<homework>tarea|homework)", re.I)
+_INTENT_PRIORITY = ("greeting", "food", "homework")
+_INTENT_RESPONSES = {
+    "greeting": "¡Hola! ¿Cómo estás hoy? ¿En qué puedo ayudarte?",
+    "food": "La comida estará lista en aproximadamente 30 minutos. ¿Tienes hambre?",
+    "homework": "Recuerda hacer tu tarea antes de jugar. ¿Necesitas ayuda con algo?"
+}
+_AI_FALLBACK_RESPONSES = (
+    "Entendido. ¿Hay algo más en lo que pueda ayudarte?",
+    "Claro, estoy aquí para ti y toda la familia.",
+    "¿Cómo te sientes con eso? Quiero saber de ti."
+)
+
 @app.post("/api/v3/voice/speech-to-text")
 async def speech_to_text(
     audio_file: UploadFile = File(...),
@@ -255,47 +479,123 @@ async def speech_to_text(
         if not audio_file.content_type.startswith('audio/'):
             raise HTTPException(status_code=400, detail="File must be an audio file")
 
-        # Read audio content
-        audio_content = await audio_file.read()
-
-        # Simulate Whisper processing (would integrate with existing Whisper service)
-        await asyncio.sleep(0.5)  # Simulate processing time
-
-        # Demo transcriptions based on language
-        if language == "es":
-            transcriptions = [
-                "Hola familia, ¿cómo están todos?",
-                "Mamá, ¿ya está lista la comida?",
-                "¿Puedo salir a jugar con mis amigos?",
-                "Abuelo, ¿me cuentas un cuento por favor?",
-                "¿Qué vamos a hacer este fin de semana?"
-            ]
+        # Only the size is needed for now; don't pull the upload into memory
+        audio_size = _upload_size(audio_file)
+
+        if WHISPER_URL:
+            # Stream the spooled upload to the existing Whisper service
+            response = await get_http_client().post(
+                f"{WHISPER_URL}/asr",
+                params={"task": "transcribe", "language": language, "output": "json"},
+                files={"audio_file": (audio_file.filename, audio_file.file, audio_file.content_type)},
+            )
+            response.raise_for_status()
+            transcription = response.json()["text"].strip()
         else:
-            transcriptions = [
-                "Hello family, how is everyone doing?",
-                "Mom, is dinner ready yet?",
-                "Can I go play with my friends?",
-                "Grandpa, can you tell me a story please?",
-                "What are we doing this weekend?"
-            ]
+            # Simulate Whisper processing when no Whisper service is configured
+            await asyncio.sleep(0.5)  # Simulate processing time
 
-        import random
-        transcription = random.choice(transcriptions)
+            # Demo transcriptions based on language
+            transcription = random.choice(_ES_TRANSCRIPTS if language == "es" else _EN_TRANSCRIPTS)
 
         return {
             "transcription": transcription,
             "confidence": 0.94,
             "language_detected": language,
-            "duration_seconds": len(audio_content) / 16000,  # Rough estimate
+            "duration_seconds": audio_size / 16000,  # Rough estimate
             "family_member_id": family_member_id,
             "cultural_context": "mexican_family" if language == "es" else "english_speaking",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
 
     except Exception as e:
         logger.error(f"Speech to text error: {e}")
         raise HTTPException(status_code=500, detail=f"Speech processing failed: {str(e)}")
 
+# TTS batching: requests arriving within one window are grouped by
+# (language, voice_type) and synthesized with one backend call per group
+TTS_BATCH_WINDOW_SECONDS = 0.02
+_tts_queue: Optional[asyncio.Queue] = None
+_tts_tasks: set = set()
+
+async def _synthesize_batch(language: str, voice_type: str, texts: List[str]) -> List[str]:
+    """Synthesize a group of texts in one backend call; returns audio URLs"""
+    # Simulate TTS processing
+    await asyncio.sleep(0.3)
+
+    # Generate demo audio URLs
+    return [f"/api/v3/voice/audio/{_new_uuid()}.wav" for _ in texts]
+
+def _fail_pending(futures, exc: BaseException) -> None:
+    for future in futures:
+        if not future.done():
+            future.set_exception(exc)
+
+def _tts_stopped() -> RuntimeError:
+    return RuntimeError("Text-to-speech batcher stopped")
+
+async def _run_tts_group(language: str, voice_type: str, items: List[tuple]) -> None:
+    try:
+        urls = await _synthesize_batch(language, voice_type, [tts_text for tts_text, _ in items])
+    except asyncio.CancelledError:
+        _fail_pending((future for _, future in items), _tts_stopped())
+        raise
+    except Exception as e:
+        _fail_pending((future for _, future in items), e)
+        return
+    for (_, future), url in zip(items, urls):
+        if not future.done():
+            future.set_result(url)
+
+async def _tts_batch_worker() -> None:
+    while True:
+        batch = [await _tts_queue.get()]
+        try:
+            await asyncio.sleep(TTS_BATCH_WINDOW_SECONDS)
+        except asyncio.CancelledError:
+            _fail_pending((item[-1] for item in batch), _tts_stopped())
+            raise
+        while not _tts_queue.empty():
+            batch.append(_tts_queue.get_nowait())
+
+        groups: Dict[tuple, List[tuple]] = {}
+        for tts_text, language, voice_type, future in batch:
+            groups.setdefault((language, voice_type), []).append((tts_text, future))
+        for (language, voice_type), items in groups.items():
+            task = asyncio.create_task(_run_tts_group(language, voice_type, items))
+            _tts_tasks.add(task)
+            task.add_done_callback(_tts_tasks.discard)
+
+async def _submit_tts(text: str, language: str, voice_type: str) -> str:
+    if _tts_queue is None:
+        # Batcher not running (e.g. app used without startup events)
+        return (await _synthesize_batch(language, voice_type, [text]))[0]
+    future = asyncio.get_running_loop().create_future()
+    await _tts_queue.put((text, language, voice_type, future))
+    return await future
+
+@app.on_event("startup")
+async def start_tts_batcher():
+    global _tts_queue
+    _tts_queue = asyncio.Queue()
+    task = asyncio.create_task(_tts_batch_worker())
+    _tts_tasks.add(task)
+    task.add_done_callback(_tts_tasks.discard)
+
+@app.on_event("shutdown")
+async def stop_tts_batcher():
+    global _tts_queue
+    queue, _tts_queue = _tts_queue, None
+    tasks = list(_tts_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Fail requests still waiting in the queue instead of leaving them hanging
+    if queue is not None:
+        while not queue.empty():
+            _fail_pending([queue.get_nowait()[-1]], _tts_stopped())
+
 @app.post("/api/v3/voice/text-to-speech")
 async def text_to_speech(
     text: str,
@@ -310,12 +610,8 @@ async def text_to_speech(
         if len(text) > 500:
             raise HTTPException(status_code=400, detail="Text too long (max 500 characters)")
 
-        # Simulate TTS processing
-        await asyncio.sleep(0.3)
-
-        # Generate demo audio URL
-        audio_id = str(uuid.uuid4())
-        audio_url = f"/api/v3/voice/audio/{audio_id}.wav"
+        # Synthesized together with other requests from the same window
+        audio_url = await _submit_tts(text, language, voice_type)
 
         # Estimate duration based on text length
         duration_ms = len(text) * 100  # Rough estimate: 100ms per character
@@ -328,17 +624,44 @@ async def text_to_speech(
             "duration_ms": duration_ms,
             "family_member_id": family_member_id,
             "cultural_pronunciation": "mexican" if language == "es" else "american",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
 
     except Exception as e:
         logger.error(f"Text to speech error: {e}")
         raise HTTPException(status_code=500, detail=f"Speech synthesis failed: {str(e)}")
 
+# Conversation response cache: normalized utterance -> (reply, TTS result)
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL_SECONDS = 300
+_response_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_WORD_RE = re.compile(r"\w+")
+
+def _utterance_key(text: str) -> str:
+    """Case-, punctuation- and spacing-insensitive form of an utterance"""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+def _response_cache_get(key: str) -> Optional[tuple]:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        del _response_cache[key]
+        return None
+    _response_cache.move_to_end(key)
+    return value
+
+def _response_cache_put(key: str, value: tuple) -> None:
+    _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL_SECONDS, value)
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
 @app.post("/api/v3/voice/conversation")
 async def voice_conversation(
-    audio_file: UploadFile = File(...),
     family_member_id: int,
+    audio_file: UploadFile = File(...),
     conversation_context: Optional[str] = None
 ):
     """
@@ -349,34 +672,34 @@ async def voice_conversation(
         stt_result = await speech_to_text(audio_file, family_member_id=family_member_id)
         user_text = stt_result["transcription"]
 
-        # Step 2: Generate AI response (simplified for demo)
-        await asyncio.sleep(0.5)
-
-        # Contextual responses based on family role
-        if "hola" in user_text.lower() or "hello" in user_text.lower():
-            ai_response = "¡Hola! ¿Cómo estás hoy? ¿En qué puedo ayudarte?"
-        elif "comida" in user_text.lower() or "food" in user_text.lower():
-            ai_response = "La comida estará lista en aproximadamente 30 minutos. ¿Tienes hambre?"
-        elif "tarea" in user_text.lower() or "homework" in user_text.lower():
-            ai_response = "Recuerda hacer tu tarea antes de jugar. ¿Necesitas ayuda con algo?"
+        # Repeated utterances reuse the earlier reply and its synthesized audio
+        cache_key = _utterance_key(user_text)
+        cached = _response_cache_get(cache_key)
+        if cached is not None:
+            ai_response, tts_result = cached
+            tts_result = {**tts_result, "family_member_id": family_member_id}
         else:
-            ai_responses = [
-                "Entendido. ¿Hay algo más en lo que pueda ayudarte?",
-                "Claro, estoy aquí para ti y toda la familia.",
-                "¿Cómo te sientes con eso? Quiero saber de ti."
-            ]
-            import random
-            ai_response = random.choice(ai_responses)
-
-        # Step 3: Convert AI response to speech
-        tts_result = await text_to_speech(
-            text=ai_response,
-            language="es",  # Default to Spanish for family context
-            family_member_id=family_member_id
-        )
+            # Step 2: Generate AI response (simplified for demo)
+            await asyncio.sleep(0.5)
+
+            # Contextual responses based on family role
+            intents = {m.lastgroup for m in _INTENT_RE.finditer(user_text)}
+            intent = next((i for i in _INTENT_PRIORITY if i in intents), None)
+            if intent is not None:
+                ai_response = _INTENT_RESPONSES[intent]
+            else:
+                ai_response = random.choice(_AI_FALLBACK_RESPONSES)
+
+            # Step 3: Convert AI response to speech
+            tts_result = await text_to_speech(
+                text=ai_response,
+                language="es",  # Default to Spanish for family context
+                family_member_id=family_member_id
+            )
+            _response_cache_put(cache_key, (ai_response, tts_result))
 
         return {
-            "conversation_id": str(uuid.uuid4()),
+            "conversation_id": str(_new_uuid()),
             "user_input": {
                 "transcription": user_text,
                 "language": stt_result["language_detected"],
@@ -389,7 +712,7 @@ async def voice_conversation(
             },
             "audio_response": tts_result,
             "family_member_id": family_member_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
 
     except Exception as e:
@@ -397,82 +720,89 @@ async def voice_conversation(
         raise HTTPException(status_code=500, detail=f"Voice conversation failed: {str(e)}")
 
 # Home Assistant Integration Endpoints
-@app.get("/api/v3/home-assistant/devices")
-async def list_home_assistant_devices():
-    """List available Home Assistant devices"""
-    return {
-        "devices": [
-            {
-                "id": "light.sala_principal",
-                "name": "Luz Sala Principal",
-                "type": "light",
-                "status": "on",
-                "brightness": 80,
-                "capabilities": ["on_off", "brightness", "color"],
-                "room": "sala",
-                "family_control": "parent"
-            },
-            {
-                "id": "light.cocina",
-                "name": "Luz Cocina",
-                "type": "light",
-                "status": "on",
-                "brightness": 100,
-                "capabilities": ["on_off", "brightness"],
-                "room": "cocina",
-                "family_control": "parent"
-            },
-            {
-                "id": "thermostat.living_room",
-                "name": "Termostato Sala",
-                "type": "climate",
-                "status": "22°C",
-                "target_temp": 22,
-                "mode": "heat",
-                "capabilities": ["temperature", "mode"],
-                "room": "sala",
-                "family_control": "parent"
-            },
-            {
-                "id": "camera.puerta_entrada",
-                "name": "Cámara Puerta",
-                "type": "camera",
-                "status": "recording",
-                "motion_detected": False,
-                "capabilities": ["stream", "recording", "motion"],
-                "room": "entrada",
-                "family_control": "parent"
-            },
-            {
-                "id": "lock.puerta_principal",
-                "name": "Cerradura Puerta Principal",
-                "type": "lock",
-                "status": "locked",
-                "battery": 85,
-                "capabilities": ["lock", "unlock", "battery"],
-                "room": "entrada",
-                "family_control": "parent"
-            },
-            {
-                "id": "speaker.sala",
-                "name": "Bocina Sala",
-                "type": "media_player",
-                "status": "idle",
-                "volume": 50,
-                "capabilities": ["play", "pause", "volume", "source"],
-                "room": "sala",
-                "family_control": "teenager"
-            }
-        ],
-        "total_devices": 6,
-        "rooms": ["sala", "cocina", "entrada"],
-        "categories": {
-            "lights": 2,
-            "climate": 1,
-            "security": 2,
-            "media": 1
+
+# Static demo device list, served as-is and indexed by id for control calls
+HOME_ASSISTANT_DEVICES = {
+    "devices": [
+        {
+            "id": "light.sala_principal",
+            "name": "Luz Sala Principal",
+            "type": "light",
+            "status": "on",
+            "brightness": 80,
+            "capabilities": ["on_off", "brightness", "color"],
+            "room": "sala",
+            "family_control": "parent"
+        },
+        {
+            "id": "light.cocina",
+            "name": "Luz Cocina",
+            "type": "light",
+            "status": "on",
+            "brightness": 100,
+            "capabilities": ["on_off", "brightness"],
+            "room": "cocina",
+            "family_control": "parent"
+        },
+        {
+            "id": "thermostat.living_room",
+            "name": "Termostato Sala",
+            "type": "climate",
+            "status": "22°C",
+            "target_temp": 22,
+            "mode": "heat",
+            "capabilities": ["temperature", "mode"],
+            "room": "sala",
+            "family_control": "parent"
+        },
+        {
+            "id": "camera.puerta_entrada",
+            "name": "Cámara Puerta",
+            "type": "camera",
+            "status": "recording",
+            "motion_detected": False,
+            "capabilities": ["stream", "recording", "motion"],
+            "room": "entrada",
+            "family_control": "parent"
+        },
+        {
+            "id": "lock.puerta_principal",
+            "name": "Cerradura Puerta Principal",
+            "type": "lock",
+            "status": "locked",
+            "battery": 85,
+            "capabilities": ["lock", "unlock", "battery"],
+            "room": "entrada",
+            "family_control": "parent"
+        },
+        {
+            "id": "speaker.sala",
+            "name": "Bocina Sala",
+            "type": "media_player",
+            "status": "idle",
+            "volume": 50,
+            "capabilities": ["play", "pause", "volume", "source"],
+            "room": "sala",
+            "family_control": "teenager"
         }
+    ],
+    "total_devices": 6,
+    "rooms": ["sala", "cocina", "entrada"],
+    "categories": {
+        "lights": 2,
+        "climate": 1,
+        "security": 2,
+        "media": 1
     }
+}
+
+_HOME_ASSISTANT_DEVICES_JSON = StaticJSON(HOME_ASSISTANT_DEVICES)
+_DEVICES_BY_ID = {d["id"]: d for d in HOME_ASSISTANT_DEVICES["devices"]}
+
+@app.get("/api/v3/home-assistant/devices")
+async def list_home_assistant_devices(request: Request):
+    """List available Home Assistant devices"""
+    return _HOME_ASSISTANT_DEVICES_JSON.response(request)
 
 @app.post("/api/v3/home-assistant/devices/{device_id}/control")
 async def control_home_assistant_device(
@@ -484,12 +814,12 @@ async def control_home_assistant_device(
     Control a Home Assistant device with family permission checks
     """
     try:
-        # Get device info
-        devices = await list_home_assistant_devices()
-        device = next((d for d in devices["devices"] if d["id"] == device_id), None)
+        # Get device info (a copy: the shared demo entry must not change)
+        device = _DEVICES_BY_ID.get(device_id)
 
         if not device:
             raise HTTPException(status_code=404, detail=f"Device {device_id} not found")
+        device = dict(device)
 
         # Check family permissions (simplified)
         if device.get("family_control") == "parent":
@@ -528,7 +858,7 @@ async def control_home_assistant_device(
             "device_id": device_id,
             "action": action,
             "new_status": device["status"],
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "controlled_by": family_member_id
         }
 
@@ -536,95 +866,101 @@ async def control_home_assistant_device(
         logger.error(f"Device control error: {e}")
         raise HTTPException(status_code=500, detail=f"Device control failed: {str(e)}")
 
+FAMILY_AUTOMATIONS = {
+    "automations": [
+        {
+            "id": "family_routine_morning",
+            "name": "Rutina Familiar Matutina",
+            "description": "Prepara la casa por la mañana",
+            "enabled": True,
+            "triggers": ["time: 07:00", "weekday"],
+            "actions": [
+                "Turn on kitchen lights",
+                "Set thermostat to 22°C",
+                "Play soft music in living room",
+                "Announce weather and schedule"
+            ]
+        },
+        {
+            "id": "homework_reminder",
+            "name": "Recordatorio de Tarea",
+            "description": "Recuerda a los niños hacer la tarea",
+            "enabled": True,
+            "triggers": ["time: 16:00", "weekday"],
+            "actions": [
+                "Announce homework time",
+                "Turn off TV in kids' room",
+                "Turn on study light"
+            ]
+        },
+        {
+            "id": "bedtime_routine",
+            "name": "Rutina de Dormir",
+            "description": "Prepara la casa para dormir",
+            "enabled": True,
+            "triggers": ["time: 21:00"],
+            "actions": [
+                "Dim all lights to 20%",
+                "Lock all doors",
+                "Set security system",
+                "Turn off entertainment devices"
+            ]
+        }
+    ]
+}
+_FAMILY_AUTOMATIONS_JSON = StaticJSON(FAMILY_AUTOMATIONS)
+
 @app.get("/api/v3/home-assistant/automations")
-async def list_automations():
+async def list_automations(request: Request):
     """List family-focused automations"""
-    return {
-        "automations": [
-            {
-                "id": "family_routine_morning",
-                "name": "Rutina Familiar Matutina",
-                "description": "Prepara la casa por la mañana",
-                "enabled": True,
-                "triggers": ["time: 07:00", "weekday"],
-                "actions": [
-                    "Turn on kitchen lights",
-                    "Set thermostat to 22°C",
-                    "Play soft music in living room",
-                    "Announce weather and schedule"
-                ]
-            },
-            {
-                "id": "homework_reminder",
-                "name": "Recordatorio de Tarea",
-                "description": "Recuerda a los niños hacer la tarea",
-                "enabled": True,
-                "triggers": ["time: 16:00", "weekday"],
-                "actions": [
-                    "Announce homework time",
-                    "Turn off TV in kids' room",
-                    "Turn on study light"
-                ]
-            },
-            {
-                "id": "bedtime_routine",
-                "name": "Rutina de Dormir",
-                "description": "Prepara la casa para dormir",
-                "enabled": True,
-                "triggers": ["time: 21:00"],
-                "actions": [
-                    "Dim all lights to 20%",
-                    "Lock all doors",
-                    "Set security system",
-                    "Turn off entertainment devices"
-                ]
-            }
-        ]
-    }
+    return _FAMILY_AUTOMATIONS_JSON.response(request)
 
 # Matrix Integration Endpoints
+MATRIX_ROOMS = {
+    "rooms": [
+        {
+            "id": "!family_room:matrix.org",
+            "name": "Familia García 🏠",
+            "type": "general",
+            "members": 4,
+            "encrypted": True,
+            "last_activity": "Hace 5 minutos",
+            "unread_count": 2,
+            "description": "Chat general de la familia",
+            "avatar": "🏠"
+        },
+        {
+            "id": "!parents_room:matrix.org",
+            "name": "Sólo Papás 👨‍👩‍👧‍👦",
+            "type": "private",
+            "members": 2,
+            "encrypted": True,
+            "last_activity": "Hace 1 hora",
+            "unread_count": 0,
+            "description": "Coordinación entre los papás",
+            "avatar": "👨‍👩‍👧‍👦"
+        },
+        {
+            "id": "!kids_room:matrix.org",
+            "name": "Chicos Zone 🎮",
+            "type": "kids",
+            "members": 3,
+            "encrypted": True,
+            "last_activity": "Hace 30 minutos",
+            "unread_count": 5,
+            "description": "Chat para los niños con supervisión",
+            "avatar": "🎮"
+        }
+    ],
+    "total_rooms": 3,
+    "active_conversations": 2
+}
+_MATRIX_ROOMS_JSON = StaticJSON(MATRIX_ROOMS)
+
 @app.get("/api/v3/matrix/rooms")
-async def list_matrix_rooms():
+async def list_matrix_rooms(request: Request):
     """List Matrix rooms for family communication"""
-    return {
-        "rooms": [
-            {
-                "id": "!family_room:matrix.org",
-                "name": "Familia García 🏠",
-                "type": "general",
-                "members": 4,
-                "encrypted": True,
-                "last_activity": "Hace 5 minutos",
-                "unread_count": 2,
-                "description": "Chat general de la familia",
-                "avatar": "🏠"
-            },
-            {
-                "id": "!parents_room:matrix.org",
-                "name": "Sólo Papás 👨‍👩‍👧‍👦",
-                "type": "private",
-                "members": 2,
-                "encrypted": True,
-                "last_activity": "Hace 1 hora",
-                "unread_count": 0,
-                "description": "Coordinación entre los papás",
-                "avatar": "👨‍👩‍👧‍👦"
-            },
-            {
-                "id": "!kids_room:matrix.org",
-                "name": "Chicos Zone 🎮",
-                "type": "kids",
-                "members": 3,
-                "encrypted": True,
-                "last_activity": "Hace 30 minutos",
-                "unread_count": 5,
-                "description": "Chat para los niños con supervisión",
-                "avatar": "🎮"
-            }
-        ],
-        "total_rooms": 3,
-        "active_conversations": 2
-    }
+    return _MATRIX_ROOMS_JSON.response(request)
 
 @app.post("/api/v3/matrix/rooms")
 async def create_matrix_room(room_data: Dict[str, Any]):
@@ -636,12 +972,12 @@ async def create_matrix_room(room_data: Dict[str, Any]):
                 raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
 
         new_room = {
-            "id": f"!{uuid.uuid4()}:matrix.org",
+            "id": f"!{_new_uuid()}:matrix.org",
             "name": room_data["name"],
             "type": room_data["type"],
             "members": room_data.get("members", []),
             "encrypted": room_data.get("encrypted", True),
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": datetime.utcnow(),
             "last_activity": "Ahora",
             "unread_count": 0,
             "description": room_data.get("description", "")
@@ -687,7 +1023,7 @@ async def get_parental_controls(family_member_id: int):
                 "weekly_reports": True
             }
         },
-        "last_updated": datetime.utcnow().isoformat()
+        "last_updated": datetime.utcnow()
     }
 
 @app.post("/api/v3/parental-controls/{family_member_id}")
@@ -708,7 +1044,7 @@ async def update_parental_controls(
             "message": "Parental controls updated successfully",
             "family_member_id": family_member_id,
             "updated_sections": list(controls.keys()),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
 
     except Exception as e:
@@ -716,66 +1052,79 @@ async def update_parental_controls(
         raise HTTPException(status_code=500, detail=f"Update failed: {str(e)}")
 
 # Dashboard Endpoints
+
+# Widgets and analytics are the same for every member; only the member
+# object changes, so the dashboard body is spliced from pre-encoded parts
+DASHBOARD_SECTIONS = {
+    "widgets": {
+        "overview": {
+            "title": "Bienvenido/a a la Familia",
+            "type": "welcome",
+            "data": {
+                "greeting": "¡Hola! ¿Cómo estás hoy?",
+                "family_status": "Todos activos",
+                "weather": "22°C, soleado",
+                "schedule": "Escuela a las 8am"
+            }
+        },
+        "recent_conversations": {
+            "title": "Conversaciones Recientes",
+            "type": "conversation_list",
+            "data": [
+                {"text": "¿Cómo estuvo tu día en la escuela?", "time": "2h ago", "with": "AI Assistant"},
+                {"text": "Necesito ayuda con la tarea de matemáticas", "time": "1d ago", "with": "AI Assistant"},
+                {"text": "¿Podemos ir al parque este fin de semana?", "time": "2d ago", "with": "AI Assistant"}
+            ]
+        },
+        "home_assistant": {
+            "title": "Control del Hogar",
+            "type": "device_control",
+            "data": {
+                "lights_on": 3,
+                "temperature": 22,
+                "doors_locked": True,
+                "active_devices": 2
+            }
+        },
+        "family_activity": {
+            "title": "Actividad Familiar",
+            "type": "activity_feed",
+            "data": [
+                {"member": "María", "action": "encendió la luz de la sala", "time": "10m ago"},
+                {"member": "Juan", "action": "usó el asistente de voz", "time": "1h ago"},
+                {"member": "Sofía", "action": "completó la rutina de la tarde", "time": "2h ago"}
+            ]
+        }
+    },
+    "analytics": {
+        "voice_interactions": 45,
+        "device_controls": 12,
+        "conversations": 67,
+        "active_days": 6
+    }
+}
+_DASHBOARD_PREFIX = b'{"family_member":'
+_DASHBOARD_SUFFIX = b"," + orjson.dumps(DASHBOARD_SECTIONS)[1:]
+
+@lru_cache(maxsize=1)
+def _dashboard_bodies(bucket: int) -> Dict[int, bytes]:
+    """Full dashboard body per member id for one roster TTL window"""
+    return {
+        member_id: _DASHBOARD_PREFIX + orjson.dumps(member) + _DASHBOARD_SUFFIX
+        for member_id, member in _family_member_index(bucket).items()
+    }
+
 @app.get("/api/v3/dashboard/{family_member_id}")
 async def get_dashboard_data(family_member_id: int, timeframe: str = "7d"):
     """Get personalized dashboard data for a family member"""
 
     # Get family member info
-    members = await list_family_members()
-    member = next((m for m in members["family_members"] if m["id"] == family_member_id), None)
+    body = _dashboard_bodies(_ttl_bucket()).get(family_member_id)
 
-    if not member:
+    if body is None:
         raise HTTPException(status_code=404, detail="Family member not found")
 
-    return {
-        "family_member": member,
-        "widgets": {
-            "overview": {
-                "title": "Bienvenido/a a la Familia",
-                "type": "welcome",
-                "data": {
-                    "greeting": "¡Hola! ¿Cómo estás hoy?",
-                    "family_status": "Todos activos",
-                    "weather": "22°C, soleado",
-                    "schedule": "Escuela a las 8am"
-                }
-            },
-            "recent_conversations": {
-                "title": "Conversaciones Recientes",
-                "type": "conversation_list",
-                "data": [
-                    {"text": "¿Cómo estuvo tu día en la escuela?", "time": "2h ago", "with": "AI Assistant"},
-                    {"text": "Necesito ayuda con la tarea de matemáticas", "time": "1d ago", "with": "AI Assistant"},
-                    {"text": "¿Podemos ir al parque este fin de semana?", "time": "2d ago", "with": "AI Assistant"}
-                ]
-            },
-            "home_assistant": {
-                "title": "Control del Hogar",
-                "type": "device_control",
-                "data": {
-                    "lights_on": 3,
-                    "temperature": 22,
-                    "doors_locked": True,
-                    "active_devices": 2
-                }
-            },
-            "family_activity": {
-                "title": "Actividad Familiar",
-                "type": "activity_feed",
-                "data": [
-                    {"member": "María", "action": "encendió la luz de la sala", "time": "10m ago"},
-                    {"member": "Juan", "action": "usó el asistente de voz", "time": "1h ago"},
-                    {"member": "Sofía", "action": "completó la rutina de la tarde", "time": "2h ago"}
-                ]
-            }
-        },
-        "analytics": {
-            "voice_interactions": 45,
-            "device_controls": 12,
-            "conversations": 67,
-            "active_days": 6
-        }
-    }
+    return Response(content=body, media_type="application/json")
 
 # System Status Endpoints
 @app.get("/api/v3/system/status")
@@ -811,7 +1160,7 @@ async def get_system_status():
             "connected_devices": 6,
             "automations": 3
         },
-        "last_updated": datetime.utcnow().isoformat()
+        "last_updated": datetime.utcnow()
     }
 
 # Compatibility with existing endpoints
@@ -827,4 +1176,15 @@ async def phase2_health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # uvloop + httptools come with uvicorn[standard]; pin them rather than
+    # relying on auto-detection, and run one worker per core
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count() or 1,
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+    )
\ No newline at end of file
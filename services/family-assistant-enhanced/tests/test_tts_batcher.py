@@ -0,0 +1,109 @@
+"""
+Tests for the text-to-speech request batcher in main.py.
+
+Tests:
+- Requests in one window are synthesized with one call per (language, voice)
+- Each request gets the URL for its own text
+- A failed synthesis fails every request in its group
+- Stopping the batcher fails queued and in-flight requests
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+import main
+
+
+class FakeSynthesizer:
+    """Stand-in for main._synthesize_batch recording each backend call"""
+
+    def __init__(self):
+        self.calls = []
+        self.error = None
+        self.release = None
+
+    async def __call__(self, language, voice_type, texts):
+        self.calls.append((language, voice_type, list(texts)))
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return [f"/{language}/{voice_type}/{text}.wav" for text in texts]
+
+
+@pytest.fixture
+def synthesizer(monkeypatch):
+    synthesizer = FakeSynthesizer()
+    monkeypatch.setattr(main, "_synthesize_batch", synthesizer)
+    return synthesizer
+
+
+@pytest_asyncio.fixture
+async def batcher(synthesizer):
+    await main.start_tts_batcher()
+    yield
+    await main.stop_tts_batcher()
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_window_is_grouped_by_language_and_voice(batcher, synthesizer):
+    """Concurrent requests share one backend call per (language, voice_type)."""
+    urls = await asyncio.gather(
+        main._submit_tts("hola", "es", "female"),
+        main._submit_tts("hello", "en", "male"),
+        main._submit_tts("adios", "es", "female"),
+    )
+
+    assert urls == ["/es/female/hola.wav", "/en/male/hello.wav", "/es/female/adios.wav"]
+    assert sorted(synthesizer.calls) == [
+        ("en", "male", ["hello"]),
+        ("es", "female", ["hola", "adios"]),
+    ]
+
+
+async def test_synthesis_error_fails_group(batcher, synthesizer):
+    """Every request of a failed group gets the error."""
+    synthesizer.error = RuntimeError("backend down")
+
+    results = await asyncio.gather(
+        main._submit_tts("hola", "es", "female"),
+        main._submit_tts("adios", "es", "female"),
+        return_exceptions=True,
+    )
+
+    assert all(result is synthesizer.error for result in results)
+
+
+async def test_stop_fails_queued_request(batcher, synthesizer):
+    """A request still in the batching window fails when the batcher stops."""
+    request = asyncio.create_task(main._submit_tts("hola", "es", "female"))
+    await asyncio.sleep(0)
+
+    await main.stop_tts_batcher()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        await asyncio.wait_for(request, 1)
+    assert synthesizer.calls == []
+
+
+async def test_stop_fails_request_in_synthesis(batcher, synthesizer):
+    """A request whose synthesis is in flight fails when the batcher stops."""
+    synthesizer.release = asyncio.Event()
+    request = asyncio.create_task(main._submit_tts("hola", "es", "female"))
+    while not synthesizer.calls:
+        await asyncio.sleep(0.005)
+
+    await main.stop_tts_batcher()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        await asyncio.wait_for(request, 1)
+
+
+async def test_without_batcher_synthesizes_directly(synthesizer):
+    """With the startup hook not run, requests are synthesized one by one."""
+    assert await main._submit_tts("hola", "es", "female") == "/es/female/hola.wav"
+    assert synthesizer.calls == [("es", "female", ["hola"])]